@@ -0,0 +1,131 @@
+"""Guarded admin endpoints (runtime log level, metrics, profiling, ...)
+
+All routes require the X-Admin-Token header to match ADMIN_TOKEN; they
+are disabled (404) when ADMIN_TOKEN is not set.
+"""
+
+import asyncio
+import secrets
+import threading
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+from app.config import get_settings
+from app.orders.history import order_history
+from app.utils.admission import loop_monitor
+from app.utils.logger import get_logging_stats, set_log_level
+from app.utils.metrics import metrics
+from app.utils.profiling import SamplingProfiler, memory_report, track_slow_callbacks
+from app.utils.tracing import slowest_traces
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    """FastAPI dependency guarding admin routes"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404)
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)])
+
+# Un seul profil de chaque type à la fois
+_profile_locks = {"cpu": asyncio.Lock(), "loop": asyncio.Lock(), "memory": asyncio.Lock()}
+
+
+def _acquire_profile(kind: str) -> asyncio.Lock:
+    lock = _profile_locks[kind]
+    if lock.locked():
+        raise HTTPException(status_code=409, detail=f"A {kind} profile is already running")
+    return lock
+
+
+@router.get("/logging")
+async def logging_stats():
+    """Current level, async queue depth, dropped records and sample rates"""
+    return get_logging_stats()
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Counters and gauges (outbound queue depth, sends, RetryAfter, ...)"""
+    return metrics.snapshot()
+
+
+@router.get("/traces/slowest")
+async def get_slowest_traces(minutes: float = 60, limit: int = 10):
+    """Slowest updates of the last `minutes`, with per-span durations"""
+    return {"traces": slowest_traces(minutes, limit)}
+
+
+@router.get("/orders/recent")
+async def get_recent_orders(user_id: int, limit: int = Query(5, ge=1, le=100)):
+    """Latest orders of a user (local order history)"""
+    orders = await order_history.recent_orders(user_id, limit)
+    return {"orders": [order._asdict() for order in orders]}
+
+
+@router.get("/orders/volume")
+async def get_order_volume(hours: int = Query(24, ge=1, le=24 * 90)):
+    """Orders and revenue per hour"""
+    return {"hours": await order_history.hourly_volumes(hours)}
+
+
+@router.post("/log-level")
+async def change_log_level(level: str):
+    """Raise/lower LOG_LEVEL at runtime (ex: POST /admin/log-level?level=DEBUG)"""
+    try:
+        effective = set_log_level(level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.warning("log_level_changed", level=effective)
+    return {"level": effective}
+
+
+@router.post("/profile/cpu", response_class=PlainTextResponse)
+async def profile_cpu(
+    seconds: float = Query(10, gt=0, le=60),
+    interval_ms: float = Query(10, ge=1, le=100),
+    all_threads: bool = False
+):
+    """
+    Sample the event-loop thread (or all threads) for `seconds`
+
+    Returns collapsed stacks ("frame;frame;frame count"), e.g.
+    flamegraph.pl profile.txt > profile.svg, or open in speedscope.
+    """
+    async with _acquire_profile("cpu"):
+        profiler = SamplingProfiler(threading.get_ident(), interval_ms / 1000, all_threads)
+        await asyncio.to_thread(profiler.run, seconds)
+    logger.info("cpu_profile_taken", seconds=seconds, samples=profiler.sample_count)
+    return profiler.collapsed()
+
+
+@router.get("/profile/loop")
+async def profile_loop(
+    seconds: float = Query(5, ge=0, le=60),
+    threshold_ms: float = Query(5, ge=0),
+    limit: int = Query(20, ge=1, le=200)
+):
+    """Event-loop lag history and slowest callbacks over the next `seconds`"""
+    async with _acquire_profile("loop"):
+        slowest = await track_slow_callbacks(seconds, threshold_ms, limit) if seconds else []
+    return {
+        "lag_ms": round(loop_monitor.lag_ms, 1),
+        "lag_history": [[round(at, 1), round(lag, 1)] for at, lag in loop_monitor.history],
+        "slow_callbacks": slowest,
+    }
+
+
+@router.get("/profile/memory")
+async def profile_memory(
+    seconds: float = Query(0, ge=0, le=300),
+    top: int = Query(25, ge=1, le=200)
+):
+    """RSS, tracemalloc top allocations (traced for `seconds`) and sizes of user_data / menu cache"""
+    async with _acquire_profile("memory"):
+        return await memory_report(seconds, top)
@@ -1,11 +1,16 @@
 """Spreeloop API client with mock mode for development"""
 
+import hashlib
+import time
 import httpx
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import TypedDict, Required
 from app.config import get_settings
-from app.models import BaseItem, CreateOrderRequest, CreateOrderApiResponse
-from typing import List, Optional
-from app.config import get_settings
+from app.models import BaseItem, MenuItem, MenuSnapshot, BaseItemType, CreateOrderRequest, CreateOrderApiResponse
+from typing import Any, Dict, List, Optional
 from app.utils.logger import setup_logging
+from app.utils.tracing import traced
+from app.utils.serialization import loads
 import structlog
 
 # Setup
@@ -19,6 +24,70 @@ class SpreeloopAPIError(Exception):
     pass
 
 
+MOCK_MENU_ITEMS = [
+    {
+        "path": "menuItems/pizza_margherita",
+        "shortDescription": "Pizza Margherita",
+        "foodName": "Pizza Margherita",
+        "longDescription": "Pizza classique tomate mozzarella basilic",
+        "isAvailable": True,
+        "isVisible": True,
+        "categoriesPaths": ["categories/pizza"],
+        "priceInXAF": 5000.0,
+        "isVegetarian": True,
+        "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
+    },
+    {
+        "path": "menuItems/pizza_4fromages",
+        "shortDescription": "Pizza 4 Fromages",
+        "foodName": "Pizza 4 Fromages",
+        "longDescription": "Mozzarella, gorgonzola, chèvre, emmental",
+        "isAvailable": True,
+        "isVisible": True,
+        "categoriesPaths": ["categories/pizza"],
+        "priceInXAF": 6000.0,
+        "isVegetarian": True,
+        "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
+    },
+    {
+        "path": "menuItems/poulet_braise",
+        "shortDescription": "Poulet Braisé",
+        "foodName": "Poulet Braisé",
+        "longDescription": "Poulet grillé sauce tomate épicée",
+        "isAvailable": True,
+        "isVisible": True,
+        "categoriesPaths": ["categories/plats"],
+        "priceInXAF": 3500.0,
+        "isVegetarian": False,
+        "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
+    },
+    {
+        "path": "menuItems/coca_cola",
+        "shortDescription": "Coca-Cola",
+        "foodName": "Coca-Cola",
+        "longDescription": "Boisson gazeuse 33cl",
+        "isAvailable": True,
+        "isVisible": True,
+        "categoriesPaths": ["categories/boissons"],
+        "priceInXAF": 500.0,
+        "isVegetarian": True,
+        "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
+    },
+    {
+        "path": "menuItems/ndole",
+        "shortDescription": "Ndolé",
+        "foodName": "Ndolé",
+        "longDescription": "Plat traditionnel camerounais aux arachides",
+        "isAvailable": True,
+        "isVisible": True,
+        "categoriesPaths": ["categories/plats"],
+        "priceInXAF": 2500.0,
+        "isVegetarian": False,
+        "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
+    }
+]
+
+
 def get_mock_menu_items() -> List[BaseItem]:
     """
     Retourne menu items mock pour développement/test sans API
@@ -26,70 +95,87 @@ def get_mock_menu_items() -> List[BaseItem]:
     Returns:
         List de 5 BaseItem mock (pizzas, poulet, coca, ndolé)
     """
-    mock_items_data = [
-        {
-            "path": "menuItems/pizza_margherita",
-            "shortDescription": "Pizza Margherita",
-            "foodName": "Pizza Margherita",
-            "longDescription": "Pizza classique tomate mozzarella basilic",
-            "isAvailable": True,
-            "isVisible": True,
-            "categoriesPaths": ["categories/pizza"],
-            "priceInXAF": 5000.0,
-            "isVegetarian": True,
-            "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
-        },
-        {
-            "path": "menuItems/pizza_4fromages",
-            "shortDescription": "Pizza 4 Fromages",
-            "foodName": "Pizza 4 Fromages",
-            "longDescription": "Mozzarella, gorgonzola, chèvre, emmental",
-            "isAvailable": True,
-            "isVisible": True,
-            "categoriesPaths": ["categories/pizza"],
-            "priceInXAF": 6000.0,
-            "isVegetarian": True,
-            "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
-        },
-        {
-            "path": "menuItems/poulet_braise",
-            "shortDescription": "Poulet Braisé",
-            "foodName": "Poulet Braisé",
-            "longDescription": "Poulet grillé sauce tomate épicée",
-            "isAvailable": True,
-            "isVisible": True,
-            "categoriesPaths": ["categories/plats"],
-            "priceInXAF": 3500.0,
-            "isVegetarian": False,
-            "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
-        },
-        {
-            "path": "menuItems/coca_cola",
-            "shortDescription": "Coca-Cola",
-            "foodName": "Coca-Cola",
-            "longDescription": "Boisson gazeuse 33cl",
-            "isAvailable": True,
-            "isVisible": True,
-            "categoriesPaths": ["categories/boissons"],
-            "priceInXAF": 500.0,
-            "isVegetarian": True,
-            "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
-        },
-        {
-            "path": "menuItems/ndole",
-            "shortDescription": "Ndolé",
-            "foodName": "Ndolé",
-            "longDescription": "Plat traditionnel camerounais aux arachides",
-            "isAvailable": True,
-            "isVisible": True,
-            "categoriesPaths": ["categories/plats"],
-            "priceInXAF": 2500.0,
-            "isVegetarian": False,
-            "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM"
-        }
-    ]
+    return [BaseItem(**item) for item in MOCK_MENU_ITEMS]
+
+
+class RawMenuItem(TypedDict, total=False):
+    """BaseItem fields kept in cache (validated in bulk, others ignored)"""
+    path: Required[str]
+    shortDescription: Required[str]
+    foodName: Optional[str]
+    priceInXAF: float
+    categoriesPaths: List[str]
+    longDescription: Optional[str]
+    isVegetarian: bool
+
+
+_menu_items_adapter = TypeAdapter(List[RawMenuItem])
+_bool_adapter = TypeAdapter(bool)
+
+
+def _is_true(value: Any) -> bool:
+    """Same bool rules as BaseItem validation ("True", "yes", 1, ...)"""
+    if value is True:
+        return True
+    try:
+        return _bool_adapter.validate_python(value)
+    except ValidationError:
+        return False
+
+
+def is_orderable(raw: Dict[str, Any]) -> bool:
+    """Filter applied on raw dicts: available + visible + MENU_ITEM type + priced"""
+    return (
+        _is_true(raw.get("isAvailable"))
+        and _is_true(raw.get("isVisible"))
+        and raw.get("baseItemType", BaseItemType.MENU_ITEM.value) == BaseItemType.MENU_ITEM.value
+        and raw.get("priceInXAF") is not None
+    )
+
+
+def parse_menu_items(raw_items: List[Dict[str, Any]]) -> List[MenuItem]:
+    """
+    Bulk-parse raw API items into compact MenuItem records
+    
+    The filter runs on the raw dicts first, so hidden/unavailable items are
+    never validated. The remaining items are validated in one list-level
+    call; if some are invalid they are logged and skipped.
+    
+    Args:
+        raw_items: "items" list of the API response
+    
+    Returns:
+        List[MenuItem] (available + visible + MENU_ITEM type + priced)
+    """
+    candidates = [raw for raw in raw_items if is_orderable(raw)]
     
-    return [BaseItem(**item) for item in mock_items_data]
+    try:
+        parsed = _menu_items_adapter.validate_python(candidates)
+    except ValidationError as e:
+        invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+        for index in sorted(invalid):
+            logger.warning(
+                "item_parse_error",
+                error=str([err["msg"] for err in e.errors() if err["loc"][:1] == (index,)]),
+                item_path=candidates[index].get("path", "unknown")
+            )
+        parsed = _menu_items_adapter.validate_python(
+            [raw for index, raw in enumerate(candidates) if index not in invalid]
+        )
+    
+    return [
+        MenuItem(
+            path=raw["path"],
+            shortDescription=raw["shortDescription"],
+            foodName=raw.get("foodName"),
+            priceInXAF=raw["priceInXAF"],
+            categoriesPaths=tuple(raw.get("categoriesPaths", ())),
+            longDescription=raw.get("longDescription"),
+            isVegetarian=raw.get("isVegetarian", False),
+        )
+        for raw in parsed
+    ]
+
 
 
 class SpreeloopAPI:
@@ -102,93 +188,159 @@ class SpreeloopAPI:
             "Content-Type": "application/json"
         }
         self.timeout = httpx.Timeout(30.0, connect=10.0)
-        self.client = httpx.AsyncClient(
-            timeout=self.timeout,
-            follow_redirects=True
-        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._menu_snapshots: Dict[str, MenuSnapshot] = {}  # Last snapshot per place
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client, created on first request (not at import)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True
+            )
+        return self._client
     
     async def get_menu_items(
         self,
         place_id: Optional[str] = None
-    ) -> List[BaseItem]:
+    ) -> List[MenuItem]:
         """
         Fetch available menu items
         
+        Shortcut for get_menu_snapshot(place_id).items
+        
+        Args:
+            place_id: Restaurant ID (optional, uses default if None)
+        
+        Returns:
+            List[MenuItem] filtered (available + visible + MENU_ITEM type)
+        
+        Raises:
+            SpreeloopAPIError if API error (production mode only)
+        """
+        snapshot = await self.get_menu_snapshot(place_id)
+        return list(snapshot.items)
+    
+    @traced("spreeloop.get_menu")
+    async def get_menu_snapshot(
+        self,
+        place_id: Optional[str] = None,
+        previous: Optional[MenuSnapshot] = None
+    ) -> MenuSnapshot:
+        """
+        Fetch the menu of a place as a versioned snapshot
+        
         MODE DEVELOPMENT (ENVIRONMENT=development):
             - Returns 5 mock items (no API call)
             - Perfect for testing without real API
         
         MODE PRODUCTION (ENVIRONMENT=production):
             - Calls real Spreeloop API
-            - Returns actual menu items
+            - Conditional request (If-None-Match / If-Modified-Since) when the
+              previous response carried ETag / Last-Modified
+            - 304, or a 200 with the same content hash, returns the previous
+              snapshot (same version) without re-parsing
         
         Args:
             place_id: Restaurant ID (optional, uses default if None)
+            previous: Last known snapshot (defaults to the last one fetched
+                by this client for the place)
         
         Returns:
-            List[BaseItem] filtered (available + visible + MENU_ITEM type)
+            MenuSnapshot; version is bumped only when the content changed
         
         Raises:
             SpreeloopAPIError if API error (production mode only)
         """
+        place = place_id or settings.spreeloop_default_place_id
+        previous = previous or self._menu_snapshots.get(place)
         
         # 🔧 MODE MOCK pour développement
         if settings.environment == "development":
             logger.info(
                 "dev_mode_using_mock_menu",
-                items_count=5,
+                items_count=len(MOCK_MENU_ITEMS),
                 mode="mock"
             )
-            return get_mock_menu_items()
+            if previous is None:
+                previous = MenuSnapshot(
+                    place_id=place,
+                    version=1,
+                    items=tuple(parse_menu_items(MOCK_MENU_ITEMS)),
+                    content_hash="mock"
+                )
+            snapshot = previous._replace(fetched_at=time.time())
+            self._menu_snapshots[place] = snapshot
+            return snapshot
         
         # 🚀 MODE PRODUCTION - vraie API
-        place = place_id or settings.spreeloop_default_place_id
-        
         try:
             # TODO: Adjust endpoint according to actual API
             url = f"{self.base_url}/places/{place}/menu-items"
             
+            headers = self.headers.copy()
+            if previous and previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous and previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+            
             logger.info("api_get_menu_start", place_id=place, url=url)
             
-            response = await self.client.get(url, headers=self.headers)
+            response = await self.client.get(url, headers=headers)
+            
+            if response.status_code == 304 and previous:
+                snapshot = previous._replace(fetched_at=time.time())
+                self._menu_snapshots[place] = snapshot
+                logger.info("api_get_menu_not_modified", place_id=place, version=snapshot.version)
+                return snapshot
+            
             response.raise_for_status()
             
-            data = response.json()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            
+            # Même contenu: pas de re-parsing ni de nouvelle version
+            if previous and previous.content_hash == content_hash:
+                snapshot = previous._replace(
+                    etag=etag,
+                    last_modified=last_modified,
+                    fetched_at=time.time()
+                )
+                self._menu_snapshots[place] = snapshot
+                logger.info("api_get_menu_unchanged", place_id=place, version=snapshot.version)
+                return snapshot
+            
+            data = loads(response.content)
             
             # Parse proto structure
             # Assuming: {"items": [...]}
             raw_items = data.get("items", [])
             
-            # Parse to BaseItem
-            items = []
-            for raw in raw_items:
-                try:
-                    item = BaseItem(**raw)
-                    items.append(item)
-                except Exception as e:
-                    logger.warning(
-                        "item_parse_error",
-                        error=str(e),
-                        item_path=raw.get("path", "unknown")
-                    )
+            # Filter + bulk parse to compact MenuItem
+            available = parse_menu_items(raw_items)
             
-            # Filter: available + visible + MENU_ITEM type
-            available = [
-                item for item in items
-                if item.isAvailable
-                and item.isVisible
-                and item.baseItemType == "BASE_ITEM_TYPE_MENU_ITEM"
-                and item.priceInXAF is not None
-            ]
+            snapshot = MenuSnapshot(
+                place_id=place,
+                version=(previous.version + 1) if previous else 1,
+                items=tuple(available),
+                content_hash=content_hash,
+                etag=etag,
+                last_modified=last_modified,
+                fetched_at=time.time()
+            )
+            self._menu_snapshots[place] = snapshot
             
             logger.info(
                 "api_get_menu_success",
-                total=len(items),
+                total=len(raw_items),
                 available=len(available),
-                place_id=place
+                place_id=place,
+                version=snapshot.version
             )
             
-            return available
+            return snapshot
             
         except httpx.HTTPStatusError as e:
             logger.error(
@@ -202,6 +354,7 @@ class SpreeloopAPI:
             logger.error("api_get_menu_error", error=str(e))
             raise SpreeloopAPIError(str(e))
     
+    @traced("spreeloop.create_order")
     async def create_order(
         self,
         order: CreateOrderRequest,
@@ -262,7 +415,9 @@ class SpreeloopAPI:
             if idempotency_key:
                 headers["Idempotency-Key"] = idempotency_key
             
-            payload = order.model_dump(exclude_none=True, by_alias=True)
+            # Sérialisé une seule fois, directement en JSON (pydantic-core), sans dict intermédiaire
+            headers["Content-Type"] = "application/json"
+            body = order.model_dump_json(exclude_none=True, by_alias=True)
             
             logger.info(
                 "api_create_order_start",
@@ -276,13 +431,12 @@ class SpreeloopAPI:
             response = await self.client.post(
                 url,
                 headers=headers,
-                json=payload,
+                content=body,
                 timeout=httpx.Timeout(60.0)  # Order creation can be slow
             )
             response.raise_for_status()
             
-            data = response.json()
-            result = CreateOrderApiResponse(**data)
+            result = CreateOrderApiResponse.model_validate_json(response.content)
             
             if result.data:
                 logger.info(
@@ -312,7 +466,9 @@ class SpreeloopAPI:
     
     async def close(self):
         """Close HTTP client"""
-        await self.client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 
 # Singleton instance
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     # Telegram
@@ -21,6 +22,83 @@ class Settings(BaseSettings):
     environment: str = "development"
     use_webhook: bool = False
     log_level: str = "INFO"
+    log_sample_rates: str = ""  # ex: "message_received=0.1,webhook_processed=0.05"
+    log_max_field_length: int = 500
+    log_queue_size: int = 10000
+    admin_token: Optional[str] = None  # Required by /admin endpoints (disabled if unset)
+    
+    # Outbound Telegram rate limits
+    telegram_global_rate: float = 30.0  # messages/s for the whole bot
+    telegram_chat_rate: float = 1.0  # messages/s per chat
+    telegram_chat_burst: int = 3
+    telegram_sender_workers: int = 8
+    telegram_max_retries: int = 3  # RetryAfter retries per message
+    
+    # Update processing
+    telegram_concurrent_updates: int = 64  # Updates processed at once (one at a time per user)
+    llm_threads: int = 32  # Threads running the blocking LLM SDK calls
+    
+    # Long polling (USE_WEBHOOK=false)
+    telegram_poll_timeout: int = 30  # getUpdates long-poll seconds
+    telegram_poll_limit: int = 100  # Updates per getUpdates batch (1-100)
+    telegram_poll_max_in_flight: int = 100  # Updates processed at once before fetching waits
+    telegram_api_base_url: str = ""  # ex: "http://localhost:8081/bot" (fake Bot API for benchmarks)
+    
+    # Tracing
+    trace_buffer_size: int = 2000  # Finished traces kept in memory
+    trace_export: str = ""  # "", "file" or "otlp"
+    trace_export_path: str = "data/traces.jsonl"
+    trace_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    trace_export_interval: float = 5.0
+    
+    # Multi-worker: >1 enables the host-local shared state store
+    workers: int = 1
+    shared_state_path: str = "/tmp/food-ordering-bot/state.sqlite3"
+    
+    # Idle user sessions (context.user_data) eviction (app/telegram/sessions.py)
+    session_ttl: float = 3600.0  # Seconds without an update before a session is evicted
+    session_max_count: int = 10000  # Least recently used sessions evicted above this
+    session_sweep_interval: float = 60.0
+    session_spill: bool = False  # Single worker: save evicted sessions to SESSION_SPILL_PATH
+    session_spill_path: str = "data/sessions.sqlite3"
+    
+    # Order history (app/orders/history.py)
+    order_history_path: str = "data/orders.sqlite3"
+    order_history_batch_size: int = 50  # Orders per write transaction
+    order_history_flush_interval: float = 2.0  # Seconds between writes
+    
+    # Menu snapshot (warm start / offline)
+    menu_snapshot_dir: str = "data/menu_snapshots"
+    
+    # Local extraction
+    local_extraction_min_confidence: float = 0.7  # Below: field is asked to the LLM
+    
+    # LLM routing (app/llm/router.py): small fast model for simple messages
+    llm_fast_gemini_model: str = "gemini-1.5-flash-8b"
+    llm_fast_groq_model: str = "llama-3.1-8b-instant"
+    llm_fast_timeout: float = 4.0  # Seconds per provider call
+    llm_fast_max_tokens: int = 384
+    llm_accurate_gemini_model: str = "gemini-2.0-flash-exp"
+    llm_accurate_groq_model: str = "llama-3.3-70b-versatile"
+    llm_accurate_timeout: float = 10.0
+    llm_accurate_max_tokens: int = 1024
+    llm_route_max_fast_score: int = 2  # Complexity score above: accurate route
+    llm_route_escalate_below: float = 0.6  # Fast result confidence below: retried on the accurate route
+    llm_conversation_timeout: float = 6.0
+    
+    # Admission control (app/utils/admission.py): degraded mode under load
+    loop_lag_interval: float = 0.5  # Event-loop lag sampling period (seconds)
+    admission_max_loop_lag_ms: float = 500.0
+    admission_max_llm_in_flight: int = 24  # Keep below LLM_THREADS
+    admission_recovery_seconds: float = 10.0  # Calm period before leaving degraded mode
+    
+    # LLM provider circuit breaker (app/llm/providers.py)
+    llm_circuit_window_size: int = 50  # Calls kept per provider
+    llm_circuit_window_seconds: float = 120.0
+    llm_circuit_min_samples: int = 5  # Before the SLO is evaluated
+    llm_circuit_max_error_rate: float = 0.5
+    llm_circuit_p95_ms: float = 8000.0
+    llm_circuit_open_seconds: float = 30.0  # Before a half-open probe
     
     class Config:
         env_file = ".env"
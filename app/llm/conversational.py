@@ -1,13 +1,14 @@
-import google.generativeai as genai
+import asyncio
 from app.config import get_settings
+from app.llm.gemini import get_model
+from app.llm.groq import get_client, DEFAULT_MODEL as GROQ_MODEL
+from app.llm.providers import GEMINI, GROQ, provider_pool
+from app.utils.tracing import traced
 import structlog
 
 logger = structlog.get_logger()
 settings = get_settings()
 
-genai.configure(api_key=settings.gemini_api_key)
-conversation_model = genai.GenerativeModel('gemini-2.0-flash-exp')
-
 
 CONVERSATIONAL_SYSTEM_PROMPT_FR = """Tu es un assistant sympa et naturel pour un service de livraison de nourriture au Cameroun.
 
@@ -99,6 +100,36 @@ CUSTOMER MESSAGE:
 RESPOND NATURALLY AND FRIENDLY (2-3 SENTENCES MAX):"""
 
 
+async def _reply_gemini(prompt: str) -> str:
+    response = await asyncio.wait_for(
+        asyncio.to_thread(
+            get_model().generate_content,
+            prompt,
+            generation_config={
+                "temperature": 0.7,  # More creative for conversation
+                "max_output_tokens": 200,  # Short responses
+            }
+        ),
+        settings.llm_conversation_timeout
+    )
+    return response.text.strip()
+
+
+async def _reply_groq(prompt: str) -> str:
+    response = await asyncio.wait_for(
+        asyncio.to_thread(
+            get_client().chat.completions.create,
+            model=GROQ_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=200,
+        ),
+        settings.llm_conversation_timeout
+    )
+    return response.choices[0].message.content.strip()
+
+
+@traced("llm.conversation")
 async def generate_conversational_response(
     user_message: str,
     menu_items: str,
@@ -106,7 +137,7 @@ async def generate_conversational_response(
     conversation_history: list = None
 ) -> str:
     """
-    Generate natural conversational response using Gemini
+    Generate natural conversational response (Gemini, Groq if Gemini is down)
     
     Args:
         user_message: User's message
@@ -135,21 +166,17 @@ async def generate_conversational_response(
                 history_text += f"{msg['role']}: {msg['content']}\n"
             prompt = history_text + "\n" + prompt
         
-        response = conversation_model.generate_content(
-            prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.7,  # More creative for conversation
-                max_output_tokens=200,  # Short responses
-            )
-        )
-        
-        reply = response.text.strip()
+        reply, provider = await provider_pool.run({
+            GEMINI: lambda: _reply_gemini(prompt),
+            GROQ: lambda: _reply_groq(prompt),
+        })
         
         logger.info(
             "conversational_response_generated",
             user_message=user_message[:50],
             response_length=len(reply),
-            language=language
+            language=language,
+            provider=provider
         )
         
         return reply
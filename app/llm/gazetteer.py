@@ -0,0 +1,132 @@
+"""Built-in gazetteer of Yaoundé and Douala neighbourhoods and landmarks
+
+Used by the local contact extractor to recognise delivery addresses
+without an LLM call. Names are stored as people write them; matching is
+done on an accent-free, lowercase form (see normalize_text).
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+CITIES = ["Yaoundé", "Douala"]
+
+YAOUNDE_NEIGHBOURHOODS = [
+    "Bastos", "Mvog-Mbi", "Mvog-Ada", "Mvog-Atangana Mballa", "Essos", "Mokolo",
+    "Biyem-Assi", "Mendong", "Nsimeyong", "Ngoa-Ekelle", "Melen", "Omnisport",
+    "Emana", "Nlongkak", "Etoudi", "Mimboman", "Nkolbisson", "Obili", "Efoulan",
+    "Ekounou", "Odza", "Nkoldongo", "Elig-Essono", "Elig-Edzoa", "Tsinga",
+    "Madagascar", "Briqueterie", "Mvan", "Ahala", "Simbock", "Etoa-Meki",
+    "Damas", "Olezoa", "Nkomo", "Kondengui", "Ngousso", "Mballa 2", "Messa",
+    "Oyom-Abang", "Etetak", "Mfandena", "Santa Barbara", "Nkol-Eton",
+    "Ekoumdoum", "Nkolndongo", "Mvolyé", "Mont Fébé", "Awae", "Nkolmesseng",
+    "Ngoulmekong", "Nkozoa", "Soa", "Olembe", "Eleveur", "Jouvence",
+]
+
+YAOUNDE_LANDMARKS = [
+    "Poste Centrale", "Carrefour Warda", "Carrefour Bastos", "Marché Central",
+    "Marché Mfoundi", "Marché Mokolo", "Marché Essos", "Hilton", "Palais des Sports",
+    "Stade Ahmadou Ahidjo", "Carrefour Obili", "Carrefour Elig-Essono",
+    "Carrefour MEEC", "Rond-point Nlongkak", "Université de Yaoundé",
+    "Hôpital Central", "Carrefour Jouvence", "Total Melen", "Carrefour Emia",
+    "Score Mimboman", "Carrefour Vogt", "Carrefour Biyem-Assi", "Carrefour Etoudi",
+    "Lycée Leclerc", "Mahima Essos", "Santa Lucia Mvan", "Dovv Mvan",
+    "Carrefour Mvan", "Carrefour Nsam", "Tradex Mimboman",
+]
+
+DOUALA_NEIGHBOURHOODS = [
+    "Akwa", "Akwa Nord", "Bonanjo", "Bonapriso", "Bali", "Deido", "Bonabéri",
+    "Bépanda", "Makepe", "Logpom", "Kotto", "Bonamoussadi", "Ndokoti",
+    "Village", "PK8", "PK10", "PK12", "PK14", "Logbaba", "Cité des Palmiers",
+    "Bassa", "New Bell", "Ndogbong", "Yassa", "Japoma", "Denver", "Ndog-Passi",
+    "Nyalla", "Bessengue", "Bonateki", "Koumassi", "Beedi", "Mboppi",
+    "Bonadibong", "Ndogpassi", "Nylon", "Makea", "Ngodi", "Youpwe", "Mabanda",
+]
+
+DOUALA_LANDMARKS = [
+    "Rond-point Deido", "Carrefour Ndokoti", "Marché Sandaga", "Marché Mboppi",
+    "Marché Central Douala", "Aéroport de Douala", "Boulevard de la Liberté",
+    "Pont du Wouri", "Douala Grand Mall", "Carrefour Agip", "Rond-point Dakar",
+    "Carrefour Ange Raphaël", "Akwa Palace", "Carrefour Cité des Palmiers",
+    "Carrefour Bonamoussadi", "Carrefour Makepe", "Total Bonamoussadi",
+    "Carrefour Bessengue", "Rond-point 4 étages", "Carrefour Shell New Bell",
+]
+
+# Mots qui indiquent une adresse même sans lieu connu
+ADDRESS_KEYWORDS = [
+    "carrefour", "rue", "quartier", "derrière", "derriere", "face", "en face",
+    "près de", "pres de", "avenue", "boulevard", "bvd", "rond-point", "rond point",
+    "entrée", "entree", "montée", "montee", "descente", "lycée", "lycee", "marché",
+    "marche", "pharmacie", "station", "immeuble", "école", "ecole", "église",
+    "eglise", "chapelle", "mosquée", "hôpital", "hopital", "snack", "boulangerie",
+    "street", "road", "junction", "near", "behind", "opposite", "next to",
+]
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip accents and turn hyphens into spaces"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r"[-_]+", " ", text.lower())
+
+
+def _build_entries() -> List[Tuple[str, str, str]]:
+    """(display_name, city, kind) for every gazetteer entry"""
+    entries = []
+    for name in YAOUNDE_NEIGHBOURHOODS:
+        entries.append((name, "Yaoundé", "neighbourhood"))
+    for name in YAOUNDE_LANDMARKS:
+        entries.append((name, "Yaoundé", "landmark"))
+    for name in DOUALA_NEIGHBOURHOODS:
+        entries.append((name, "Douala", "neighbourhood"))
+    for name in DOUALA_LANDMARKS:
+        entries.append((name, "Douala", "landmark"))
+    for name in CITIES:
+        entries.append((name, name, "city"))
+    return entries
+
+
+GAZETTEER: Dict[str, Tuple[str, str, str]] = {
+    normalize_text(name): (name, city, kind)
+    for name, city, kind in _build_entries()
+}
+
+# Une seule regex, entrées les plus longues d'abord ("akwa nord" avant "akwa")
+_GAZETTEER_RE = re.compile(
+    r"\b(" + "|".join(
+        re.escape(key) for key in sorted(GAZETTEER, key=len, reverse=True)
+    ) + r")\b"
+)
+
+_ADDRESS_KEYWORD_RE = re.compile(
+    r"\b(" + "|".join(
+        re.escape(normalize_text(k)) for k in sorted(ADDRESS_KEYWORDS, key=len, reverse=True)
+    ) + r")\b"
+)
+
+
+def find_places(text: str) -> List[Tuple[str, str, str]]:
+    """
+    Find gazetteer places mentioned in a text
+    
+    Args:
+        text: Raw user text (accents and case are ignored)
+    
+    Returns:
+        List of (display_name, city, kind) in order of appearance
+    """
+    return [GAZETTEER[m.group(1)] for m in _GAZETTEER_RE.finditer(normalize_text(text))]
+
+
+def has_address_keyword(text: str) -> bool:
+    """True if the text contains a generic address word (carrefour, rue, ...)"""
+    return _ADDRESS_KEYWORD_RE.search(normalize_text(text)) is not None
+
+
+def best_place(text: str) -> Optional[Tuple[str, str, str]]:
+    """Most specific place in the text (landmark > neighbourhood > city)"""
+    rank = {"landmark": 0, "neighbourhood": 1, "city": 2}
+    places = find_places(text)
+    if not places:
+        return None
+    return min(places, key=lambda place: rank[place[2]])
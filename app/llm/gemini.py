@@ -1,19 +1,52 @@
-import google.generativeai as genai
+import asyncio
 from app.config import get_settings
 from app.models import ExtractedOrder
+from functools import lru_cache
+from typing import Optional
+from app.utils.tracing import traced
 import json
 import structlog
 
 logger = structlog.get_logger()
 settings = get_settings()
 
-genai.configure(api_key=settings.gemini_api_key)
-model = genai.GenerativeModel('gemini-2.0-flash-exp')
+DEFAULT_MODEL = "gemini-2.0-flash-exp"
 
+
+@lru_cache()
+def get_model(model_name: str = DEFAULT_MODEL):
+    """
+    Gemini model, built on first use
+    
+    The google-generativeai SDK is heavy to import: it is only loaded
+    here, not when the module is imported.
+    """
+    import google.generativeai as genai
+    
+    genai.configure(api_key=settings.gemini_api_key)
+    return genai.GenerativeModel(model_name)
+
+
+def clean_json_text(text: str) -> str:
+    """Retire les balises markdown autour d'une réponse JSON"""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+@traced("llm.gemini.extract_order")
 async def extract_order_gemini(
     user_message: str,
     menu_items: str,
-    language: str = "fr"
+    language: str = "fr",
+    model_name: str = DEFAULT_MODEL,
+    max_tokens: int = 1024,
+    timeout: Optional[float] = None
 ) -> ExtractedOrder:
     """
     Extrait commande avec Gemini Flash
@@ -22,6 +55,9 @@ async def extract_order_gemini(
         user_message: Message utilisateur
         menu_items: JSON des produits disponibles
         language: "fr" ou "en"
+        model_name: Modèle Gemini (choisi par le routeur)
+        max_tokens: Limite de tokens de sortie
+        timeout: Délai max de l'appel en secondes (asyncio.TimeoutError au-delà)
     
     Returns:
         ExtractedOrder avec extraction structurée
@@ -35,24 +71,20 @@ async def extract_order_gemini(
     )
     
     try:
-        response = model.generate_content(
-            prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.1,
-                max_output_tokens=1024,
-            )
+        response = await asyncio.wait_for(
+            asyncio.to_thread(
+                get_model(model_name).generate_content,
+                prompt,
+                generation_config={
+                    "temperature": 0.1,
+                    "max_output_tokens": max_tokens,
+                }
+            ),
+            timeout
         )
         
         # Extraire JSON de la réponse
-        text = response.text.strip()
-        # Retirer markdown si présent
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
+        text = clean_json_text(response.text)
         
         # Parser JSON
         data = json.loads(text)
@@ -76,4 +108,66 @@ async def extract_order_gemini(
         )
     except Exception as e:
         logger.error("gemini_extraction_error", error=str(e))
-        raise
\ No newline at end of file
+        raise
+
+
+@traced("llm.gemini.extract_missing_fields")
+async def extract_missing_fields_gemini(
+    user_message: str,
+    missing_fields: list,
+    language: str = "fr",
+    model_name: str = DEFAULT_MODEL,
+    timeout: Optional[float] = None
+) -> ExtractedOrder:
+    """
+    Extrait uniquement les champs manquants d'une commande en attente
+    
+    Le prompt ne contient pas le menu: les produits sont déjà connus,
+    seules les infos client sont demandées.
+    
+    Args:
+        user_message: Message utilisateur
+        missing_fields: Champs encore manquants (ex: ["customer_phone"])
+        language: "fr" ou "en"
+        model_name: Modèle Gemini
+        timeout: Délai max de l'appel en secondes
+    
+    Returns:
+        ExtractedOrder sans items, avec les champs trouvés
+    """
+    from app.llm.prompts import build_followup_prompt
+    
+    prompt = build_followup_prompt(user_message, missing_fields, language)
+    text = ""
+    
+    try:
+        response = await asyncio.wait_for(
+            asyncio.to_thread(
+                get_model(model_name).generate_content,
+                prompt,
+                generation_config={
+                    "temperature": 0.1,
+                    "max_output_tokens": 256,
+                }
+            ),
+            timeout
+        )
+        
+        text = clean_json_text(response.text)
+        data = json.loads(text)
+        data["items"] = []
+        
+        logger.info(
+            "gemini_followup_extraction_success",
+            user_message=user_message[:50],
+            missing_fields=missing_fields
+        )
+        
+        return ExtractedOrder(**data)
+        
+    except json.JSONDecodeError as e:
+        logger.error("gemini_followup_json_parse_error", error=str(e), response=text)
+        return ExtractedOrder(items=[], confidence=0)
+    except Exception as e:
+        logger.error("gemini_followup_extraction_error", error=str(e))
+        raise
@@ -1,21 +1,39 @@
-from groq import Groq
+import asyncio
 from app.config import get_settings
 from app.models import ExtractedOrder
+from app.llm.gemini import clean_json_text
+from functools import lru_cache
+from typing import Optional
+from app.utils.tracing import traced
 import json
 import structlog
 
 logger = structlog.get_logger()
 settings = get_settings()
 
-client = Groq(api_key=settings.groq_api_key)
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
 
+
+@lru_cache()
+def get_client():
+    """Groq client, built on first use (SDK imported lazily)"""
+    from groq import Groq
+    
+    return Groq(api_key=settings.groq_api_key)
+
+@traced("llm.groq.extract_order")
 async def extract_order_groq(
     user_message: str,
     menu_items: str,
-    language: str = "fr"
+    language: str = "fr",
+    model: str = DEFAULT_MODEL,
+    max_tokens: int = 1024,
+    timeout: Optional[float] = None
 ) -> ExtractedOrder:
     """
     Fallback extraction avec Groq Llama-3.2
+    
+    model / max_tokens / timeout: choisis par le routeur (app.llm.router)
     """
     from app.llm.prompts import SYSTEM_PROMPT_FR, SYSTEM_PROMPT_EN
     
@@ -26,26 +44,22 @@ async def extract_order_groq(
     )
     
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": "You extract JSON from food orders."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,
-            max_tokens=1024,
+        response = await asyncio.wait_for(
+            asyncio.to_thread(
+                get_client().chat.completions.create,
+                model=model,
+                messages=[
+                    {"role": "system", "content": "You extract JSON from food orders."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.1,
+                max_tokens=max_tokens,
+            ),
+            timeout
         )
         
-        text = response.choices[0].message.content.strip()
-        
         # Nettoyer markdown
-        if text.startswith("```json"):
-            text = text[7:]
-        if text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
+        text = clean_json_text(response.choices[0].message.content)
         
         data = json.loads(text)
         
@@ -63,4 +77,51 @@ async def extract_order_groq(
             items=[],
             confidence=0,
             missing_fields=["all"]
-        )
\ No newline at end of file
+        )
+
+
+@traced("llm.groq.extract_missing_fields")
+async def extract_missing_fields_groq(
+    user_message: str,
+    missing_fields: list,
+    language: str = "fr",
+    model: str = DEFAULT_MODEL,
+    timeout: Optional[float] = None
+) -> ExtractedOrder:
+    """
+    Fallback extraction des champs manquants avec Groq
+    """
+    from app.llm.prompts import build_followup_prompt
+    
+    prompt = build_followup_prompt(user_message, missing_fields, language)
+    
+    try:
+        response = await asyncio.wait_for(
+            asyncio.to_thread(
+                get_client().chat.completions.create,
+                model=model,
+                messages=[
+                    {"role": "system", "content": "You extract JSON from food orders."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.1,
+                max_tokens=256,
+            ),
+            timeout
+        )
+        
+        text = clean_json_text(response.choices[0].message.content)
+        data = json.loads(text)
+        data["items"] = []
+        
+        logger.info(
+            "groq_followup_extraction_success",
+            user_message=user_message[:50],
+            missing_fields=missing_fields
+        )
+        
+        return ExtractedOrder(**data)
+        
+    except Exception as e:
+        logger.error("groq_followup_extraction_error", error=str(e))
+        return ExtractedOrder(items=[], confidence=0)
@@ -0,0 +1,268 @@
+"""Local extraction of customer details (no LLM call)
+
+Follow-up messages mostly carry contact details ("Jean Dupont, 675123456,
+Yaoundé"). They are read here with compiled regexes for Cameroonian
+numbers and simple heuristics backed by the gazetteer, so most of those
+turns never reach Gemini/Groq.
+"""
+
+import re
+from typing import Iterable, List, Optional, Set, Tuple
+from app.llm.gazetteer import best_place, has_address_keyword, normalize_text
+from app.models import ContactExtraction
+import structlog
+
+logger = structlog.get_logger()
+
+# +237 / 00237 / 237 optionnels, puis 9 chiffres commençant par 6 (mobile) ou 2 (fixe),
+# séparés ou non par espaces, points ou tirets: "6 75 12 34 56", "+237-675.123.456"
+PHONE_RE = re.compile(
+    r"(?<![\d+])(?:(?:\+|00)?\s?237[\s.-]?)?([62](?:[\s.-]?\d){8})(?!\d)"
+)
+
+MTN_PREFIXES = ("67", "650", "651", "652", "653", "654", "680", "681", "682", "683", "684")
+ORANGE_PREFIXES = ("69", "655", "656", "657", "658", "659", "685", "686", "687", "688", "689")
+
+NAME_MARKER_RE = re.compile(
+    r"(?:je m'appelle|je m’appelle|je m appelle|mon nom est|mon nom c'est|moi c'est"
+    r"|my name is|name\s*:|nom\s*:)\s*(.+)",
+    re.IGNORECASE
+)
+
+ADDRESS_MARKER_RE = re.compile(
+    r"(?:adresse\s*:?|address\s*:?|livr(?:er|ez|aison)\s+(?:aux|au|à|a)\b"
+    r"|deliver(?:y)?\s+(?:to|at)|j'habite(?:\s+(?:au|à|a)\b)?|i live (?:in|at))\s*(.+)",
+    re.IGNORECASE
+)
+
+SEGMENT_SPLIT_RE = re.compile(r"[,;\n|]+")
+
+NAME_TOKEN_RE = re.compile(r"^[A-Za-zÀ-ÖØ-öø-ÿ'’.-]+$")
+
+# Mots qui coupent un nom ("Jean Dupont et mon numéro...")
+NAME_STOP_WORDS = {
+    "et", "and", "mon", "ma", "my", "numero", "tel", "telephone", "phone",
+    "number", "a", "au", "je", "j'habite", "habite", "live", "adresse", "address",
+}
+
+# Mots qui ne sont jamais un nom de client
+NOT_NAME_WORDS = {
+    "bonjour", "bonsoir", "salut", "hello", "hi", "merci", "thanks", "thank",
+    "svp", "stp", "please", "oui", "non", "yes", "no", "ok", "okay", "d'accord",
+    "commande", "order", "livraison", "delivery", "cash", "paiement", "payment",
+    "je", "i", "veux", "want", "voudrais", "would", "ajoute", "add",
+}
+
+# Commandes / verbes envoyés pendant la collecte des infos ("Annuler", "Attendez")
+COMMAND_WORDS = {
+    "annuler", "annule", "annulez", "cancel", "stop", "attendez", "attends", "attend",
+    "wait", "hold", "combien", "how", "much", "prix", "price", "cout", "coute", "cost",
+    "ajouter", "ajoutez", "rajoute", "rajoutez", "enleve", "enlever", "retire", "retirer",
+    "remove", "changer", "change", "modifier", "modify", "menu", "aide", "help",
+    "confirmer", "confirme", "confirm", "quoi", "what", "pourquoi", "why", "ou", "where",
+    "quand", "when", "comment", "encore", "aussi", "avec", "sans", "plus", "more",
+}
+
+# Mots de remplissage ignorés pour décider s'il reste du texte pour le LLM
+FILLER_WORDS = NAME_STOP_WORDS | {
+    "c'est", "cest", "est", "is", "nom", "name", "mon", "le", "la", "voici",
+    "here", "svp", "stp", "please", "merci", "thanks", "ok", "oui", "yes",
+    "appelez", "call", "moi", "me", "sur", "on", "de", "du",
+}
+
+
+def extract_phone(text: str) -> Tuple[Optional[str], float, Optional[Tuple[int, int]]]:
+    """
+    Find a Cameroonian phone number
+    
+    Returns:
+        (number "+2376XXXXXXXX", confidence, span in text) or (None, 0, None)
+    """
+    match = PHONE_RE.search(text)
+    if not match:
+        return None, 0.0, None
+    
+    digits = re.sub(r"\D", "", match.group(1))
+    if digits.startswith(MTN_PREFIXES) or digits.startswith(ORANGE_PREFIXES):
+        confidence = 0.95
+    elif digits.startswith("6"):
+        confidence = 0.85  # Nexttel / Camtel mobile
+    else:
+        confidence = 0.7  # Fixe
+    
+    return f"+237{digits}", confidence, match.span()
+
+
+def get_phone_operator(phone: str) -> Optional[str]:
+    """"MTN", "ORANGE" or None for a +237 number"""
+    digits = phone.replace("+237", "", 1)
+    if digits.startswith(MTN_PREFIXES):
+        return "MTN"
+    if digits.startswith(ORANGE_PREFIXES):
+        return "ORANGE"
+    return None
+
+
+def _clean_name(raw: str) -> Optional[str]:
+    """Cut a raw name capture at the first stop word, max 4 tokens"""
+    tokens = []
+    for token in raw.strip().split():
+        if normalize_text(token) in NAME_STOP_WORDS or not NAME_TOKEN_RE.match(token):
+            break
+        tokens.append(token)
+        if len(tokens) == 4:
+            break
+    return " ".join(tokens) or None
+
+
+def menu_name_words(names: Iterable[str]) -> Set[str]:
+    """Normalised words (3+ letters) of menu item names, never taken as a customer name"""
+    words = set()
+    for name in names:
+        words.update(w for w in re.findall(r"[\w'’]+", normalize_text(name)) if len(w) >= 3)
+    return words
+
+
+def _name_confidence(segment: str, menu_words: Set[str] = frozenset()) -> float:
+    """Confidence that a bare segment is a person name (0 if not a name)"""
+    tokens = segment.split()
+    if not 1 <= len(tokens) <= 4:
+        return 0.0
+    for token in tokens:
+        word = normalize_text(token)
+        if not NAME_TOKEN_RE.match(token) or word in NOT_NAME_WORDS or word in COMMAND_WORDS:
+            return 0.0
+        if any(w in menu_words for w in word.split()):
+            return 0.0
+    if _is_filler(segment):
+        return 0.0
+    if best_place(segment) or has_address_keyword(segment):
+        return 0.0
+    capitalized = all(t[0].isupper() for t in tokens)
+    if len(tokens) >= 2:
+        return 0.8 if capitalized else 0.6
+    return 0.7 if capitalized else 0.5
+
+
+def _address_confidence(segment: str) -> float:
+    """Confidence that a segment is (part of) a delivery address"""
+    place = best_place(segment)
+    if place and place[2] != "city":
+        return 0.9
+    if has_address_keyword(segment):
+        return 0.75
+    if place:
+        return 0.7  # Ville seule ("Yaoundé")
+    return 0.0
+
+
+def _is_filler(segment: str) -> bool:
+    """True if a leftover segment only holds filler words"""
+    words = re.findall(r"[\w'’]+", normalize_text(segment))
+    return all(w in FILLER_WORDS for w in words)
+
+
+def extract_contact_info(
+    message: str,
+    expected_fields: Optional[List[str]] = None,
+    menu_words: Set[str] = frozenset()
+) -> ContactExtraction:
+    """
+    Read customer name, phone and delivery address from a message
+    
+    Args:
+        message: User message (usually a follow-up)
+        expected_fields: Fields the bot just asked for; a message made of
+            a single bare name is only accepted when customer_name is expected
+        menu_words: Words of menu item names (see menu_name_words), never
+            taken as a customer name
+    
+    Returns:
+        ContactExtraction with per-field confidence and leftover text
+    """
+    result = ContactExtraction()
+    text = message
+    
+    # 1. Téléphone
+    phone, phone_confidence, span = extract_phone(text)
+    if phone:
+        result.customer_phone = phone
+        result.field_confidence["customer_phone"] = phone_confidence
+        text = text[:span[0]] + "," + text[span[1]:]
+    
+    # 2. Segments: marqueurs explicites, lieux connus, noms
+    segments = [s.strip(" .!-") for s in SEGMENT_SPLIT_RE.split(text)]
+    segments = [s for s in segments if s]
+    
+    address_parts = []
+    address_confidence = 0.0
+    name_candidates = []
+    leftover = []
+    
+    for segment in segments:
+        name_match = NAME_MARKER_RE.search(segment)
+        if name_match and not result.customer_name:
+            name = _clean_name(name_match.group(1))
+            if name:
+                result.customer_name = name
+                result.field_confidence["customer_name"] = 0.9
+                rest = name_match.group(1)[len(name):].strip()
+                if rest and not _is_filler(rest):
+                    segments.append(rest)
+                continue
+        
+        address_match = ADDRESS_MARKER_RE.search(segment)
+        if address_match:
+            address_parts.append(address_match.group(1).strip())
+            address_confidence = max(
+                address_confidence,
+                0.9 if best_place(segment) else 0.85
+            )
+            continue
+        
+        confidence = _address_confidence(segment)
+        if confidence:
+            address_parts.append(segment)
+            address_confidence = max(address_confidence, confidence)
+            continue
+        
+        confidence = _name_confidence(segment, menu_words)
+        if confidence:
+            name_candidates.append((segment, confidence))
+            continue
+        
+        if not _is_filler(segment):
+            leftover.append(segment)
+    
+    if address_parts:
+        result.delivery_address = ", ".join(address_parts)
+        result.field_confidence["delivery_address"] = address_confidence
+    
+    # 3. Nom sans marqueur: seulement dans un message de coordonnées
+    if not result.customer_name and name_candidates:
+        looks_like_contact = bool(phone or address_parts)
+        name_only = (
+            len(segments) == 1
+            and expected_fields is not None
+            and "customer_name" in expected_fields
+        )
+        if looks_like_contact or name_only:
+            name, confidence = name_candidates.pop(0)
+            if not looks_like_contact and len(name.split()) == 1:
+                # Mot isolé: trop ambigu pour se passer du LLM
+                confidence = min(confidence, 0.5)
+                leftover.append(name)
+            result.customer_name = name
+            result.field_confidence["customer_name"] = confidence
+    leftover.extend(name for name, _ in name_candidates)
+    
+    result.leftover_text = ", ".join(leftover)
+    
+    logger.info(
+        "local_contact_extraction",
+        fields=sorted(result.field_confidence),
+        confidence=result.field_confidence,
+        leftover=bool(result.leftover_text)
+    )
+    
+    return result
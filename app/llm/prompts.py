@@ -7,7 +7,7 @@ TÂCHE: Extraire les informations de commande du message utilisateur et retourne
 FORMAT DE SORTIE (JSON STRICT - PAS DE MARKDOWN):
 {{
   "items": [
-    {{"foodName": "Pizza Margherita", "quantity": 2}}
+    {{"id": 1, "foodName": "Pizza Margherita", "quantity": 2}}
   ],
   "customer_name": "Jean Dupont",
   "customer_phone": "+237675123456",
@@ -18,12 +18,13 @@ FORMAT DE SORTIE (JSON STRICT - PAS DE MARKDOWN):
   "missing_fields": []
 }}
 
-PRODUITS DISPONIBLES:
+PRODUITS DISPONIBLES (id nom prix_XAF):
 {menu_items}
 
 RÈGLES CRITIQUES:
 1. **Extraction items**: Extraire TOUS les produits mentionnés avec leurs quantités
 2. **Matching fuzzy**: "pizza margharita" → "Pizza Margherita", "poulet braisé" → "Poulet Braisé"
+   "id" = numéro du produit dans PRODUITS DISPONIBLES (uniquement un id de la liste)
 3. **Champs manquants**: Si une info est absente, l'ajouter dans "missing_fields"
 4. **Téléphone**: Format Cameroun: +237XXXXXXXXX (9 chiffres après +237)
 5. **Confidence**: 
@@ -37,7 +38,7 @@ EXEMPLES:
 
 Message: "je veux 2 pizza margherita et 1 coca"
 Sortie:
-{{"items": [{{"foodName": "Pizza Margherita", "quantity": 2}}, {{"foodName": "Coca-Cola", "quantity": 1}}], "confidence": 0.8, "missing_fields": ["customer_name", "customer_phone", "delivery_address"]}}
+{{"items": [{{"id": 1, "foodName": "Pizza Margherita", "quantity": 2}}, {{"id": 4, "foodName": "Coca-Cola", "quantity": 1}}], "confidence": 0.8, "missing_fields": ["customer_name", "customer_phone", "delivery_address"]}}
 
 Message: "Bonjour"
 Sortie:
@@ -56,7 +57,7 @@ TASK: Extract order information from user message and return structured JSON.
 OUTPUT FORMAT (STRICT JSON - NO MARKDOWN):
 {{
   "items": [
-    {{"foodName": "Pizza Margherita", "quantity": 2}}
+    {{"id": 1, "foodName": "Pizza Margherita", "quantity": 2}}
   ],
   "customer_name": "John Doe",
   "customer_phone": "+237675123456",
@@ -67,12 +68,13 @@ OUTPUT FORMAT (STRICT JSON - NO MARKDOWN):
   "missing_fields": []
 }}
 
-AVAILABLE PRODUCTS:
+AVAILABLE PRODUCTS (id name price_XAF):
 {menu_items}
 
 CRITICAL RULES:
 1. **Extract items**: Extract ALL mentioned products with quantities
 2. **Fuzzy matching**: "margharita pizza" → "Pizza Margherita"
+   "id" = product number in AVAILABLE PRODUCTS (only an id from the list)
 3. **Missing fields**: If info absent, add to "missing_fields"
 4. **Phone**: Cameroon format: +237XXXXXXXXX (9 digits after +237)
 5. **Confidence**:
@@ -88,6 +90,46 @@ USER MESSAGE:
 RESPOND ONLY WITH JSON, NO ```json OR MARKDOWN."""
 
 
+
+FOLLOWUP_PROMPT_FR = """Tu complètes une commande de nourriture au Cameroun. Les produits sont déjà choisis.
+
+INFORMATIONS MANQUANTES: {missing_fields_str}
+
+TÂCHE: Extraire UNIQUEMENT ces informations du message utilisateur.
+
+FORMAT DE SORTIE (JSON STRICT - PAS DE MARKDOWN):
+{fields_template}
+
+RÈGLES:
+1. Mettre null pour toute information absente du message
+2. Téléphone: Format Cameroun +237XXXXXXXXX (9 chiffres après +237)
+3. Ne rien inventer
+
+MESSAGE UTILISATEUR:
+{user_message}
+
+RÉPONDS UNIQUEMENT AVEC LE JSON, SANS ```json NI MARKDOWN."""
+
+
+FOLLOWUP_PROMPT_EN = """You are completing a food order in Cameroon. The products are already chosen.
+
+MISSING INFORMATION: {missing_fields_str}
+
+TASK: Extract ONLY this information from the user message.
+
+OUTPUT FORMAT (STRICT JSON - NO MARKDOWN):
+{fields_template}
+
+RULES:
+1. Use null for any information absent from the message
+2. Phone: Cameroon format +237XXXXXXXXX (9 digits after +237)
+3. Never invent values
+
+USER MESSAGE:
+{user_message}
+
+RESPOND ONLY WITH JSON, NO ```json OR MARKDOWN."""
+
 CLARIFICATION_PROMPT_FR = """L'utilisateur a oublié de fournir: {missing_fields_str}
 
 Génère UNE question courte, naturelle et amicale en français pour demander ces informations.
@@ -129,4 +171,31 @@ def format_menu_for_prompt(menu_items: list, max_items: int = 50) -> str:
         price = item.priceInXAF or 0
         formatted.append(f"{name} ({int(price)} XAF)")
     
-    return "\n".join(formatted)
\ No newline at end of file
+    return "\n".join(formatted)
+
+def build_followup_prompt(
+    user_message: str,
+    missing_fields: list,
+    language: str = "fr"
+) -> str:
+    """
+    Build the short follow-up prompt (no menu) for a pending order
+    
+    Args:
+        user_message: Message utilisateur
+        missing_fields: Fields still missing on the pending order
+        language: "fr" ou "en"
+    
+    Returns:
+        Prompt asking only for the missing fields
+    """
+    import json
+    
+    prompt_template = FOLLOWUP_PROMPT_FR if language == "fr" else FOLLOWUP_PROMPT_EN
+    fields_template = json.dumps({field: None for field in missing_fields})
+    
+    return prompt_template.format(
+        missing_fields_str=", ".join(missing_fields),
+        fields_template=fields_template,
+        user_message=user_message
+    )
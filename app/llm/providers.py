@@ -0,0 +1,228 @@
+"""Health-scored LLM provider pool with circuit breaking
+
+Each provider (Gemini, Groq) keeps a rolling window of its recent calls
+(latency, success). A circuit opens when the window breaches the SLO
+(error rate above LLM_CIRCUIT_MAX_ERROR_RATE or p95 latency above
+LLM_CIRCUIT_P95_MS): the provider is then skipped and traffic goes to the
+healthy one, without waiting for a timeout on every message. After
+LLM_CIRCUIT_OPEN_SECONDS the circuit is half-open: one request probes the
+provider, closing the circuit on success and reopening it on failure.
+
+If every circuit is open, providers are still tried in preference order:
+a degraded answer is better than none.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from app.config import get_settings
+from app.utils.metrics import metrics
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+GEMINI = "gemini"
+GROQ = "groq"
+
+
+class ProviderHealth:
+    """Rolling latency / error window and circuit state of one provider"""
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 50,
+        window_seconds: float = 120.0,
+        min_samples: int = 5,
+        max_error_rate: float = 0.5,
+        p95_ms: float = 8000.0,
+        open_seconds: float = 30.0
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.p95_ms = p95_ms
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._calls: Deque[Tuple[float, float, bool]] = deque(maxlen=window_size)  # (at, latency_ms, ok)
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _window(self, now: float) -> List[Tuple[float, float, bool]]:
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+        return list(self._calls)
+
+    def error_rate(self, now: Optional[float] = None) -> float:
+        calls = self._window(now if now is not None else time.monotonic())
+        if not calls:
+            return 0.0
+        return sum(1 for _, _, ok in calls if not ok) / len(calls)
+
+    def p95(self, now: Optional[float] = None) -> float:
+        latencies = sorted(latency for _, latency, _ in self._window(now if now is not None else time.monotonic()))
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, math.ceil(0.95 * len(latencies)) - 1)]
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """Whether a request may be sent now (takes the half-open probe slot)"""
+        now = now if now is not None else time.monotonic()
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and now - self._opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+            logger.info("llm_circuit_half_open", provider=self.name)
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record(self, latency_ms: float, ok: bool, probe: bool = False, now: Optional[float] = None):
+        """Record a call; probe=True for the call sent on the half-open slot"""
+        now = now if now is not None else time.monotonic()
+        self._calls.append((now, latency_ms, ok))
+
+        if probe and self.state == HALF_OPEN:
+            self._probing = False
+            if ok and latency_ms <= self.p95_ms:
+                self.state = CLOSED
+                self._calls.clear()
+                logger.info("llm_circuit_closed", provider=self.name, latency_ms=round(latency_ms, 1))
+            else:
+                self._open(now, reason="probe_failed")
+            return
+
+        if self.state != CLOSED or len(self._window(now)) < self.min_samples:
+            return
+        if self.error_rate(now) > self.max_error_rate:
+            self._open(now, reason="error_rate")
+        elif self.p95(now) > self.p95_ms:
+            self._open(now, reason="p95")
+
+    def release_probe(self):
+        """Give the half-open probe slot back (probe cancelled)"""
+        self._probing = False
+
+    def _open(self, now: float, reason: str):
+        self.state = OPEN
+        self._opened_at = now
+        metrics.inc(f"llm.{self.name}.circuit_opened")
+        logger.warning(
+            "llm_circuit_opened",
+            provider=self.name,
+            reason=reason,
+            error_rate=round(self.error_rate(now), 2),
+            p95_ms=round(self.p95(now), 1)
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "state": self.state,
+            "samples": len(self._window(now)),
+            "error_rate": round(self.error_rate(now), 3),
+            "p95_ms": round(self.p95(now), 1),
+        }
+
+
+class ProviderPool:
+    """Runs a call on the healthiest provider, falling back in order"""
+
+    def __init__(self, providers: Dict[str, ProviderHealth]):
+        self.providers = providers
+        self.in_flight = 0  # Appels LLM en cours (contrôle d'admission)
+
+    async def run(
+        self,
+        calls: Dict[str, Callable[[], Awaitable[Any]]],
+        is_failure: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, str]:
+        """
+        First successful call, in the order of calls (preference)
+
+        Providers with an open circuit are skipped; if all of them are
+        open, they are all tried anyway.
+
+        Args:
+            calls: provider name → zero-argument callable
+            is_failure: Result check for providers returning an empty
+                result instead of raising
+
+        Returns:
+            (result, provider). The last failed result is returned if
+            every provider failed without raising; otherwise the last
+            exception is raised.
+        """
+        last_error: Optional[Exception] = None
+        last_failed: Optional[Tuple[Any, str]] = None
+        attempted = False
+
+        for bypass in (False, True):
+            if bypass and attempted:
+                break
+            for name in calls:
+                health = self.providers[name]
+                # allow() est évalué juste avant l'appel: il réserve la sonde half-open
+                if not bypass and not health.allow():
+                    continue
+                probe = not bypass and health.state == HALF_OPEN
+                attempted = True
+                started = time.perf_counter()
+                self.in_flight += 1
+                try:
+                    result = await calls[name]()
+                except Exception as e:
+                    health.record((time.perf_counter() - started) * 1000, False, probe)
+                    logger.warning("llm_provider_failed", provider=name, error=str(e) or type(e).__name__)
+                    last_error = e
+                    continue
+                except BaseException:
+                    if probe:
+                        health.release_probe()
+                    raise
+                finally:
+                    self.in_flight -= 1
+
+                failed = is_failure is not None and is_failure(result)
+                health.record((time.perf_counter() - started) * 1000, not failed, probe)
+                if not failed:
+                    return result, name
+                logger.warning("llm_provider_failed", provider=name, error="empty_result")
+                last_failed = (result, name)
+
+            if not attempted:
+                logger.warning("llm_all_circuits_open", providers=list(calls))
+
+        if last_failed is not None:
+            return last_failed
+        raise last_error
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: health.snapshot() for name, health in self.providers.items()}
+
+
+def _health(name: str) -> ProviderHealth:
+    return ProviderHealth(
+        name,
+        window_size=settings.llm_circuit_window_size,
+        window_seconds=settings.llm_circuit_window_seconds,
+        min_samples=settings.llm_circuit_min_samples,
+        max_error_rate=settings.llm_circuit_max_error_rate,
+        p95_ms=settings.llm_circuit_p95_ms,
+        open_seconds=settings.llm_circuit_open_seconds
+    )
+
+
+# Singleton instance, shared by extraction and conversation
+provider_pool = ProviderPool({GEMINI: _health(GEMINI), GROQ: _health(GROQ)})
+metrics.gauge("llm.in_flight", lambda: provider_pool.in_flight)
+for _name, _provider in provider_pool.providers.items():
+    metrics.gauge(f"llm.{_name}.circuit", lambda p=_provider: p.snapshot())
@@ -0,0 +1,250 @@
+"""Complexity-aware LLM routing
+
+Most messages are short ("2 ndolé", "Paul, 677123456"): a small fast
+model extracts them as well as a large one, in a fraction of the time.
+Each message gets a local complexity score (length, number of items,
+contact details, special instructions) and goes to one of two routes:
+
+- fast: small models, short timeout, small output budget
+- accurate: large models, longer timeout, full output budget
+
+On each route Gemini is preferred and Groq is the fallback; providers
+with an open circuit are skipped (app.llm.providers). A fast-route
+result with items but low confidence (or a failed fast route) is retried
+on the accurate route. Choices and outcomes are logged
+(llm_route_chosen / llm_route_outcome).
+"""
+
+import re
+import time
+from typing import List, NamedTuple, Tuple
+from app.config import get_settings
+from app.models import ExtractedOrder
+from app.llm.gemini import extract_order_gemini, extract_missing_fields_gemini
+from app.llm.groq import extract_order_groq, extract_missing_fields_groq
+from app.llm.local_extractor import PHONE_RE, NAME_MARKER_RE, ADDRESS_MARKER_RE
+from app.llm.providers import GEMINI, GROQ, provider_pool
+from app.orders.assembly import fills_any_field
+from app.utils.metrics import metrics
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+FAST = "fast"
+ACCURATE = "accurate"
+
+# "2 ndolé", "deux poulets", "x3"
+QUANTITY_RE = re.compile(
+    r"\b(?:\d{1,2}|x\d|un|une|deux|trois|quatre|cinq|six|one|two|three|four|five)\b",
+    re.IGNORECASE
+)
+ITEM_SEPARATOR_RE = re.compile(r",|\+|\bet\b|\band\b|\bavec\b|\bwith\b", re.IGNORECASE)
+INSTRUCTION_RE = re.compile(
+    r"\b(?:sans|pas de|pas trop|bien cuit|piment|without|no|extra|mais|but|instead|plutôt|remplace)\b",
+    re.IGNORECASE
+)
+
+
+class Route(NamedTuple):
+    name: str
+    gemini_model: str
+    groq_model: str
+    timeout: float
+    max_tokens: int
+
+
+def get_route(name: str) -> Route:
+    """Route settings (LLM_FAST_* / LLM_ACCURATE_*)"""
+    if name == FAST:
+        return Route(
+            FAST,
+            settings.llm_fast_gemini_model,
+            settings.llm_fast_groq_model,
+            settings.llm_fast_timeout,
+            settings.llm_fast_max_tokens
+        )
+    return Route(
+        ACCURATE,
+        settings.llm_accurate_gemini_model,
+        settings.llm_accurate_groq_model,
+        settings.llm_accurate_timeout,
+        settings.llm_accurate_max_tokens
+    )
+
+
+def score_complexity(message: str) -> int:
+    """
+    Local complexity score of a message (0 = trivial)
+
+    +1 / +2 for length (> 80 / > 200 characters), +1 / +2 for the number
+    of items (>= 2 / >= 4), +1 per contact detail (phone, name, address)
+    and +1 for special instructions.
+    """
+    score = 0
+    if len(message) > 200:
+        score += 2
+    elif len(message) > 80:
+        score += 1
+
+    # Le numéro de téléphone ne compte pas comme quantité
+    without_phone = PHONE_RE.sub(" ", message)
+    items = max(
+        len(QUANTITY_RE.findall(without_phone)),
+        len(ITEM_SEPARATOR_RE.findall(without_phone)) + 1
+    )
+    if items >= 4:
+        score += 2
+    elif items >= 2:
+        score += 1
+
+    score += sum(
+        1 for pattern in (PHONE_RE, NAME_MARKER_RE, ADDRESS_MARKER_RE)
+        if pattern.search(message)
+    )
+    if INSTRUCTION_RE.search(message):
+        score += 1
+    return score
+
+
+def choose_route(message: str) -> Tuple[str, int]:
+    """(route name, complexity score)"""
+    score = score_complexity(message)
+    return (FAST if score <= settings.llm_route_max_fast_score else ACCURATE), score
+
+
+def failed_extraction() -> ExtractedOrder:
+    """Result returned when no provider could answer"""
+    return ExtractedOrder(items=[], confidence=0, missing_fields=["all"])
+
+
+def extraction_failed(order: ExtractedOrder) -> bool:
+    return order.confidence == 0 and order.missing_fields == ["all"]
+
+
+def _followup_failed(order: ExtractedOrder, missing_fields: List[str]) -> bool:
+    """Invalid or empty follow-up answer (JSON parse error: confidence 0, no field)"""
+    return extraction_failed(order) or (order.confidence == 0 and not fills_any_field(order, missing_fields))
+
+
+async def _extract_on_route(
+    route: Route,
+    user_message: str,
+    menu_items: str,
+    language: str
+) -> Tuple[ExtractedOrder, str]:
+    """(result, provider) on one route, Gemini then Groq, through the provider pool"""
+    try:
+        return await provider_pool.run(
+            {
+                GEMINI: lambda: extract_order_gemini(
+                    user_message, menu_items, language,
+                    model_name=route.gemini_model,
+                    max_tokens=route.max_tokens,
+                    timeout=route.timeout
+                ),
+                GROQ: lambda: extract_order_groq(
+                    user_message, menu_items, language,
+                    model=route.groq_model,
+                    max_tokens=route.max_tokens,
+                    timeout=route.timeout
+                ),
+            },
+            is_failure=extraction_failed
+        )
+    except Exception as e:
+        logger.error("llm_extraction_failed", route=route.name, error=str(e) or type(e).__name__)
+        return failed_extraction(), "none"
+
+
+async def extract_order(user_message: str, menu_items: str, language: str = "fr") -> ExtractedOrder:
+    """
+    Order extraction on the route matching the message complexity
+
+    Args:
+        user_message: Message utilisateur
+        menu_items: Menu formaté pour le prompt
+        language: "fr" ou "en"
+
+    Returns:
+        ExtractedOrder (empty with confidence 0 if every provider failed)
+    """
+    route_name, score = choose_route(user_message)
+    logger.info("llm_route_chosen", route=route_name, score=score, length=len(user_message))
+    metrics.inc(f"llm.route.{route_name}")
+
+    started = time.perf_counter()
+    result, provider = await _extract_on_route(get_route(route_name), user_message, menu_items, language)
+
+    escalated = False
+    if route_name == FAST and result.confidence < settings.llm_route_escalate_below and (
+        result.items or extraction_failed(result)
+    ):
+        logger.info("llm_route_escalated", score=score, confidence=result.confidence)
+        metrics.inc("llm.route.escalated")
+        escalated = True
+        result, provider = await _extract_on_route(get_route(ACCURATE), user_message, menu_items, language)
+
+    logger.info(
+        "llm_route_outcome",
+        route=ACCURATE if escalated else route_name,
+        escalated=escalated,
+        provider=provider,
+        score=score,
+        latency_ms=round((time.perf_counter() - started) * 1000, 1),
+        items_count=len(result.items),
+        confidence=result.confidence,
+        failed=extraction_failed(result)
+    )
+    return result
+
+
+async def extract_missing_fields(
+    user_message: str,
+    missing_fields: List[str],
+    language: str
+) -> ExtractedOrder:
+    """
+    Short follow-up extraction (no menu in prompt): always the fast route
+
+    Returns:
+        ExtractedOrder without items; failed_extraction() if every provider
+        raised (the caller asks the missing fields again)
+    """
+    route = get_route(FAST)
+    started = time.perf_counter()
+    try:
+        result, provider = await provider_pool.run(
+            {
+                GEMINI: lambda: extract_missing_fields_gemini(
+                    user_message, missing_fields, language,
+                    model_name=route.gemini_model,
+                    timeout=route.timeout
+                ),
+                GROQ: lambda: extract_missing_fields_groq(
+                    user_message, missing_fields, language,
+                    model=route.groq_model,
+                    timeout=route.timeout
+                ),
+            },
+            is_failure=lambda order: _followup_failed(order, missing_fields)
+        )
+    except Exception as e:
+        logger.error(
+            "llm_extraction_failed",
+            route=route.name,
+            purpose="missing_fields",
+            error=str(e) or type(e).__name__
+        )
+        result, provider = failed_extraction(), "none"
+
+    logger.info(
+        "llm_route_outcome",
+        route=route.name,
+        escalated=False,
+        provider=provider,
+        purpose="missing_fields",
+        latency_ms=round((time.perf_counter() - started) * 1000, 1),
+        confidence=result.confidence
+    )
+    return result
@@ -1,58 +1,214 @@
+import time
+_import_started = time.perf_counter()
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, Request
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters
+from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, TypeHandler, filters
 from app.config import get_settings
-from app.telegram.handlers import handle_message, handle_confirm_callback
+from app.telegram.handlers import (
+    handle_message, handle_confirm_callback, handle_menu_page_callback, handle_reorder_callback,
+    menu_command, get_menu_formatted
+)
+from app.telegram.sessions import with_shared_session, SessionEvictor
+from app.telegram.sender import sender
+from app.telegram.polling import PollingRunner
+from app.telegram.processing import PerUserUpdateProcessor
+from app.utils.metrics import metrics
+from app.utils.admission import loop_monitor
+from app.utils.profiling import register_memory_source
+from app.orders.history import order_history
+from app.menu.cache import menu_cache
+from app.utils.shared_state import shared_state, SharedStateStore
+from app.utils.serialization import loads as json_loads
 from app.utils.logger import setup_logging
+from app.admin import router as admin_router
+from app.utils.tracing import start_trace, trace_exporter
 import structlog
 
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
 # Setup
 setup_logging()
 logger = structlog.get_logger()
 settings = get_settings()
 
 app = FastAPI(title="Food Ordering Bot")
+app.include_router(admin_router)
 
 # Telegram Application
-telegram_app = Application.builder().token(settings.telegram_bot_token).build()
+builder = (
+    Application.builder()
+    .token(settings.telegram_bot_token)
+    # getUpdates attend jusqu'à telegram_poll_timeout: marge de lecture en plus
+    .get_updates_read_timeout(10)
+    # Updates de users différents en parallèle, séquentielles pour un même user
+    .concurrent_updates(PerUserUpdateProcessor(settings.telegram_concurrent_updates))
+)
+if settings.telegram_api_base_url:
+    builder = builder.base_url(settings.telegram_api_base_url)
+telegram_app = builder.build()
+metrics.gauge("updates.active", lambda: telegram_app.update_processor.active)
+register_memory_source("user_data", lambda: telegram_app.user_data)
+register_memory_source("chat_data", lambda: telegram_app.chat_data)
+register_memory_source("menu_cache", lambda: menu_cache.snapshot)
+
+# Sessions inactives évincées; en multi-worker le store partagé les a déjà
+session_spill = (
+    SharedStateStore(settings.session_spill_path)
+    if settings.session_spill and shared_state is None else None
+)
+session_evictor = SessionEvictor(
+    lambda: telegram_app.user_data,
+    telegram_app.drop_user_data,
+    ttl=settings.session_ttl,
+    max_sessions=settings.session_max_count,
+    interval=settings.session_sweep_interval,
+    spill=session_spill,
+    is_busy=telegram_app.update_processor.is_busy
+)
+metrics.gauge("sessions.count", lambda: len(telegram_app.user_data))
+metrics.gauge("sessions.bytes", lambda: session_evictor.total_bytes)
 
 # Handlers
-telegram_app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
-telegram_app.add_handler(CallbackQueryHandler(handle_confirm_callback))
+telegram_app.add_handler(TypeHandler(Update, session_evictor.on_update), group=-1)
+telegram_app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, with_shared_session(handle_message)))
+telegram_app.add_handler(CommandHandler("menu", with_shared_session(menu_command)))
+telegram_app.add_handler(CallbackQueryHandler(with_shared_session(handle_confirm_callback), pattern=r"^(confirm|cancel)_"))
+telegram_app.add_handler(CallbackQueryHandler(with_shared_session(handle_menu_page_callback), pattern=r"^menu_\d+_\d+$"))
+telegram_app.add_handler(CallbackQueryHandler(with_shared_session(handle_reorder_callback), pattern=r"^reorder_\d+$"))
+
+async def _timed(name: str, coro, timings: dict):
+    """Await coro and record its duration in ms (errors are logged, not raised)"""
+    started = time.perf_counter()
+    try:
+        await coro
+    except Exception as e:
+        logger.warning("startup_warmup_failed", step=name, error=str(e))
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def _build_llm_clients():
+    """Import the LLM SDKs and build their clients (runs in a thread)"""
+    from app.llm.gemini import get_model
+    from app.llm.groq import get_client
+    get_model()
+    # Modèles des routes rapide / précise (app.llm.router)
+    get_model(settings.llm_fast_gemini_model)
+    get_model(settings.llm_accurate_gemini_model)
+    get_client()
+
+
+async def warm_up_llm_clients():
+    """Build LLM clients off the event loop so the first message does not pay for it"""
+    timings = {}
+    await _timed("llm_clients", asyncio.to_thread(_build_llm_clients), timings)
+    logger.info("llm_clients_ready", duration_ms=timings["llm_clients"])
+
 
 @app.on_event("startup")
 async def startup():
     """Initialize bot"""
-    await telegram_app.initialize()
+    started = time.perf_counter()
+    timings = {}
+    
+    # Pool de asyncio.to_thread: appels SDK LLM bloquants (mais aussi SQLite, snapshots)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.llm_threads, thread_name_prefix="to_thread")
+    )
+    
+    # Chaque worker ouvre le store partagé de l'hôte (mode multi-worker)
+    if shared_state is not None:
+        await shared_state.initialize()
+    if session_spill is not None:
+        await session_spill.initialize()
+    
+    # Menu du disque d'abord: servi (périmé) pendant le refresh en direct
+    await _timed("menu_snapshot_load", menu_cache.load_persisted(), timings)
+    
+    # Bot init (getMe) et préchargement du menu en parallèle
+    await asyncio.gather(
+        telegram_app.initialize(),
+        _timed("menu_prefetch", get_menu_formatted(), timings),
+    )
     await telegram_app.start()
+    sender.start()
+    if not settings.use_webhook:
+        polling_runner.start()
+    trace_exporter.start()
+    loop_monitor.start()
+    order_history.start()
+    session_evictor.start()
+    
+    # Les SDK LLM se chargent en arrière-plan: pas besoin d'attendre pour accepter les updates
+    app.state.llm_warmup = asyncio.create_task(warm_up_llm_clients())
+    
+    logger.info(
+        "startup_report",
+        workers=settings.workers,
+        mode="webhook" if settings.use_webhook else "polling",
+        import_ms=round(IMPORT_SECONDS * 1000, 1),
+        init_ms=round((time.perf_counter() - started) * 1000, 1),
+        warmup_ms=timings
+    )
     logger.info("bot_started")
 
 @app.on_event("shutdown")
 async def shutdown():
     """Cleanup"""
+    await polling_runner.stop()
+    await sender.stop()
     await telegram_app.stop()
     await telegram_app.shutdown()
     from app.api.spreeloop import api_client
     await api_client.close()
+    await trace_exporter.stop()
+    await loop_monitor.stop()
+    await order_history.stop()
+    await session_evictor.stop()
+    if shared_state is not None:
+        shared_state.close()
+    if session_spill is not None:
+        session_spill.close()
     logger.info("bot_stopped")
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
+async def process_update(update: Update, source: str):
+    """Process one update inside its trace (shared by webhook and polling)"""
+    with start_trace("telegram.update", update_id=update.update_id, source=source) as trace:
+        await telegram_app.update_processor.process_update(
+            update, telegram_app.process_update(update)
+        )
+    
+    logger.info(
+        f"{source}_processed",
+        update_id=update.update_id,
+        trace_id=trace.trace_id,
+        duration_ms=trace.duration_ms
+    )
+
+
+# Runner getUpdates (USE_WEBHOOK=false)
+polling_runner = PollingRunner(
+    telegram_app.bot,
+    lambda update: process_update(update, "polling"),
+    limit=settings.telegram_poll_limit,
+    timeout=settings.telegram_poll_timeout,
+    max_in_flight=settings.telegram_poll_max_in_flight
+)
+
 @app.post("/webhook")
 async def webhook(request: Request):
     """Telegram webhook endpoint"""
     try:
-        data = await request.json()
-        update = Update.de_json(data, telegram_app.bot)
-        await telegram_app.process_update(update)
-        
-        logger.info(
-            "webhook_processed",
-            update_id=update.update_id
-        )
-        
+        # Corps brut parsé directement (orjson si installé), sans passer par request.json()
+        update = Update.de_json(json_loads(await request.body()), telegram_app.bot)
+        await process_update(update, "webhook")
         return {"ok": True}
         
     except Exception as e:
@@ -62,4 +218,5 @@ async def webhook(request: Request):
 if __name__ == "__main__":
     import uvicorn
    #  port = int(os.getenv("PORT", 7860))
-    uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
+    # Import string: each worker process imports the app and runs startup/shutdown
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8080, workers=settings.workers)
\ No newline at end of file
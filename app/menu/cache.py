@@ -0,0 +1,175 @@
+"""In-process menu cache keyed by snapshot version"""
+
+import asyncio
+import contextvars
+import time
+from typing import Callable, Dict, List, Optional
+from app.api.spreeloop import api_client
+from app.config import get_settings
+from app.models import MenuItem, MenuSnapshot
+from app.menu.snapshot import load_snapshot, save_snapshot
+from app.utils.shared_state import shared_state
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Cache menu (refresh toutes les 5 min)
+MENU_TTL_SECONDS = 300
+# Après un échec de refresh, on sert le menu périmé et on réessaie dans 30 s
+MENU_RETRY_SECONDS = 30
+
+
+class MenuCache:
+    """
+    Menu of the default place, refreshed every MENU_TTL_SECONDS
+    
+    Listeners registered with on_refresh() are called once per new
+    snapshot version, so derived data (prompt text, pages, indexes) is
+    rebuilt only when the menu actually changed.
+    
+    A stale menu is served immediately while a background refresh runs;
+    callers only wait when no menu is known at all.
+    """
+    
+    def __init__(self, ttl: float = MENU_TTL_SECONDS):
+        self.ttl = ttl
+        self.snapshot: Optional[MenuSnapshot] = None
+        self.timestamp: float = 0
+        self._by_path: Dict[str, MenuItem] = {}
+        self._listeners: List[Callable[[MenuSnapshot], None]] = []
+        self._refresh_task: Optional[asyncio.Task] = None
+    
+    @property
+    def items(self) -> List[MenuItem]:
+        return list(self.snapshot.items) if self.snapshot else []
+    
+    @property
+    def version(self) -> int:
+        return self.snapshot.version if self.snapshot else 0
+    
+    def is_stale(self) -> bool:
+        return time.time() - self.timestamp > self.ttl
+    
+    def on_refresh(self, listener: Callable[[MenuSnapshot], None]):
+        """Register a callback run for every new menu version"""
+        self._listeners.append(listener)
+        if self.snapshot is not None:
+            listener(self.snapshot)
+    
+    def find(self, path: Optional[str]) -> Optional[MenuItem]:
+        """Menu item by path (O(1))"""
+        return self._by_path.get(path) if path else None
+    
+    def set_snapshot(self, snapshot: MenuSnapshot):
+        """Install a snapshot; listeners run only if the version changed"""
+        changed = (
+            self.snapshot is None
+            or self.snapshot.version != snapshot.version
+            or self.snapshot.content_hash != snapshot.content_hash
+        )
+        self.snapshot = snapshot
+        self.timestamp = snapshot.fetched_at
+        
+        if not changed:
+            return
+        
+        self._by_path = {item.path: item for item in snapshot.items}
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error("menu_refresh_listener_error", error=str(e))
+        
+        logger.info("menu_version_installed", version=snapshot.version, items=len(snapshot.items))
+    
+    async def get_snapshot(self) -> MenuSnapshot:
+        """
+        Current snapshot
+        
+        - no menu yet: fetch and wait
+        - stale menu: return it now, refresh in the background
+        """
+        if self.snapshot is None:
+            await self.refresh()
+        elif self.is_stale():
+            self.refresh_in_background()
+        return self.snapshot
+    
+    async def refresh(self):
+        """Fetch the menu now and install it (persisted if the version changed)"""
+        previous_version = self.version
+        snapshot = await load_menu_snapshot(self.snapshot)
+        self.set_snapshot(snapshot)
+        if snapshot.version != previous_version:
+            await save_snapshot(snapshot)
+    
+    def refresh_in_background(self):
+        """Start a refresh unless one is already running"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        # Contexte vide: le refresh ne fait pas partie de la trace de l'update qui l'a déclenché
+        self._refresh_task = asyncio.create_task(
+            self._background_refresh(), context=contextvars.Context()
+        )
+    
+    async def _background_refresh(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            # Gateway en panne: garder le menu périmé, réessayer plus tard
+            self.timestamp = time.time() - self.ttl + MENU_RETRY_SECONDS
+            logger.warning("menu_refresh_failed_serving_stale", version=self.version, error=str(e))
+    
+    async def load_persisted(self) -> bool:
+        """
+        Install the snapshot saved on disk (warm start)
+        
+        Its original fetched_at is kept, so it is served as stale and
+        refreshed in the background on first use.
+        
+        Returns:
+            True if a snapshot was loaded
+        """
+        snapshot = await load_snapshot(settings.spreeloop_default_place_id)
+        if snapshot is None:
+            return False
+        self.set_snapshot(snapshot)
+        return True
+
+
+async def load_menu_snapshot(previous: Optional[MenuSnapshot] = None) -> MenuSnapshot:
+    """
+    Fetch the menu snapshot, once per host when several workers run
+    
+    Args:
+        previous: Snapshot currently held by this process (for ETag / hash)
+    """
+    place = settings.spreeloop_default_place_id
+    
+    if shared_state is None:
+        return await api_client.get_menu_snapshot(place, previous)
+    
+    data = await shared_state.load_menu(place)
+    cached = MenuSnapshot.from_dict(data) if data else None
+    if cached and time.time() - cached.fetched_at <= MENU_TTL_SECONDS:
+        return cached
+    
+    # Un seul worker de l'hôte appelle l'API
+    lease = f"menu_refresh:{place}"
+    if await shared_state.try_acquire(lease, ttl=30):
+        try:
+            snapshot = await api_client.get_menu_snapshot(place, cached or previous)
+            await shared_state.save_menu(place, snapshot.to_dict())
+            return snapshot
+        finally:
+            await shared_state.release(lease)
+    
+    # Rafraîchissement en cours dans un autre worker: servir la copie de l'hôte
+    if cached:
+        return cached
+    return await api_client.get_menu_snapshot(place, previous)
+
+
+# Singleton instance
+menu_cache = MenuCache()
@@ -0,0 +1,127 @@
+"""Compact menu encoding for LLM prompts
+
+The legacy prompt line was "Pizza Margherita (5000 XAF) - menuItems/pizza_margherita":
+the item path costs more tokens than the name and a model echoing it back
+can mistype it. Each item now gets a short numeric handle, valid for one
+menu version:
+
+    1 Pizza Margherita 5000
+    2 Pizza 4 Fromages 6000
+
+The model returns {"id": 1, "foodName": ..., "quantity": ...}; handles
+are mapped back to menu paths after extraction (resolve_item_handles), and
+items with an unknown handle are rejected.
+"""
+
+import math
+import re
+from typing import Dict, NamedTuple, Optional
+from app.llm.gazetteer import normalize_text
+from app.menu.cache import menu_cache
+from app.models import ExtractedOrder, MenuSnapshot
+import structlog
+
+logger = structlog.get_logger()
+
+# Confiance max d'une extraction dont un produit a été rejeté
+REJECTED_ITEM_MAX_CONFIDENCE = 0.5
+
+
+class MenuEncoding(NamedTuple):
+    version: Optional[int]
+    text: str
+    handles: Dict[int, str]  # handle → menu path
+    names: Dict[str, str]  # normalized name → menu path
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token"""
+    return math.ceil(len(text) / 4)
+
+
+def _normalize_name(name: str) -> str:
+    return " ".join(re.findall(r"\w+", normalize_text(name)))
+
+
+def legacy_menu_text(snapshot: MenuSnapshot) -> str:
+    """Previous prompt format, kept to measure the savings"""
+    return "\n".join(
+        f"{item.display_name()} ({int(item.priceInXAF)} XAF) - {item.path}"
+        for item in snapshot.items
+        if item.priceInXAF
+    )
+
+
+def encode_menu(snapshot: MenuSnapshot) -> MenuEncoding:
+    """Prompt text and handle table of one menu version (items with a price only)"""
+    lines, handles, names = [], {}, {}
+    for item in snapshot.items:
+        if not item.priceInXAF:
+            continue
+        handle = len(handles) + 1
+        handles[handle] = item.path
+        names.setdefault(_normalize_name(item.display_name()), item.path)
+        lines.append(f"{handle} {item.display_name()} {int(item.priceInXAF)}")
+    return MenuEncoding(snapshot.version, "\n".join(lines), handles, names)
+
+
+def resolve_item_handles(order: ExtractedOrder, encoding: MenuEncoding) -> ExtractedOrder:
+    """
+    Map item handles back to menu paths
+
+    Items with a known handle get their menu path (and canonical name);
+    items with an unknown handle are dropped and the confidence capped;
+    items without a handle are matched on their exact (normalized) name.
+    """
+    items, rejected = [], []
+    for item in order.items:
+        path = None
+        if item.id is not None:
+            path = encoding.handles.get(item.id)
+            if path is None:
+                rejected.append(item.id)
+                continue
+        else:
+            path = encoding.names.get(_normalize_name(item.foodName))
+
+        resolved = item.model_copy(update={"id": None, "menuItemPath": path or item.menuItemPath})
+        menu_item = menu_cache.find(path)
+        if menu_item is not None:
+            resolved.foodName = menu_item.display_name()
+        items.append(resolved)
+
+    update = {"items": items}
+    if rejected:
+        logger.warning("llm_unknown_item_handle", handles=rejected, version=encoding.version)
+        update["confidence"] = min(order.confidence, REJECTED_ITEM_MAX_CONFIDENCE)
+    return order.model_copy(update=update)
+
+
+class MenuPrompt:
+    """Encoded menu of the current version, rebuilt on every new version"""
+
+    def __init__(self):
+        self.encoding = MenuEncoding(None, "", {}, {})
+
+    @property
+    def text(self) -> str:
+        return self.encoding.text
+
+    def rebuild(self, snapshot: MenuSnapshot):
+        """MenuCache.on_refresh listener"""
+        self.encoding = encode_menu(snapshot)
+        legacy_tokens = estimate_tokens(legacy_menu_text(snapshot))
+        tokens = estimate_tokens(self.encoding.text)
+        logger.info(
+            "menu_prompt_encoded",
+            version=snapshot.version,
+            items=len(self.encoding.handles),
+            tokens=tokens,
+            legacy_tokens=legacy_tokens,
+            saved_pct=round(100 * (1 - tokens / legacy_tokens), 1) if legacy_tokens else 0.0
+        )
+
+
+# Singleton instance, re-encoded for every new menu version
+menu_prompt = MenuPrompt()
+menu_cache.on_refresh(menu_prompt.rebuild)
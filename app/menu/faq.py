@@ -0,0 +1,162 @@
+"""Precomputed answers to menu-item questions
+
+"c'est quoi le ndolé ?", "how much is the pizza 4 fromages", "le poulet DG
+est végétarien ?": the answer only depends on the menu, so it is rendered
+per item and per language at menu refresh time (MenuCache.on_refresh),
+from longDescription, the price and the vegetarian flag. An incoming
+question is matched locally (question words + exactly one menu item);
+anything else, including orders ("2 ndolé c'est combien ?"), falls
+through to the LLM.
+"""
+
+import re
+from typing import Dict, List, Optional, Set, Tuple
+from app.llm.gazetteer import normalize_text
+from app.menu.cache import menu_cache
+from app.models import MenuItem, MenuSnapshot
+from app.utils.metrics import metrics
+import structlog
+
+logger = structlog.get_logger()
+
+LANGUAGES = ("fr", "en")
+
+DESCRIBE = "describe"
+PRICE = "price"
+VEGETARIAN = "vegetarian"
+
+# Sur le texte normalisé (minuscules, sans accents)
+QUESTION_PATTERNS = {
+    DESCRIBE: re.compile(
+        r"\b(?:c est quoi|qu est ce que|ca contient quoi|il y a quoi dans"
+        r"|what is|what s|whats|tell me about)\b"
+    ),
+    PRICE: re.compile(r"\b(?:combien|prix|coute|coutent|tarif|how much|price|cost|costs)\b"),
+    VEGETARIAN: re.compile(r"\b(?:vegetarien(?:ne)?|vegan|veggie|vegetarian|sans viande|meat)\b"),
+}
+
+# Une quantité hors du nom du plat = une commande, pas une question
+ORDER_HINT_RE = re.compile(
+    r"\d|\b(?:je veux|je voudrais|j aimerais|commande[rz]?|donne[zs]? moi|i want|i d like|i would like|order)\b"
+)
+
+MIN_WORD_LENGTH = 4
+
+
+def _tokens(text: str) -> str:
+    """Normalized text with single spaces, punctuation removed"""
+    return " ".join(re.findall(r"\w+", normalize_text(text)))
+
+
+def asked_kinds(message: str) -> List[str]:
+    """Question kinds found in a normalized message, in DESCRIBE/PRICE/VEGETARIAN order"""
+    return [kind for kind, pattern in QUESTION_PATTERNS.items() if pattern.search(message)]
+
+
+def render_answers(item: MenuItem, language: str) -> Dict[str, str]:
+    """Answer per question kind for one item"""
+    name = item.display_name()
+    price = item.display_price() if language == "fr" or item.priceInXAF else "Price not available"
+    description = (item.longDescription or "").strip().rstrip(".")
+
+    if language == "fr":
+        describe = f"{name}: {description}." if description else f"{name} est à notre menu."
+        return {
+            DESCRIBE: describe + (" 🌱 Plat végétarien." if item.isVegetarian else ""),
+            PRICE: f"{name}: {price}.",
+            VEGETARIAN: (
+                f"Oui, {name} est végétarien 🌱" if item.isVegetarian
+                else f"Non, {name} n'est pas végétarien."
+            ),
+            "order": f"Pour commander, écrivez par ex: « 1 {name} » 😊",
+        }
+    describe = f"{name}: {description}." if description else f"{name} is on our menu."
+    return {
+        DESCRIBE: describe + (" 🌱 Vegetarian." if item.isVegetarian else ""),
+        PRICE: f"{name}: {price}.",
+        VEGETARIAN: (
+            f"Yes, {name} is vegetarian 🌱" if item.isVegetarian
+            else f"No, {name} is not vegetarian."
+        ),
+        "order": f"To order, just type e.g. \"1 {name}\" 😊",
+    }
+
+
+class FaqCache:
+    """Per-item, per-language answers of the current menu version"""
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._answers: Dict[str, Dict[str, Dict[str, str]]] = {}  # path → language → kind → text
+        self._names: List[Tuple[str, str]] = []  # (normalized name, path), longest first
+        self._words: Dict[str, str] = {}  # word found in a single item name → path
+
+    def rebuild(self, snapshot: MenuSnapshot):
+        """MenuCache.on_refresh listener"""
+        answers, names, owners = {}, [], {}
+        for item in snapshot.items:
+            answers[item.path] = {language: render_answers(item, language) for language in LANGUAGES}
+            name = _tokens(item.display_name())
+            if name:
+                names.append((name, item.path))
+            for word in set(name.split()):
+                if len(word) >= MIN_WORD_LENGTH:
+                    owners.setdefault(word, set()).add(item.path)
+
+        names.sort(key=lambda entry: len(entry[0]), reverse=True)
+        self._answers = answers
+        self._names = names
+        self._words = {word: next(iter(paths)) for word, paths in owners.items() if len(paths) == 1}
+        self.version = snapshot.version
+        logger.info("faq_answers_rendered", version=snapshot.version, items=len(answers))
+
+    def match_item(self, message: str) -> Optional[Tuple[str, str]]:
+        """(path, message without the item name) for exactly one item, else None"""
+        padded = f" {message} "
+        for name, path in self._names:
+            if f" {name} " in padded:
+                rest = padded.replace(f" {name} ", " ")
+                # Un deuxième plat cité: question ambiguë, laissée au LLM
+                if any(f" {other} " in f" {rest} " for other, p in self._names if p != path):
+                    return None
+                return path, rest
+
+        paths: Set[str] = {self._words[word] for word in message.split() if word in self._words}
+        if len(paths) == 1:
+            path = paths.pop()
+            rest = " ".join(word for word in message.split() if self._words.get(word) != path)
+            return path, rest
+        return None
+
+    def answer(self, message: str, language: str = "fr") -> Optional[str]:
+        """Precomputed answer to a question about one menu item, or None"""
+        if self.version is None:
+            return None
+        normalized = _tokens(message)
+        kinds = asked_kinds(normalized)
+        if not kinds:
+            return None
+
+        match = self.match_item(normalized)
+        if match is None:
+            metrics.inc("faq.miss")
+            return None
+        path, rest = match
+        if ORDER_HINT_RE.search(rest):
+            metrics.inc("faq.miss")
+            return None
+
+        answers = self._answers[path].get(language) or self._answers[path]["fr"]
+        lines = [answers[kind] for kind in kinds]
+        if DESCRIBE in kinds and PRICE not in kinds:
+            lines.append(answers[PRICE])
+        lines.append(answers["order"])
+
+        metrics.inc("faq.hit")
+        logger.info("faq_answered", path=path, kinds=kinds, language=language)
+        return "\n".join(lines)
+
+
+# Singleton instance, re-rendered for every new menu version
+faq_cache = FaqCache()
+menu_cache.on_refresh(faq_cache.rebuild)
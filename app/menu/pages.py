@@ -0,0 +1,149 @@
+"""Pre-rendered /menu pages
+
+Pages are grouped by category (first of categoriesPaths) and rendered
+for each language once per menu version, through MenuCache.on_refresh.
+Showing or flipping a page is then a lookup: no LLM call, no formatting
+on the request path.
+
+Callback data: "menu_{version}_{page}". A tap on a page of an older menu
+version opens the same page number of the current version.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from app.menu.cache import menu_cache
+from app.models import MenuItem, MenuSnapshot
+import structlog
+
+logger = structlog.get_logger()
+
+PAGE_SIZE = 8
+LANGUAGES = ("fr", "en")
+OTHER_CATEGORY = {"fr": "Autres", "en": "Other"}
+
+# Demandes explicites du menu, traitées sans extraction LLM
+MENU_REQUEST_RE = re.compile(
+    r"\b(?:menu|la carte|votre carte|what do you have|what's on the menu|vous avez quoi"
+    r"|qu'avez[- ]vous)\b",
+    re.IGNORECASE
+)
+
+
+class MenuPage(NamedTuple):
+    text: str
+    markup: Optional[InlineKeyboardMarkup]
+
+
+def is_menu_request(message: str) -> bool:
+    """Explicit menu request without an order in it ("le menu svp", "show me the menu")"""
+    return bool(MENU_REQUEST_RE.search(message)) and not any(c.isdigit() for c in message)
+
+
+def category_name(path: str) -> str:
+    """"categories/plats_du_jour" → "Plats du jour\""""
+    name = path.rsplit("/", 1)[-1].replace("_", " ").replace("-", " ").strip()
+    return name[:1].upper() + name[1:]
+
+
+def group_by_category(items: List[MenuItem]) -> List[Tuple[Optional[str], List[MenuItem]]]:
+    """(category path or None, items) in first-seen order; uncategorised items last"""
+    groups: Dict[Optional[str], List[MenuItem]] = {}
+    for item in items:
+        key = item.categoriesPaths[0] if item.categoriesPaths else None
+        groups.setdefault(key, []).append(item)
+    if None in groups:
+        groups[None] = groups.pop(None)
+    return list(groups.items())
+
+
+def render_pages(snapshot: MenuSnapshot, language: str) -> List[MenuPage]:
+    """All pages of one menu version in one language"""
+    chunks = []  # (category title, first page of the category, items, part, parts)
+    for category, items in group_by_category(list(snapshot.items)):
+        title = category_name(category) if category else OTHER_CATEGORY[language]
+        parts = (len(items) + PAGE_SIZE - 1) // PAGE_SIZE
+        first = len(chunks)
+        for part in range(parts):
+            chunks.append((title, first, items[part * PAGE_SIZE:(part + 1) * PAGE_SIZE], part, parts))
+    
+    if not chunks:
+        empty = "Le menu est vide pour le moment." if language == "fr" else "The menu is empty for now."
+        return [MenuPage(empty, None)]
+    
+    # Boutons de saut vers la première page de chaque catégorie
+    categories = [(title, first) for title, first, _, part, _ in chunks if part == 0]
+    total = len(chunks)
+    pages = []
+    
+    for index, (title, first, items, part, parts) in enumerate(chunks):
+        header = f"📋 Menu · {title}" + (f" ({part + 1}/{parts})" if parts > 1 else "")
+        lines = [header, ""]
+        for item in items:
+            veggie = " 🌱" if item.isVegetarian else ""
+            lines.append(f"• {item.display_name()} — {item.display_price()}{veggie}")
+            if item.longDescription:
+                lines.append(f"   {item.longDescription}")
+        lines.append("")
+        example = items[0].display_name()
+        lines.append(
+            f"Pour commander, écrivez par ex: « 2 {example} »" if language == "fr"
+            else f"To order, just type e.g. \"2 {example}\""
+        )
+        
+        rows = []
+        if len(categories) > 1:
+            buttons = [
+                InlineKeyboardButton(
+                    ("• " if start == first else "") + name,
+                    callback_data=f"menu_{snapshot.version}_{start}"
+                )
+                for name, start in categories
+            ]
+            rows.extend(buttons[i:i + 3] for i in range(0, len(buttons), 3))
+        if total > 1:
+            rows.append([
+                InlineKeyboardButton("◀️", callback_data=f"menu_{snapshot.version}_{(index - 1) % total}"),
+                InlineKeyboardButton(f"{index + 1}/{total}", callback_data=f"menu_{snapshot.version}_{index}"),
+                InlineKeyboardButton("▶️", callback_data=f"menu_{snapshot.version}_{(index + 1) % total}"),
+            ])
+        pages.append(MenuPage("\n".join(lines), InlineKeyboardMarkup(rows) if rows else None))
+    
+    return pages
+
+
+class MenuPages:
+    """Pages of the current menu version, rebuilt on every new version"""
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self._pages: Dict[str, List[MenuPage]] = {}
+
+    def rebuild(self, snapshot: MenuSnapshot):
+        """MenuCache.on_refresh listener"""
+        self._pages = {language: render_pages(snapshot, language) for language in LANGUAGES}
+        self.version = snapshot.version
+        logger.info("menu_pages_rendered", version=snapshot.version, pages=len(self._pages["fr"]))
+
+    @property
+    def ready(self) -> bool:
+        return self.version is not None
+
+    def page_count(self) -> int:
+        return len(self._pages.get("fr", []))
+
+    def get(self, index: int, language: str = "fr") -> MenuPage:
+        """Page by index (clamped), in the user's language"""
+        pages = self._pages.get(language) or self._pages["fr"]
+        return pages[min(max(index, 0), len(pages) - 1)]
+
+
+def parse_page_callback(data: str) -> Tuple[int, int]:
+    """"menu_{version}_{page}" → (version, page)"""
+    _, version, page = data.split("_")
+    return int(version), int(page)
+
+
+# Singleton instance, re-rendered for every new menu version
+menu_pages = MenuPages()
+menu_cache.on_refresh(menu_pages.rebuild)
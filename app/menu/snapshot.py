@@ -0,0 +1,116 @@
+"""Persisted menu snapshots for warm start and offline operation
+
+The last good menu of each place is written atomically to a gzip'd JSON
+file (compact item rows). It is loaded at startup, before the first update,
+and served as stale while the live refresh runs, so the bot can still take
+orders when the gateway is down.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+from typing import Optional
+from app.config import get_settings
+from app.models import MenuSnapshot
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Bump when MenuItem / MenuSnapshot fields change: older files are ignored
+SNAPSHOT_SCHEMA_VERSION = 1
+
+
+def snapshot_path(place_id: str) -> str:
+    return os.path.join(settings.menu_snapshot_dir, f"{place_id}.json.gz")
+
+
+def write_snapshot(snapshot: MenuSnapshot) -> str:
+    """
+    Write a snapshot atomically (temp file + fsync + rename)
+    
+    Returns:
+        Path of the snapshot file
+    """
+    path = snapshot_path(snapshot.place_id)
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    
+    payload = json.dumps(
+        {"schema": SNAPSHOT_SCHEMA_VERSION, "snapshot": snapshot.to_dict()},
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+    
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as gz:
+                gz.write(payload)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    
+    return path
+
+
+def read_snapshot(place_id: str) -> Optional[MenuSnapshot]:
+    """
+    Read the persisted snapshot of a place
+    
+    Returns:
+        MenuSnapshot, or None if missing, unreadable or of another schema
+    """
+    path = snapshot_path(place_id)
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        with gzip.open(path, "rb") as f:
+            data = json.loads(f.read())
+    except Exception as e:
+        logger.warning("menu_snapshot_unreadable", path=path, error=str(e))
+        return None
+    
+    if data.get("schema") != SNAPSHOT_SCHEMA_VERSION:
+        logger.warning(
+            "menu_snapshot_schema_mismatch",
+            path=path,
+            found=data.get("schema"),
+            expected=SNAPSHOT_SCHEMA_VERSION
+        )
+        return None
+    
+    try:
+        return MenuSnapshot.from_dict(data["snapshot"])
+    except Exception as e:
+        logger.warning("menu_snapshot_invalid", path=path, error=str(e))
+        return None
+
+
+async def save_snapshot(snapshot: MenuSnapshot):
+    """Persist a snapshot off the event loop (errors are logged)"""
+    try:
+        path = await asyncio.to_thread(write_snapshot, snapshot)
+        logger.info("menu_snapshot_saved", path=path, version=snapshot.version)
+    except Exception as e:
+        logger.error("menu_snapshot_save_error", error=str(e))
+
+
+async def load_snapshot(place_id: str) -> Optional[MenuSnapshot]:
+    """Read a snapshot off the event loop"""
+    snapshot = await asyncio.to_thread(read_snapshot, place_id)
+    if snapshot:
+        logger.info(
+            "menu_snapshot_loaded",
+            place_id=place_id,
+            version=snapshot.version,
+            items=len(snapshot.items)
+        )
+    return snapshot
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple, Tuple
 from enum import Enum
 from datetime import datetime
 
@@ -33,6 +33,7 @@ class ExtractedOrderItem(BaseModel):
     """Item extracted by LLM"""
     foodName: str
     quantity: int = Field(gt=0)
+    id: Optional[int] = None  # Menu handle from the prompt (app.menu.encoding), cleared once resolved
     menuItemPath: Optional[str] = None  # Filled after matching
 
 
@@ -60,6 +61,28 @@ class ExtractedOrder(BaseModel):
         return v
 
 
+class ContactExtraction(BaseModel):
+    """Customer details read locally (no LLM) from a follow-up message"""
+    customer_name: Optional[str] = None
+    customer_phone: Optional[str] = None
+    delivery_address: Optional[str] = None
+    field_confidence: Dict[str, float] = Field(default_factory=dict)
+    leftover_text: str = ""  # Message minus the recognised spans
+    
+    def to_extracted_order(self, min_confidence: float = 0.7) -> ExtractedOrder:
+        """Keep only the fields at or above min_confidence"""
+        fields = {
+            field: getattr(self, field)
+            for field, score in self.field_confidence.items()
+            if score >= min_confidence and getattr(self, field)
+        }
+        return ExtractedOrder(
+            items=[],
+            confidence=min((self.field_confidence[f] for f in fields), default=0),
+            **fields
+        )
+
+
 # ============= SPREELOOP API - MENU =============
 
 class CookingTime(BaseModel):
@@ -98,6 +121,79 @@ class BaseItem(BaseModel):
         return "Prix non disponible"
 
 
+
+class MenuItem(NamedTuple):
+    """
+    Compact cached menu item (tuple-backed, no per-instance dict)
+    
+    Only the BaseItem fields used by the bot are kept; this is what
+    the menu cache holds instead of full pydantic BaseItem objects.
+    """
+    path: str
+    shortDescription: str
+    foodName: Optional[str] = None
+    priceInXAF: Optional[float] = None
+    categoriesPaths: Tuple[str, ...] = ()
+    longDescription: Optional[str] = None
+    isVegetarian: bool = False
+    
+    @classmethod
+    def from_base_item(cls, item: BaseItem) -> "MenuItem":
+        return cls(
+            path=item.path,
+            shortDescription=item.shortDescription,
+            foodName=item.foodName,
+            priceInXAF=item.priceInXAF,
+            categoriesPaths=tuple(item.categoriesPaths),
+            longDescription=item.longDescription,
+            isVegetarian=item.isVegetarian,
+        )
+    
+    @classmethod
+    def from_row(cls, row: List[Any]) -> "MenuItem":
+        """Rebuild from a JSON row (list(item)); lists become tuples again"""
+        item = cls(*row)
+        return item._replace(categoriesPaths=tuple(item.categoriesPaths))
+    
+    def display_name(self) -> str:
+        """Display name for UI"""
+        return self.foodName or self.shortDescription
+    
+    def display_price(self) -> str:
+        """Formatted price"""
+        if self.priceInXAF:
+            return f"{int(self.priceInXAF)} XAF"
+        return "Prix non disponible"
+
+
+class MenuSnapshot(NamedTuple):
+    """
+    Menu of one place at a point in time
+    
+    version changes only when the menu content changes: downstream caches
+    (formatted prompt, pages, ...) can use it as a key.
+    """
+    place_id: str
+    version: int
+    items: Tuple[MenuItem, ...]
+    content_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready form (items as compact rows)"""
+        data = self._asdict()
+        data["items"] = [list(item) for item in self.items]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MenuSnapshot":
+        return cls(**{
+            **data,
+            "items": tuple(MenuItem.from_row(row) for row in data["items"])
+        })
+
 # ============= SPREELOOP API - ORDER =============
 
 class OrderItemRequest(BaseModel):
@@ -0,0 +1,106 @@
+"""Stateful order assembly: merge successive extractions into one pending order"""
+
+from app.models import ExtractedOrder, ExtractedOrderItem
+from typing import List, Optional
+
+# Infos client obligatoires avant confirmation (paiement: toujours cash)
+REQUIRED_CUSTOMER_FIELDS = ["customer_name", "customer_phone", "delivery_address"]
+
+
+def get_missing_fields(order: ExtractedOrder) -> List[str]:
+    """
+    Compute the fields still needed before the order can be confirmed
+    
+    Args:
+        order: Pending or freshly extracted order
+    
+    Returns:
+        List of missing field names ("items" first if no product yet)
+    """
+    missing = []
+    if not order.items:
+        missing.append("items")
+    for field in REQUIRED_CUSTOMER_FIELDS:
+        if not getattr(order, field):
+            missing.append(field)
+    return missing
+
+
+def is_order_complete(order: ExtractedOrder) -> bool:
+    """True when items and all customer fields are present"""
+    return not get_missing_fields(order)
+
+
+def _same_item(a: ExtractedOrderItem, b: ExtractedOrderItem) -> bool:
+    """Match items by menu path, else by case-insensitive name"""
+    if a.menuItemPath and b.menuItemPath:
+        return a.menuItemPath == b.menuItemPath
+    return a.foodName.strip().lower() == b.foodName.strip().lower()
+
+
+def merge_items(
+    pending: List[ExtractedOrderItem],
+    new: List[ExtractedOrderItem]
+) -> List[ExtractedOrderItem]:
+    """
+    Merge newly extracted items into the pending list
+    
+    An item already in the order takes the new quantity ("plutôt 3 pizzas"),
+    other items are appended ("ajoute 1 coca").
+    """
+    merged = [item.model_copy() for item in pending]
+    for new_item in new:
+        existing = next((m for m in merged if _same_item(m, new_item)), None)
+        if existing is None:
+            merged.append(new_item.model_copy())
+            continue
+        existing.quantity = new_item.quantity
+        existing.menuItemPath = new_item.menuItemPath or existing.menuItemPath
+    return merged
+
+
+def merge_orders(
+    pending: Optional[ExtractedOrder],
+    update: ExtractedOrder
+) -> ExtractedOrder:
+    """
+    Merge a new extraction into the pending order
+    
+    Values found in the new message win; fields it does not mention keep
+    their pending value. missing_fields is recomputed on the result.
+    
+    Args:
+        pending: Order stored in pending_partial_order (None if no pending order)
+        update: Extraction of the latest user message
+    
+    Returns:
+        Merged ExtractedOrder
+    """
+    if pending is None:
+        merged = update.model_copy()
+        merged.missing_fields = get_missing_fields(merged)
+        return merged
+    
+    merged = pending.model_copy(update={
+        "items": merge_items(pending.items, update.items),
+        "customer_name": update.customer_name or pending.customer_name,
+        "customer_phone": update.customer_phone or pending.customer_phone,
+        "delivery_address": update.delivery_address or pending.delivery_address,
+        "payment_method": update.payment_method or pending.payment_method,
+        "special_instructions": update.special_instructions or pending.special_instructions,
+        "confidence": (
+            max(pending.confidence, update.confidence) if update.items
+            else pending.confidence
+        ),
+    })
+    merged.missing_fields = get_missing_fields(merged)
+    return merged
+
+
+def fills_any_field(update: ExtractedOrder, missing_fields: List[str]) -> bool:
+    """True if the extraction provides at least one of the missing fields"""
+    return any(
+        getattr(update, field, None)
+        for field in missing_fields
+        if field != "items"
+    ) or ("items" in missing_fields and bool(update.items))
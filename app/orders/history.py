@@ -0,0 +1,270 @@
+"""Local order history (SQLite, batched writes)
+
+Every order created through the API is recorded: user, items, total,
+place, customer details, API latency and the CreateOrderRequest payload.
+record() only appends to an in-memory buffer; a background task writes
+the buffer in one transaction every ORDER_HISTORY_FLUSH_INTERVAL seconds
+(or as soon as ORDER_HISTORY_BATCH_SIZE orders are waiting), so order
+creation never waits for the disk.
+
+Indexes by (user_id, created_at) and created_at serve the per-user
+recent orders and the per-hour volumes queries.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from app.config import get_settings
+from app.models import CreateOrderRequest
+from app.utils.metrics import metrics
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    order_path TEXT NOT NULL,
+    place_path TEXT,
+    items TEXT NOT NULL,
+    total_xaf REAL NOT NULL,
+    customer_name TEXT,
+    customer_phone TEXT,
+    delivery_address TEXT,
+    latency_ms REAL,
+    request TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_by_user ON orders (user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS orders_by_time ON orders (created_at);
+"""
+
+COLUMNS = (
+    "user_id", "order_path", "place_path", "items", "total_xaf", "customer_name",
+    "customer_phone", "delivery_address", "latency_ms", "request", "created_at",
+)
+
+
+class OrderRecord(NamedTuple):
+    """One created order"""
+    user_id: int
+    order_path: str
+    place_path: Optional[str]
+    items: List[Dict[str, Any]]  # {"menuItemPath", "foodName", "count", "priceInXAF"}
+    total_xaf: float
+    customer_name: Optional[str]
+    customer_phone: Optional[str]
+    delivery_address: Optional[str]
+    latency_ms: Optional[float]
+    request: Dict[str, Any]  # CreateOrderRequest.model_dump(mode="json")
+    created_at: float
+
+    @classmethod
+    def from_request(
+        cls,
+        user_id: int,
+        order_path: str,
+        request: CreateOrderRequest,
+        delivery_address: Optional[str] = None,
+        latency_ms: Optional[float] = None
+    ) -> "OrderRecord":
+        items, place_path = [], None
+        for restaurant_order in request.orders.values():
+            place_path = place_path or restaurant_order.placePath
+            items.extend(
+                {
+                    "menuItemPath": item.menuItemPath,
+                    "foodName": item.foodName,
+                    "count": item.count,
+                    "priceInXAF": item.priceInXAF,
+                }
+                for item in restaurant_order.selectedItems
+            )
+        return cls(
+            user_id=user_id,
+            order_path=order_path,
+            place_path=place_path,
+            items=items,
+            total_xaf=sum(item["count"] * item["priceInXAF"] for item in items),
+            customer_name=request.guestUserName,
+            customer_phone=request.guestUserNumber,
+            delivery_address=delivery_address,
+            latency_ms=round(latency_ms, 1) if latency_ms is not None else None,
+            request=request.model_dump(mode="json"),
+            created_at=time.time()
+        )
+
+    def to_row(self) -> tuple:
+        return (
+            self.user_id, self.order_path, self.place_path,
+            json.dumps(self.items, ensure_ascii=False), self.total_xaf,
+            self.customer_name, self.customer_phone, self.delivery_address, self.latency_ms,
+            json.dumps(self.request, ensure_ascii=False), self.created_at,
+        )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "OrderRecord":
+        data = dict(zip(COLUMNS, row))
+        data["items"] = json.loads(data["items"])
+        data["request"] = json.loads(data["request"])
+        return cls(**data)
+
+
+class OrderHistory:
+    """Order history store with a write-behind buffer"""
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        max_pending: int = 10_000
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: List[OrderRecord] = []
+        self._writing: List[OrderRecord] = []  # Lot en cours d'écriture (encore lisible)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    # ===== CONNEXION (bloquant: appelé via asyncio.to_thread) =====
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _write(self, rows: List[tuple]):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    f"INSERT INTO orders ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    rows
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    # ===== ÉCRITURE =====
+
+    def record(self, order: OrderRecord):
+        """Queue an order for the next batch (never blocks)"""
+        if len(self._pending) >= self.max_pending:
+            metrics.inc("order_history.dropped")
+            logger.warning("order_history_buffer_full", order_path=order.order_path)
+            return
+        self._pending.append(order)
+        metrics.inc("order_history.recorded")
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Write the buffered orders now (one transaction)"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self._writing = batch
+        try:
+            await asyncio.to_thread(self._write, [order.to_row() for order in batch])
+            metrics.inc("order_history.flushed", len(batch))
+        except Exception as e:
+            # Remis en tête du tampon pour le prochain essai
+            self._pending[:0] = batch
+            logger.error("order_history_flush_error", error=str(e), pending=len(self._pending))
+        finally:
+            self._writing = []
+
+    def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the writer and flush what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    # ===== LECTURE =====
+
+    async def recent_orders(self, user_id: int, limit: int = 5) -> List[OrderRecord]:
+        """Latest orders of a user, newest first (including orders not yet written)"""
+        unwritten = self._writing + self._pending
+        rows = await asyncio.to_thread(
+            self._query,
+            f"SELECT {', '.join(COLUMNS)} FROM orders WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+            (user_id, limit)
+        )
+        stored = [OrderRecord.from_row(row) for row in rows]
+        written = {order.order_path for order in stored}
+        buffered = [
+            order for order in reversed(unwritten)
+            if order.user_id == user_id and order.order_path not in written
+        ]
+        return (buffered + stored)[:limit]
+
+    async def hourly_volumes(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Orders and revenue per hour over the last `hours` (written orders only)"""
+        since = time.time() - hours * 3600
+        rows: List[Tuple[float, int, float]] = await asyncio.to_thread(
+            self._query,
+            "SELECT CAST(created_at / 3600 AS INTEGER) * 3600 AS hour, COUNT(*), SUM(total_xaf) "
+            "FROM orders WHERE created_at >= ? GROUP BY hour ORDER BY hour",
+            (since,)
+        )
+        return [
+            {
+                "hour": time.strftime("%Y-%m-%dT%H:00:00Z", time.gmtime(hour)),
+                "orders": count,
+                "total_xaf": total,
+            }
+            for hour, count, total in rows
+        ]
+
+
+# Singleton instance
+order_history = OrderHistory(
+    settings.order_history_path,
+    batch_size=settings.order_history_batch_size,
+    flush_interval=settings.order_history_flush_interval
+)
+metrics.gauge("order_history.pending", lambda: len(order_history._pending))
@@ -0,0 +1,91 @@
+"""Reorder ("same as last time") rebuilt from the order history
+
+"comme d'habitude", "la même chose que la dernière fois", "same as last
+time", or the 🔁 button under a created order: the last OrderRecord of
+the user is checked against the current menu (items still on the menu
+and priced, current prices) and turned back into an ExtractedOrder with
+its menu paths and customer details, ready for the confirmation step.
+No LLM call is made.
+"""
+
+import re
+from typing import List, NamedTuple, Optional
+from app.llm.gazetteer import normalize_text
+from app.menu.cache import menu_cache
+from app.models import ExtractedOrder, ExtractedOrderItem
+from app.orders.assembly import get_missing_fields
+from app.orders.history import OrderRecord
+
+# Sur le texte normalisé (minuscules, sans accents, ponctuation retirée)
+REORDER_RE = re.compile(
+    r"\b(?:comme d habitude|comme la derniere fois|comme la fois passee|comme avant"
+    r"|(?:la )?meme (?:chose|commande)(?: que la derniere fois)?"
+    r"|same as (?:last time|before|usual)|the usual|same again|same order|reorder|order again)\b"
+)
+
+# Au-delà, le message contient sans doute autre chose (ex: "comme d'habitude mais sans piment ...")
+MAX_REORDER_WORDS = 8
+
+
+class Reorder(NamedTuple):
+    order: ExtractedOrder
+    unavailable: List[str]  # Produits retirés du menu depuis la dernière commande
+    price_changes: List[str]  # "Ndolé: 3000 → 3500 XAF"
+
+
+def _tokens(text: str) -> str:
+    return " ".join(re.findall(r"\w+", normalize_text(text)))
+
+
+def is_reorder_request(message: str) -> bool:
+    """True for a short "same as last time" message"""
+    normalized = _tokens(message)
+    return (
+        len(normalized.split()) <= MAX_REORDER_WORDS
+        and not re.search(r"\d", normalized)
+        and REORDER_RE.search(normalized) is not None
+    )
+
+
+def rebuild_order(record: OrderRecord) -> Reorder:
+    """Last order re-validated against the current menu"""
+    items, unavailable, price_changes = [], [], []
+    for item in record.items:
+        menu_item = menu_cache.find(item["menuItemPath"])
+        if menu_item is None or not menu_item.priceInXAF:
+            unavailable.append(item["foodName"])
+            continue
+        if menu_item.priceInXAF != item["priceInXAF"]:
+            price_changes.append(
+                f"{menu_item.display_name()}: {int(item['priceInXAF'])} → {int(menu_item.priceInXAF)} XAF"
+            )
+        items.append(ExtractedOrderItem(
+            foodName=menu_item.display_name(),
+            quantity=item["count"],
+            menuItemPath=menu_item.path
+        ))
+
+    order = ExtractedOrder(
+        items=items,
+        customer_name=record.customer_name,
+        customer_phone=record.customer_phone,
+        delivery_address=record.delivery_address,
+        confidence=1.0
+    )
+    order.missing_fields = get_missing_fields(order)
+    return Reorder(order, unavailable, price_changes)
+
+
+def reorder_notice(reorder: Reorder, language: str) -> Optional[str]:
+    """What changed since the last order, or None"""
+    lines = []
+    if reorder.unavailable:
+        names = ", ".join(reorder.unavailable)
+        lines.append(
+            f"⚠️ Plus disponible: {names}" if language == "fr" else f"⚠️ No longer available: {names}"
+        )
+    if reorder.price_changes:
+        lines.append(("💱 Nouveaux prix:\n" if language == "fr" else "💱 New prices:\n") + "\n".join(
+            f"• {change}" for change in reorder.price_changes
+        ))
+    return "\n\n".join(lines) or None
@@ -0,0 +1,73 @@
+"""Single-flight order submission
+
+A double tap on "Confirmer", or a redelivered callback, must not create
+two orders. Submissions are keyed by user and pending-order hash: while
+one is in flight, later taps wait for its result instead of calling the
+API again. Nothing is remembered once it completes: a tap arriving after
+a success finds pending_order already gone (handle_confirm_callback), and
+the same order confirmed again later (a reorder) is a new order.
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from app.models import ExtractedOrder
+import structlog
+
+logger = structlog.get_logger()
+
+
+def order_submission_key(user_id: int, order: ExtractedOrder) -> str:
+    """Stable key of a user's pending order (same items + details → same key)"""
+    payload = order.model_dump_json()  # Ordre des champs fixé par le modèle
+    return f"{user_id}:{hashlib.sha256(payload.encode()).hexdigest()[:16]}"
+
+
+class OrderSubmitter:
+    """Deduplicates concurrent submissions of the same order"""
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def is_in_flight(self, key: str) -> bool:
+        return key in self._in_flight
+
+    async def submit(self, key: str, create: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run create() once per key at a time
+
+        Args:
+            key: order_submission_key(...)
+            create: Zero-argument callable sending the order
+
+        Returns:
+            (result, duplicate) where duplicate is True if the result
+            comes from a concurrent submission of the same order
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            logger.info("order_submission_duplicate", key=key, state="in_flight")
+            # shield: un tap annulé ne doit pas annuler la soumission en cours
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await create()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Pas de "exception was never retrieved" sans tap en attente
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._in_flight[key]
+
+
+# Singleton instance
+order_submitter = OrderSubmitter()
@@ -1,38 +1,50 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
-from app.llm.gemini import extract_order_gemini
-from app.llm.groq import extract_order_groq
+from app.llm.router import extract_order, extract_missing_fields, extraction_failed
+from app.llm.local_extractor import extract_contact_info, menu_name_words
 from app.llm.conversational import generate_conversational_response, classify_message_intent
 from app.api.spreeloop import api_client
 from app.models import ExtractedOrder, CreateOrderRequest, PaymentGateway, OrderItemRequest, RestaurantOrder
+from app.orders.assembly import get_missing_fields, merge_orders, fills_any_field
+from app.orders.submission import order_submitter, order_submission_key
+from app.orders.history import order_history, OrderRecord
+from app.orders.reorder import is_reorder_request, rebuild_order, reorder_notice
 from app.config import get_settings
+from app.menu.cache import menu_cache
+from app.menu.pages import menu_pages, is_menu_request, parse_page_callback
+from app.menu.faq import faq_cache
+from app.menu.encoding import menu_prompt, resolve_item_handles
+from app.telegram.sender import sender, PRIORITY_CONFIRMATION
+from app.utils.tracing import span, traced
+from app.utils.admission import admission
 import structlog
 import json
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List, Optional
 
 logger = structlog.get_logger()
 settings = get_settings()
 
-# Cache menu (refresh toutes les 5 min)
-menu_cache = {"items": [], "timestamp": 0}
-
 async def get_menu_formatted() -> str:
-    """Retourne menu formaté pour prompt LLM"""
-    import time
-    
-    if time.time() - menu_cache["timestamp"] > 300:  # 5 min
-        items = await api_client.get_menu_items()
-        menu_cache["items"] = items
-        menu_cache["timestamp"] = time.time()
-    
-    # Format: "Pizza Margherita (5000 XAF) - menuItems/xxx"
-    menu_str = "\n".join([
-        f"{item.foodName or item.shortDescription} ({int(item.priceInXAF)} XAF) - {item.path}"
-        for item in menu_cache["items"]
-        if item.priceInXAF
-    ])
-    
-    return menu_str
+    """Retourne menu formaté pour prompt LLM (encodage compact, voir app.menu.encoding)"""
+    with span("menu.get"):
+        await menu_cache.get_snapshot()
+    return menu_prompt.text
+
+
+# Mots des noms de plats (jamais pris pour un nom de client), par version du menu
+_menu_words = {"version": None, "words": frozenset()}
+
+
+def get_menu_words() -> frozenset:
+    """Words of the cached menu item names"""
+    if _menu_words["version"] != menu_cache.version:
+        _menu_words["words"] = frozenset(menu_name_words(
+            item.foodName or item.shortDescription for item in menu_cache.items
+        ))
+        _menu_words["version"] = menu_cache.version
+    return _menu_words["words"]
 
 
 def get_conversation_history(context: ContextTypes.DEFAULT_TYPE) -> list:
@@ -55,6 +67,161 @@ def add_to_conversation_history(
         context.user_data["conversation_history"] = history[-10:]
 
 
+def get_session_order(context: ContextTypes.DEFAULT_TYPE, key: str) -> Optional[ExtractedOrder]:
+    """
+    ExtractedOrder stored under key in user_data, if any
+    
+    Orders are kept as typed objects in the session (no dict round trip);
+    a session reloaded from the shared store holds their JSON dict, which
+    is validated once and put back typed.
+    """
+    value = context.user_data.get(key)
+    if not value or isinstance(value, ExtractedOrder):
+        return value or None
+    order = ExtractedOrder(**value)
+    context.user_data[key] = order
+    return order
+
+
+def get_pending_partial_order(context: ContextTypes.DEFAULT_TYPE) -> Optional[ExtractedOrder]:
+    """Return the pending partial order stored for this user, if any"""
+    return get_session_order(context, "pending_partial_order")
+
+
+def build_missing_fields_reply(
+    order: ExtractedOrder,
+    language: str,
+    show_items: bool = True
+) -> str:
+    """
+    Build the reply asking for the fields still missing on an order
+    
+    Args:
+        order: Partial order (missing_fields already computed)
+        language: "fr" or "en"
+        show_items: Prefix the reply with what was understood so far
+    """
+    understood = ""
+    if show_items:
+        items_preview = "\n".join([
+            f"• {item.quantity}x {item.foodName}"
+            for item in order.items
+        ])
+        
+        if language == "fr":
+            understood = f"Super ! J'ai compris :\n{items_preview}\n\n"
+        else:
+            understood = f"Great! I understood:\n{items_preview}\n\n"
+    
+    # Demander les infos manquantes de façon naturelle
+    missing_fields_map = {
+        "customer_name": ("votre nom", "your name"),
+        "customer_phone": ("votre numéro de téléphone", "your phone number"),
+        "delivery_address": ("l'adresse de livraison", "the delivery address"),
+    }
+    
+    missing_items = []
+    for field in order.missing_fields:
+        if field in missing_fields_map:
+            missing_items.append(
+                missing_fields_map[field][0] if language == "fr" 
+                else missing_fields_map[field][1]
+            )
+    
+    if not missing_items:
+        return understood
+    
+    if language == "fr":
+        missing_text = ", ".join(missing_items[:-1])
+        if len(missing_items) > 1:
+            missing_text += f" et {missing_items[-1]}"
+        else:
+            missing_text = missing_items[0]
+        
+        return f"{understood}Pour finaliser, j'ai besoin de {missing_text}. Pouvez-vous me les donner ? 😊"
+    
+    missing_text = ", ".join(missing_items[:-1])
+    if len(missing_items) > 1:
+        missing_text += f" and {missing_items[-1]}"
+    else:
+        missing_text = missing_items[0]
+    
+    return f"{understood}To complete your order, I need {missing_text}. Can you provide them? 😊"
+
+
+async def continue_partial_order(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    pending: ExtractedOrder,
+    user_message: str,
+    language: str,
+    use_llm: bool = True
+) -> bool:
+    """
+    Fill the pending partial order from a follow-up message
+    
+    Customer details are read locally first; only the fields still missing
+    after that are asked to the LLM, with a small prompt without the menu
+    (unless use_llm is False: degraded mode, local parsing only).
+    
+    Returns:
+        True if the message was consumed, False if it carried none of the
+        missing fields (caller falls back to the full pipeline)
+    """
+    missing = [f for f in get_missing_fields(pending) if f != "items"]
+    if not missing:
+        return False
+    
+    # Extraction locale d'abord (regex + gazetteer), LLM seulement pour le reste
+    with span("local.extract_contact_info"):
+        local = extract_contact_info(
+            user_message,
+            expected_fields=missing,
+            menu_words=get_menu_words()
+        )
+    followup = local.to_extracted_order(settings.local_extraction_min_confidence)
+    still_missing = [f for f in missing if not getattr(followup, f)]
+    
+    if still_missing and local.leftover_text and use_llm:
+        llm_followup = await extract_missing_fields(user_message, still_missing, language)
+        if extraction_failed(llm_followup) and not fills_any_field(followup, missing):
+            # Aucun fournisseur LLM n'a répondu: redemander plutôt que relancer tout le pipeline
+            reply = build_missing_fields_reply(
+                pending.model_copy(update={"missing_fields": missing}), language, show_items=False
+            )
+            add_to_conversation_history(context, "Bot", reply)
+            await sender.reply_text(update.message, reply)
+            return True
+        followup = merge_orders(llm_followup, followup)
+    else:
+        logger.info("partial_order_llm_skipped", filled=[f for f in missing if f not in still_missing])
+    
+    if not fills_any_field(followup, missing):
+        logger.info("partial_order_followup_no_fields", missing_fields=missing)
+        return False
+    
+    merged = merge_orders(pending, followup)
+    
+    logger.info(
+        "partial_order_merged",
+        filled=[f for f in missing if f not in merged.missing_fields],
+        missing_fields=merged.missing_fields
+    )
+    
+    if not merged.missing_fields:
+        context.user_data.pop("pending_partial_order", None)
+        await show_order_confirmation(update, context, merged, language)
+        return True
+    
+    context.user_data["pending_partial_order"] = merged
+    
+    reply = build_missing_fields_reply(merged, language, show_items=False)
+    add_to_conversation_history(context, "Bot", reply)
+    await sender.reply_text(update.message, reply)
+    return True
+
+
+@traced("telegram.handle_message")
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Handler principal messages Telegram - VERSION CONVERSATIONNELLE
@@ -83,28 +250,61 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Store language preference
     context.user_data["language"] = language
     
-    # Get menu
+    # Surcharge: pas de nouvel appel LLM (voir app.utils.admission)
+    degraded = admission.degraded
+    
+    # ===== COMMANDE EN COURS: compléter les champs manquants =====
+    pending = get_pending_partial_order(context)
+    if pending is not None:
+        add_to_conversation_history(context, "Client", user_message)
+        if await continue_partial_order(
+            update, context, pending, user_message, language, use_llm=not degraded
+        ):
+            return
+    
+    # ===== DEMANDE DU MENU: pages pré-rendues, sans LLM =====
+    if pending is None and is_menu_request(user_message):
+        await send_menu(update, context, language)
+        return
+    
+    # Get menu (handles du prompt valables pour cette version: encoding capturé ici)
     menu_str = await get_menu_formatted()
+    encoding = menu_prompt.encoding
+    
+    # ===== QUESTION SUR UN PLAT: réponse pré-calculée, sans LLM =====
+    if pending is None:
+        answer = faq_cache.answer(user_message, language)
+        if answer is not None:
+            add_to_conversation_history(context, "Client", user_message)
+            add_to_conversation_history(context, "Bot", answer)
+            await sender.reply_text(update.message, answer)
+            return
+    
+    # ===== "COMME D'HABITUDE": dernière commande de l'historique, sans LLM =====
+    if pending is None and is_reorder_request(user_message):
+        add_to_conversation_history(context, "Client", user_message)
+        if await reorder_last(update, context, language):
+            return
+    
+    # ===== MODE DÉGRADÉ: menu pré-rendu ou réponse "occupé", sans LLM =====
+    if degraded:
+        await reply_degraded(update, context, user_message, language)
+        return
     
     # Get conversation history
     conversation_history = get_conversation_history(context)
     
     # Add user message to history
-    add_to_conversation_history(context, "Client", user_message)
+    if pending is None:
+        add_to_conversation_history(context, "Client", user_message)
     
-    # Extraction LLM avec fallback
-    try:
-        extracted = await extract_order_gemini(user_message, menu_str, language)
-    except Exception as e:
-        logger.warning("gemini_failed_fallback_groq", error=str(e))
-        try:
-            extracted = await extract_order_groq(user_message, menu_str, language)
-        except:
-            extracted = ExtractedOrder(
-                items=[],
-                confidence=0,
-                missing_fields=["all"]
-            )
+    # Extraction LLM: modèle rapide ou précis selon la complexité, avec fallback
+    extracted = await extract_order(user_message, menu_str, language)
+    extracted = resolve_item_handles(extracted, encoding)
+    
+    # Fusionner avec la commande en attente (ex: "ajoute 1 coca")
+    if extracted.items:
+        extracted = merge_orders(pending, extracted)
     
     # Classifier l'intention du message
     intent = classify_message_intent(user_message, extracted)
@@ -127,66 +327,23 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         
         add_to_conversation_history(context, "Bot", reply)
-        await update.message.reply_text(reply)
+        await sender.reply_text(update.message, reply)
         return
     
     # ===== CAS 2: COMMANDE PARTIELLE (items détectés mais infos manquantes) =====
     if intent == "partial_order" and extracted.items:
-        # Afficher ce qui a été compris
-        items_preview = "\n".join([
-            f"• {item.quantity}x {item.foodName}"
-            for item in extracted.items
-        ])
-        
-        if language == "fr":
-            understood = f"Super ! J'ai compris :\n{items_preview}\n\n"
-        else:
-            understood = f"Great! I understood:\n{items_preview}\n\n"
-        
-        # Demander les infos manquantes de façon naturelle
-        missing_fields_map = {
-            "customer_name": ("votre nom", "your name"),
-            "customer_phone": ("votre numéro de téléphone", "your phone number"),
-            "delivery_address": ("l'adresse de livraison", "the delivery address"),
-        }
-        
-        missing_items = []
-        for field in extracted.missing_fields:
-            if field in missing_fields_map:
-                missing_items.append(
-                    missing_fields_map[field][0] if language == "fr" 
-                    else missing_fields_map[field][1]
-                )
-        
-        if missing_items:
-            if language == "fr":
-                missing_text = ", ".join(missing_items[:-1])
-                if len(missing_items) > 1:
-                    missing_text += f" et {missing_items[-1]}"
-                else:
-                    missing_text = missing_items[0]
-                
-                reply = f"{understood}Pour finaliser, j'ai besoin de {missing_text}. Pouvez-vous me les donner ? 😊"
-            else:
-                missing_text = ", ".join(missing_items[:-1])
-                if len(missing_items) > 1:
-                    missing_text += f" and {missing_items[-1]}"
-                else:
-                    missing_text = missing_items[0]
-                
-                reply = f"{understood}To complete your order, I need {missing_text}. Can you provide them? 😊"
-        else:
-            reply = understood
+        reply = build_missing_fields_reply(extracted, language)
         
         # Stocker la commande partielle
-        context.user_data["pending_partial_order"] = extracted.model_dump()
+        context.user_data["pending_partial_order"] = extracted
         
         add_to_conversation_history(context, "Bot", reply)
-        await update.message.reply_text(reply)
+        await sender.reply_text(update.message, reply)
         return
     
     # ===== CAS 3: COMMANDE COMPLÈTE =====
     if intent == "complete_order" and extracted.items:
+        context.user_data.pop("pending_partial_order", None)
         await show_order_confirmation(update, context, extracted, language)
         return
     
@@ -200,7 +357,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
     
     add_to_conversation_history(context, "Bot", reply)
-    await update.message.reply_text(reply)
+    await sender.reply_text(update.message, reply)
 
 
 async def show_order_confirmation(
@@ -220,10 +377,7 @@ async def show_order_confirmation(
     total_price = 0
     for item in extracted.items:
         # Find item in menu cache
-        menu_item = next(
-            (m for m in menu_cache["items"] if m.path == item.menuItemPath),
-            None
-        )
+        menu_item = menu_cache.find(item.menuItemPath)
         if menu_item and menu_item.priceInXAF:
             total_price += item.quantity * menu_item.priceInXAF
     
@@ -245,64 +399,179 @@ async def show_order_confirmation(
         f"Everything correct?"
     )
     
-    keyboard = [
+    # Stocker extracted dans context pour callback
+    context.user_data["pending_order"] = extracted
+    context.user_data["language"] = language
+    
+    # effective_message: aussi appelé depuis le bouton 🔁 (callback, pas de update.message)
+    await sender.reply_text(
+        update.effective_message,
+        confirm_text,
+        priority=PRIORITY_CONFIRMATION,
+        reply_markup=confirm_keyboard(update.effective_user.id, language),
+        parse_mode="Markdown"
+    )
+
+
+def confirm_keyboard(user_id: int, language: str) -> InlineKeyboardMarkup:
+    """Boutons Confirmer / Annuler du récapitulatif"""
+    return InlineKeyboardMarkup([
         [
             InlineKeyboardButton(
                 "✅ Confirmer" if language == "fr" else "✅ Confirm", 
-                callback_data=f"confirm_{update.effective_user.id}"
+                callback_data=f"confirm_{user_id}"
             ),
             InlineKeyboardButton(
                 "❌ Annuler" if language == "fr" else "❌ Cancel", 
-                callback_data=f"cancel_{update.effective_user.id}"
+                callback_data=f"cancel_{user_id}"
             )
         ]
-    ]
+    ])
+
+
+async def edit_confirmation(query, text: str, **kwargs):
+    """
+    Edit the order summary message with the outcome
     
-    # Stocker extracted dans context pour callback
-    context.user_data["pending_order"] = extracted.model_dump()
-    context.user_data["language"] = language
+    Concurrent taps of one order all edit the same message with the same
+    outcome: Telegram's "message is not modified" is expected there.
+    """
+    try:
+        await sender.edit_message_text(query, text, priority=PRIORITY_CONFIRMATION, **kwargs)
+    except BadRequest as e:
+        if "not modified" not in str(e).lower():
+            raise
+
+
+def reorder_keyboard(user_id: int, language: str) -> InlineKeyboardMarkup:
+    """Bouton "Commander à nouveau" sous une commande créée"""
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton(
+            "🔁 Commander à nouveau" if language == "fr" else "🔁 Order again",
+            callback_data=f"reorder_{user_id}"
+        )
+    ]])
+
+
+async def reorder_last(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    language: str
+) -> bool:
+    """
+    Re-propose the user's last order (order history + current menu, no LLM)
     
-    await update.message.reply_text(
-        confirm_text,
-        reply_markup=InlineKeyboardMarkup(keyboard),
-        parse_mode="Markdown"
+    Returns:
+        False when the user has no order in the history
+    """
+    records = await order_history.recent_orders(update.effective_user.id, limit=1)
+    if not records:
+        return False
+    
+    with span("menu.get"):
+        await menu_cache.get_snapshot()
+    reorder = rebuild_order(records[0])
+    logger.info(
+        "reorder_requested",
+        order_path=records[0].order_path,
+        items=len(reorder.order.items),
+        unavailable=len(reorder.unavailable),
+        price_changes=len(reorder.price_changes)
     )
+    
+    notice = reorder_notice(reorder, language)
+    if notice:
+        await sender.reply_text(update.effective_message, notice)
+    
+    if not reorder.order.items:
+        reply = (
+            "Les produits de votre dernière commande ne sont plus au menu. Tapez /menu pour voir la carte 😊"
+        ) if language == "fr" else (
+            "The items of your last order are no longer on the menu. Type /menu to see what we have 😊"
+        )
+        add_to_conversation_history(context, "Bot", reply)
+        await sender.reply_text(update.effective_message, reply)
+        return True
+    
+    # Ancienne commande sans adresse (par ex.): compléter comme une commande partielle
+    if reorder.order.missing_fields:
+        reply = build_missing_fields_reply(reorder.order, language)
+        context.user_data["pending_partial_order"] = reorder.order
+        add_to_conversation_history(context, "Bot", reply)
+        await sender.reply_text(update.effective_message, reply)
+        return True
+    
+    context.user_data.pop("pending_partial_order", None)
+    await show_order_confirmation(update, context, reorder.order, language)
+    return True
+
+
+@traced("telegram.handle_reorder_callback")
+async def handle_reorder_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Bouton 🔁: même commande que la dernière fois"""
+    query = update.callback_query
+    await query.answer()
+    language = context.user_data.get("language", "fr")
+    
+    if not await reorder_last(update, context, language):
+        await sender.reply_text(
+            update.effective_message,
+            "Aucune commande précédente trouvée. Que souhaitez-vous commander ? 😊" if language == "fr"
+            else "No previous order found. What would you like to order? 😊"
+        )
 
 
+@traced("telegram.handle_confirm_callback")
 async def handle_confirm_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Callback confirmation commande
     """
     query = update.callback_query
-    await query.answer()
-    
     action, user_id = query.data.split("_")
     language = context.user_data.get("language", "fr")
     
     if action == "cancel":
+        await query.answer()
+        context.user_data.pop("pending_order", None)
         reply = "Commande annulée. 😊 N'hésitez pas si vous changez d'avis !" if language == "fr" else "Order cancelled. 😊 Don't hesitate if you change your mind!"
-        await query.edit_message_text(reply)
+        await sender.edit_message_text(query, reply, priority=PRIORITY_CONFIRMATION)
         return
     
     # Confirmer → Créer commande API
-    extracted_data = context.user_data.get("pending_order")
-    if not extracted_data:
-        await query.edit_message_text(
+    extracted = get_session_order(context, "pending_order")
+    if extracted is None and context.user_data.get("submitted_order"):
+        # Tap en double après la création: rien à renvoyer
+        await query.answer(
+            "✅ Commande déjà envoyée" if language == "fr" else "✅ Order already sent"
+        )
+        return
+    
+    await query.answer()
+    
+    if extracted is None:
+        await sender.edit_message_text(
+            query,
             "Erreur: commande expirée. Veuillez recommencer." if language == "fr" 
-            else "Error: order expired. Please start again."
+            else "Error: order expired. Please start again.",
+            priority=PRIORITY_CONFIRMATION
         )
         return
     
-    extracted = ExtractedOrder(**extracted_data)
+    submission_key = order_submission_key(update.effective_user.id, extracted)
+    
+    # Retirer les boutons dès le premier tap (un seul envoi visible)
+    if not order_submitter.is_in_flight(submission_key):
+        await sender.edit_message_text(
+            query,
+            "⏳ Envoi de votre commande..." if language == "fr" else "⏳ Sending your order...",
+            priority=PRIORITY_CONFIRMATION
+        )
     
     # Construire payload API
     order_items = []
     for item in extracted.items:
         # Trouver item dans menu cache
-        menu_item = next(
-            (m for m in menu_cache["items"] if m.path == item.menuItemPath),
-            None
-        )
+        menu_item = menu_cache.find(item.menuItemPath)
         if not menu_item:
             logger.warning("menu_item_not_found", path=item.menuItemPath)
             continue
@@ -316,9 +585,11 @@ async def handle_confirm_callback(update: Update, context: ContextTypes.DEFAULT_
         ))
     
     if not order_items:
-        await query.edit_message_text(
+        await sender.edit_message_text(
+            query,
             "❌ Erreur: impossible de trouver les produits. Veuillez réessayer." if language == "fr"
-            else "❌ Error: cannot find products. Please try again."
+            else "❌ Error: cannot find products. Please try again.",
+            priority=PRIORITY_CONFIRMATION
         )
         return
     
@@ -349,13 +620,29 @@ async def handle_confirm_callback(update: Update, context: ContextTypes.DEFAULT_
     try:
         logger.info("creating_order", guest_name=extracted.customer_name)
         
-        result = await api_client.create_order(
-            order_payload,
-            idempotency_key=f"{extracted.customer_phone}_{int(update.callback_query.message.date.timestamp())}"
+        # Single-flight: les taps suivants attendent le résultat du premier
+        started = time.perf_counter()
+        result, duplicate = await order_submitter.submit(
+            submission_key,
+            lambda: api_client.create_order(
+                order_payload,
+                idempotency_key=f"{extracted.customer_phone}_{int(update.callback_query.message.date.timestamp())}"
+            )
         )
         
         if result.data and result.data.orderGroupPath:
             order_path = result.data.orderGroupPath
+            context.user_data.pop("pending_order", None)
+            context.user_data["submitted_order"] = {"key": submission_key, "order_path": order_path}
+            # Tap concurrent: la commande est déjà enregistrée par la première soumission
+            if not duplicate:
+                order_history.record(OrderRecord.from_request(
+                    update.effective_user.id,
+                    order_path,
+                    order_payload,
+                    delivery_address=extracted.delivery_address,
+                    latency_ms=(time.perf_counter() - started) * 1000
+                ))
             
             success_msg = (
                 f"✅ **Commande créée avec succès !**\n\n"
@@ -371,7 +658,12 @@ async def handle_confirm_callback(update: Update, context: ContextTypes.DEFAULT_
                 f"Thank you for your trust! 😊"
             )
             
-            await query.edit_message_text(success_msg, parse_mode="Markdown")
+            await edit_confirmation(
+                query,
+                success_msg,
+                reply_markup=reorder_keyboard(update.effective_user.id, language),
+                parse_mode="Markdown"
+            )
             
         else:
             raise Exception("No order data in response")
@@ -389,4 +681,74 @@ async def handle_confirm_callback(update: Update, context: ContextTypes.DEFAULT_
             f"Technical error: {str(e)[:100]}"
         )
         
-        await query.edit_message_text(error_msg, parse_mode="Markdown")
\ No newline at end of file
+        # Boutons remis pour pouvoir réessayer
+        await edit_confirmation(
+            query,
+            error_msg,
+            reply_markup=confirm_keyboard(update.effective_user.id, language),
+            parse_mode="Markdown"
+        )
+
+async def reply_degraded(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    user_message: str,
+    language: str
+):
+    """Réponse sans LLM en mode dégradé (surcharge)"""
+    intent = classify_message_intent(user_message, ExtractedOrder(items=[], confidence=0))
+    admission.shed(intent)
+    logger.info("message_shed", intent=intent)
+    
+    if intent == "menu_request":
+        await send_menu(update, context, language)
+        return
+    
+    reply = (
+        "⏳ Nous recevons beaucoup de messages en ce moment. Réessayez dans un instant, "
+        "ou tapez /menu pour voir la carte 😊"
+    ) if language == "fr" else (
+        "⏳ We're very busy right now. Please try again in a moment, "
+        "or type /menu to see what we have 😊"
+    )
+    await sender.reply_text(update.message, reply)
+
+
+async def ensure_menu_pages():
+    """Charger le menu si aucune page n'est encore rendue (premier appel du worker)"""
+    if not menu_pages.ready:
+        with span("menu.get"):
+            await menu_cache.get_snapshot()
+
+
+async def send_menu(update: Update, context: ContextTypes.DEFAULT_TYPE, language: str):
+    """Première page du menu (pré-rendue à chaque version du menu)"""
+    await ensure_menu_pages()
+    page = menu_pages.get(0, language)
+    await sender.reply_text(update.message, page.text, reply_markup=page.markup)
+
+
+@traced("telegram.menu_command")
+async def menu_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/menu"""
+    language = context.user_data.get("language", "fr")
+    await send_menu(update, context, language)
+
+
+@traced("telegram.handle_menu_page_callback")
+async def handle_menu_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Navigation entre les pages du menu (boutons ◀️ ▶️ et catégories)"""
+    query = update.callback_query
+    await query.answer()
+    
+    version, index = parse_page_callback(query.data)
+    language = context.user_data.get("language", "fr")
+    
+    await ensure_menu_pages()
+    page = menu_pages.get(index, language)
+    
+    # Même page (bouton "n/N"): Telegram refuse une édition identique
+    if query.message and query.message.text == page.text and version == menu_pages.version:
+        return
+    
+    await sender.edit_message_text(query, page.text, reply_markup=page.markup)
@@ -0,0 +1,128 @@
+"""Long-polling runner (USE_WEBHOOK=false)
+
+Fetches updates with getUpdates (long-poll timeout, batches of up to
+TELEGRAM_POLL_LIMIT) and hands each one to the same processing function
+as the webhook. Updates are processed concurrently, up to
+TELEGRAM_POLL_MAX_IN_FLIGHT at once; when that many are running, fetching
+waits (backpressure). With several workers, only the holder of the
+"telegram_polling" lease polls: Telegram rejects concurrent getUpdates
+calls, and another worker takes over if the holder dies.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Optional, Set
+from telegram import Bot, Update
+from telegram.error import RetryAfter, TelegramError
+from app.utils.shared_state import shared_state
+import structlog
+
+logger = structlog.get_logger()
+
+POLLING_LEASE = "telegram_polling"
+INITIAL_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class PollingRunner:
+    """getUpdates loop feeding a process(update) coroutine"""
+
+    def __init__(
+        self,
+        bot: Bot,
+        process: Callable[[Update], Awaitable[None]],
+        limit: int = 100,
+        timeout: int = 30,
+        max_in_flight: int = 100
+    ):
+        self.bot = bot
+        self.process = process
+        self.limit = limit
+        self.timeout = timeout
+        self.lease_ttl = timeout + 30.0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._in_flight: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop fetching and wait for the updates being processed"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if shared_state is not None:
+            await shared_state.release(POLLING_LEASE)
+
+    async def _run(self):
+        while True:
+            if shared_state is None:
+                await self._start_polling()
+                await self._poll()
+                continue
+
+            # Un seul worker de l'hôte appelle getUpdates
+            while not await shared_state.try_acquire(POLLING_LEASE, self.lease_ttl):
+                await asyncio.sleep(5)
+            logger.info("telegram_polling_lease_acquired")
+            await self._start_polling()
+
+            poll = asyncio.create_task(self._poll())
+            keep_alive = asyncio.create_task(shared_state.keep_alive(POLLING_LEASE, self.lease_ttl))
+            try:
+                # keep_alive ne se termine que si le bail est perdu
+                await asyncio.wait({poll, keep_alive}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                poll.cancel()
+                keep_alive.cancel()
+            logger.warning("telegram_polling_lease_lost")
+
+    async def _start_polling(self):
+        # getUpdates est refusé tant qu'un webhook est configuré
+        try:
+            await self.bot.delete_webhook()
+        except TelegramError as e:
+            logger.warning("telegram_delete_webhook_error", error=str(e))
+        logger.info("telegram_polling_started", limit=self.limit, timeout=self.timeout)
+
+    async def _poll(self):
+        """Fetch and dispatch updates until cancelled"""
+        offset = None
+        backoff = INITIAL_BACKOFF_SECONDS
+
+        while True:
+            try:
+                updates = await self.bot.get_updates(
+                    offset=offset,
+                    limit=self.limit,
+                    timeout=self.timeout
+                )
+                backoff = INITIAL_BACKOFF_SECONDS
+            except RetryAfter as e:
+                await asyncio.sleep(float(e.retry_after))
+                continue
+            except TelegramError as e:
+                # Réseau, timeout, Conflict (autre instance en polling)...
+                logger.warning("telegram_polling_error", error=str(e), retry_in=backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+                continue
+
+            for update in updates:
+                offset = update.update_id + 1
+                await self._semaphore.acquire()
+                task = asyncio.create_task(self._process_one(update))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+
+    async def _process_one(self, update: Update):
+        try:
+            await self.process(update)
+        except Exception as e:
+            logger.error("polling_update_error", update_id=update.update_id, error=str(e))
+        finally:
+            self._semaphore.release()
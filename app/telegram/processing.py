@@ -0,0 +1,94 @@
+"""Concurrent update processing with per-user serialization
+
+Updates of different users run concurrently (up to
+TELEGRAM_CONCURRENT_UPDATES at once); updates of the same user run one
+after the other, in arrival order, so context.user_data (pending_order,
+conversation history, ...) is never mutated by two handlers at once.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Dict, Optional
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+from app.utils.metrics import metrics
+import structlog
+
+logger = structlog.get_logger()
+
+# Borne donnée à BaseUpdateProcessor: son sémaphore est pris avant do_process_update,
+# donc avant le verrou du user; la vraie borne est appliquée après ce verrou
+UNBOUNDED_UPDATES = 1_000_000
+
+
+def update_user_key(update: object) -> Optional[int]:
+    """User (or chat) an update belongs to; None for updates without one"""
+    if not isinstance(update, Update):
+        return None
+    if update.effective_user is not None:
+        return update.effective_user.id
+    if update.effective_chat is not None:
+        return update.effective_chat.id
+    return None
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Bounded concurrency across users, one update at a time per user
+
+    A concurrency slot is only taken once the user's lock is held: updates
+    queued behind their own user's previous update never hold a slot, so a
+    chatty user cannot delay everyone else.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(UNBOUNDED_UPDATES)
+        self.limit = max_concurrent_updates
+        self._slots = asyncio.BoundedSemaphore(max_concurrent_updates)
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._waiters: Dict[int, int] = {}
+        self._active = 0
+
+    @property
+    def active(self) -> int:
+        """Updates currently being processed"""
+        return self._active
+
+    def is_busy(self, key: int) -> bool:
+        """True while an update of this user is processed or waiting"""
+        return key in self._locks
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = update_user_key(update)
+        if key is None:
+            await self._run(coroutine)
+            return
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            if lock.locked():
+                metrics.inc("updates.serialized")
+            async with lock:
+                await self._run(coroutine)
+        finally:
+            # Oublier le verrou quand plus personne ne l'attend
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                del self._locks[key]
+
+    async def _run(self, coroutine: Awaitable[Any]):
+        async with self._slots:
+            self._active += 1
+            try:
+                await coroutine
+            finally:
+                self._active -= 1
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
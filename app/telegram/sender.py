@@ -0,0 +1,260 @@
+"""Outbound Telegram message scheduler
+
+Telegram limits bots to about 30 messages/s globally and about 1
+message/s per chat (short bursts tolerated). Replies and edits go through
+a priority queue drained by a few workers, each send waiting on a global
+and a per-chat token bucket. RetryAfter errors pause sending for the
+requested time and the message is retried instead of failing.
+Confirmation messages jump ahead of chat replies.
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from telegram.error import RetryAfter
+from app.config import get_settings
+from app.utils.metrics import metrics
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+PRIORITY_CONFIRMATION = 0  # Récapitulatif, résultat de commande
+PRIORITY_NORMAL = 1  # Réponses conversationnelles
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/s, up to `capacity` stored"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+
+class _Job:
+    __slots__ = ("chat_id", "send", "future", "attempts", "sending", "enqueued_at")
+
+    def __init__(self, chat_id: int, send: Callable[[], Awaitable[Any]], future: asyncio.Future):
+        self.chat_id = chat_id
+        self.send = send
+        self.future = future
+        self.attempts = 0
+        self.sending = False
+        self.enqueued_at = time.monotonic()
+
+
+class OutboundSender:
+    """Rate-limited, prioritised sender for bot messages"""
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        chat_burst: int,
+        workers: int,
+        max_retries: int
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.chat_buckets: Dict[int, TokenBucket] = {}
+        self.workers = workers
+        self.max_retries = max_retries
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._delayed: Dict[asyncio.TimerHandle, tuple] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info("telegram_sender_started", workers=self.workers)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._queue is None:
+            return
+        
+        # Envoyer directement ce qui reste en file (best effort)
+        for handle, item in list(self._delayed.items()):
+            handle.cancel()
+            self._queue.put_nowait(item)
+        self._delayed.clear()
+        while not self._queue.empty():
+            _, _, job = self._queue.get_nowait()
+            try:
+                result = await job.send()
+                if not job.future.done():
+                    job.future.set_result(result)
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+
+    def queue_depth(self) -> int:
+        return (self._queue.qsize() if self._queue else 0) + len(self._delayed)
+
+    async def send(
+        self,
+        chat_id: int,
+        send: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_NORMAL
+    ) -> Any:
+        """
+        Queue a Telegram call and wait for its result
+
+        Args:
+            chat_id: Target chat (per-chat rate limit key)
+            send: Zero-argument callable returning the Telegram coroutine
+            priority: PRIORITY_CONFIRMATION or PRIORITY_NORMAL
+
+        Returns:
+            Result of the Telegram call (errors are raised to the caller)
+        """
+        if not self.running:
+            return await send()
+
+        job = _Job(chat_id, send, asyncio.get_running_loop().create_future())
+        self._queue.put_nowait((priority, next(self._seq), job))
+        metrics.inc("telegram_sender.queued")
+        return await job.future
+
+    async def reply_text(self, message, text: str, priority: int = PRIORITY_NORMAL, **kwargs):
+        return await self.send(message.chat_id, lambda: message.reply_text(text, **kwargs), priority)
+
+    async def edit_message_text(self, query, text: str, priority: int = PRIORITY_NORMAL, **kwargs):
+        return await self.send(
+            query.message.chat_id,
+            lambda: query.edit_message_text(text, **kwargs),
+            priority
+        )
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self.chat_buckets) > 10000:
+                # Oublier les chats dont le bucket est plein (inactifs)
+                self.chat_buckets = {
+                    k: b for k, b in self.chat_buckets.items() if not b.is_full()
+                }
+            bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _requeue_later(self, delay: float, item: tuple):
+        """Put a job back after `delay` without blocking a worker"""
+        def put_back():
+            del self._delayed[handle]
+            self._queue.put_nowait(item)
+
+        handle = asyncio.get_running_loop().call_later(delay, put_back)
+        self._delayed[handle] = item
+
+    async def _worker(self):
+        while True:
+            priority, seq, job = await self._queue.get()
+            try:
+                await self._wait_and_execute(priority, seq, job)
+            except asyncio.CancelledError:
+                # Arrêt: remettre le job en file (vidée par stop()) s'il n'a pas été envoyé
+                if not job.sending:
+                    self._queue.put_nowait((priority, seq, job))
+                elif not job.future.done():
+                    job.future.cancel()
+                raise
+
+    async def _wait_and_execute(self, priority: int, seq: int, job: _Job):
+        # Limite par chat: ne pas bloquer les autres chats
+        chat_delay = self._chat_bucket(job.chat_id).delay()
+        if chat_delay > 0:
+            self._requeue_later(chat_delay, (priority, seq, job))
+            return
+
+        # Flood control global (RetryAfter) puis limite globale
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        global_delay = self.global_bucket.delay()
+        while global_delay > 0:
+            await asyncio.sleep(global_delay)
+            global_delay = self.global_bucket.delay()
+
+        self.global_bucket.take()
+        self._chat_bucket(job.chat_id).take()
+        await self._execute(priority, seq, job)
+
+    async def _execute(self, priority: int, seq: int, job: _Job):
+        job.attempts += 1
+        job.sending = True
+        try:
+            result = await job.send()
+        except RetryAfter as e:
+            job.sending = False
+            retry_after = float(e.retry_after)
+            metrics.inc("telegram_sender.retry_after")
+            logger.warning(
+                "telegram_retry_after",
+                chat_id=job.chat_id,
+                retry_after=retry_after,
+                attempt=job.attempts
+            )
+            if job.attempts > self.max_retries:
+                metrics.inc("telegram_sender.failed")
+                if not job.future.done():
+                    job.future.set_exception(e)
+                return
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self._requeue_later(retry_after, (priority, seq, job))
+            return
+        except Exception as e:
+            metrics.inc("telegram_sender.failed")
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+
+        metrics.inc("telegram_sender.sent")
+        metrics.inc("telegram_sender.queue_wait_ms", (time.monotonic() - job.enqueued_at) * 1000)
+        if not job.future.done():
+            job.future.set_result(result)
+
+
+# Singleton instance
+sender = OutboundSender(
+    global_rate=settings.telegram_global_rate,
+    chat_rate=settings.telegram_chat_rate,
+    chat_burst=settings.telegram_chat_burst,
+    workers=settings.telegram_sender_workers,
+    max_retries=settings.telegram_max_retries
+)
+metrics.gauge("telegram_sender.queue_depth", sender.queue_depth)
@@ -0,0 +1,184 @@
+"""Per-user session state: shared across worker processes, evicted when idle
+
+python-telegram-bot keeps context.user_data of every user forever. The
+SessionEvictor drops sessions idle for SESSION_TTL seconds, and the least
+recently used ones above SESSION_MAX_COUNT, so a long-running process
+keeps a flat memory profile. Evicted sessions are either already in the
+shared store (multi-worker mode) or, with SESSION_SPILL, saved to a local
+store and restored on the user's next update, also after a restart.
+Spilled sessions not restored within SESSION_TTL are purged.
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from telegram import Update
+from telegram.ext import ContextTypes
+from app.utils.metrics import metrics
+from app.utils.profiling import deep_sizeof
+from app.utils.shared_state import shared_state, SharedLockTimeout, SharedStateStore
+import structlog
+
+logger = structlog.get_logger()
+
+# Jamais évincée même au-delà de SESSION_MAX_COUNT (update en cours ou juste fini)
+MIN_IDLE_SECONDS = 60.0
+
+
+def with_shared_session(handler):
+    """
+    Load context.user_data from the shared store before the handler and
+    save it back afterwards
+    
+    With several workers, consecutive updates of one user can reach
+    different processes; the user's session lives in the shared store and
+    a per-user lease serialises their updates across processes.
+    No-op in single-process mode.
+    """
+    if shared_state is None:
+        return handler
+    
+    @functools.wraps(handler)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if update.effective_user is None:
+            return await handler(update, context)
+        
+        user_id = update.effective_user.id
+        try:
+            async with shared_state.lock(f"user:{user_id}"):
+                # Le store fait foi: pas de reste d'une session locale périmée
+                data = await shared_state.load_session(user_id)
+                context.user_data.clear()
+                if data is not None:
+                    context.user_data.update(data)
+                try:
+                    return await handler(update, context)
+                finally:
+                    await shared_state.save_session(user_id, dict(context.user_data))
+        except SharedLockTimeout:
+            # Ne jamais traiter sans verrou: la session serait écrasée
+            logger.error("shared_session_busy_update_dropped", user_id=user_id, update_id=update.update_id)
+    
+    return wrapper
+
+
+class SessionEvictor:
+    """TTL + LRU eviction of idle context.user_data entries"""
+    
+    def __init__(
+        self,
+        get_sessions: Callable[[], Mapping[int, Dict[str, Any]]],
+        drop: Callable[[int], None],
+        ttl: float = 3600.0,
+        max_sessions: int = 10000,
+        interval: float = 60.0,
+        spill: Optional[SharedStateStore] = None,
+        is_busy: Callable[[int], bool] = lambda user_id: False
+    ):
+        self.get_sessions = get_sessions
+        self.drop = drop
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.interval = interval
+        self.spill = spill
+        self.is_busy = is_busy
+        self._last_seen: "OrderedDict[int, float]" = OrderedDict()  # Moins récent en tête
+        self.sizes: Dict[int, int] = {}  # Taille (octets) par session au dernier passage
+        self.total_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    def touch(self, user_id: int, now: Optional[float] = None):
+        self._last_seen[user_id] = time.monotonic() if now is None else now
+        self._last_seen.move_to_end(user_id)
+    
+    async def on_update(self, update: object, context: ContextTypes.DEFAULT_TYPE):
+        """TypeHandler (group -1): mark the session used, restore it if it was spilled"""
+        if not isinstance(update, Update) or update.effective_user is None:
+            return
+        user_id = update.effective_user.id
+        # Session absente de la mémoire (évincée, ou processus redémarré): chercher dans le store
+        unknown = user_id not in self._last_seen
+        self.touch(user_id)
+        if self.spill is not None and unknown and not context.user_data:
+            data = await self.spill.load_session(user_id)
+            if data is not None:
+                context.user_data.update(data)
+                await self.spill.delete_session(user_id)
+                metrics.inc("sessions.restored")
+    
+    def _victims(self, now: float) -> List[int]:
+        """Sessions to evict: idle past the ttl, then least recently used above the cap"""
+        victims = []
+        remaining = len(self._last_seen)
+        for user_id, seen in self._last_seen.items():
+            idle = now - seen
+            if idle < self.ttl and (remaining <= self.max_sessions or idle < MIN_IDLE_SECONDS):
+                # Ordre LRU: les suivantes sont plus récentes
+                break
+            if self.is_busy(user_id):
+                continue
+            victims.append(user_id)
+            remaining -= 1
+        return victims
+    
+    async def sweep(self, now: Optional[float] = None) -> int:
+        """Evict idle sessions and recompute sizes; returns the number evicted"""
+        now = time.monotonic() if now is None else now
+        sessions = self.get_sessions()
+        
+        # Sessions créées sans passer par on_update, ou supprimées ailleurs
+        for user_id in sessions:
+            if user_id not in self._last_seen:
+                self.touch(user_id, now)
+        for user_id in [u for u in self._last_seen if u not in sessions]:
+            del self._last_seen[user_id]
+        
+        victims = self._victims(now)
+        for user_id in victims:
+            data = dict(sessions.get(user_id) or {})
+            if self.spill is not None and data:
+                await self.spill.save_session(user_id, data)
+                metrics.inc("sessions.spilled")
+            self.drop(user_id)
+            del self._last_seen[user_id]
+        
+        # Sessions déversées jamais reprises: le store ne grandit pas sans fin
+        if self.spill is not None:
+            purged = await self.spill.purge_sessions(time.time() - self.ttl)
+            if purged:
+                metrics.inc("sessions.purged", purged)
+        
+        self.sizes = {user_id: deep_sizeof(data) for user_id, data in sessions.items()}
+        self.total_bytes = sum(self.sizes.values())
+        
+        if victims:
+            metrics.inc("sessions.evicted", len(victims))
+            logger.info(
+                "sessions_evicted",
+                evicted=len(victims),
+                spilled=self.spill is not None,
+                sessions=len(self.sizes),
+                total_kib=round(self.total_bytes / 1024, 1),
+                largest_kib=round(max(self.sizes.values(), default=0) / 1024, 1)
+            )
+        return len(victims)
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+    
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error("sessions_sweep_error", error=str(e))
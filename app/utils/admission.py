@@ -0,0 +1,129 @@
+"""Admission control: degrade gracefully under load
+
+Two signals are watched:
+
+- event-loop lag: a background task sleeps LOOP_LAG_INTERVAL and measures
+  how late it wakes up (a blocked or saturated loop delays every update)
+- LLM calls in flight (provider pool)
+
+Above ADMISSION_MAX_LOOP_LAG_MS or ADMISSION_MAX_LLM_IN_FLIGHT the bot
+switches to degraded mode: no new LLM calls, local parsing only, pre-
+rendered menu pages, and a "we're busy" reply for the rest. It recovers
+once both signals have stayed under their thresholds for
+ADMISSION_RECOVERY_SECONDS. Callback queries (order confirmation, menu
+pages) never call an LLM and always go through.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+from app.config import get_settings
+from app.llm.providers import provider_pool
+from app.utils.metrics import metrics
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+# Échantillons récents pris en compte pour le retard courant
+RECENT_SAMPLES = 3
+
+
+class LoopLagMonitor:
+    """Event-loop lag sampled every interval seconds"""
+
+    def __init__(self, interval: float = 0.5, history_size: int = 240):
+        self.interval = interval
+        self.history: Deque[Tuple[float, float]] = deque(maxlen=history_size)  # (unix time, lag ms)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def lag_ms(self) -> float:
+        """Worst lag of the last few samples"""
+        recent = list(self.history)[-RECENT_SAMPLES:]
+        return max((lag for _, lag in recent), default=0.0)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def record(self, lag_ms: float):
+        self.history.append((time.time(), max(lag_ms, 0.0)))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record((loop.time() - started - self.interval) * 1000)
+
+
+class AdmissionController:
+    """Normal / degraded mode from loop lag and LLM calls in flight"""
+
+    def __init__(
+        self,
+        monitor: LoopLagMonitor,
+        llm_in_flight: Callable[[], int],
+        max_loop_lag_ms: float = 500.0,
+        max_llm_in_flight: int = 24,
+        recovery_seconds: float = 10.0
+    ):
+        self.monitor = monitor
+        self.llm_in_flight = llm_in_flight
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.max_llm_in_flight = max_llm_in_flight
+        self.recovery_seconds = recovery_seconds
+        self._degraded = False
+        self._since = 0.0
+        self._last_overload = 0.0
+
+    @property
+    def degraded(self) -> bool:
+        """Current mode, re-evaluated on every read (cheap)"""
+        now = time.monotonic()
+        lag_ms = self.monitor.lag_ms
+        in_flight = self.llm_in_flight()
+        overloaded = lag_ms > self.max_loop_lag_ms or in_flight >= self.max_llm_in_flight
+
+        if overloaded:
+            self._last_overload = now
+            if not self._degraded:
+                self._degraded = True
+                self._since = now
+                metrics.inc("admission.degraded_entered")
+                logger.warning("admission_degraded", loop_lag_ms=round(lag_ms, 1), llm_in_flight=in_flight)
+        elif self._degraded and now - self._last_overload >= self.recovery_seconds:
+            self._degraded = False
+            metrics.inc("admission.recovered")
+            logger.info(
+                "admission_recovered",
+                degraded_seconds=round(now - self._since, 1),
+                loop_lag_ms=round(lag_ms, 1),
+                llm_in_flight=in_flight
+            )
+        return self._degraded
+
+    def shed(self, kind: str):
+        """Count a request served in degraded mode"""
+        metrics.inc(f"admission.shed.{kind}")
+
+
+# Singleton instances
+loop_monitor = LoopLagMonitor(settings.loop_lag_interval)
+admission = AdmissionController(
+    loop_monitor,
+    lambda: provider_pool.in_flight,
+    max_loop_lag_ms=settings.admission_max_loop_lag_ms,
+    max_llm_in_flight=settings.admission_max_llm_in_flight,
+    recovery_seconds=settings.admission_recovery_seconds
+)
+metrics.gauge("event_loop.lag_ms", lambda: round(loop_monitor.lag_ms, 1))
+metrics.gauge("admission.degraded", lambda: admission.degraded)
@@ -1,26 +1,150 @@
 import structlog
 import logging
+import atexit
+import queue
+import random
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from app.config import get_settings
+
+# Émission asynchrone: les handlers ne font qu'un put_nowait, le rendu JSON
+# et l'écriture sur stdout se font dans le thread du QueueListener
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["_AsyncQueueHandler"] = None
+_sample_rates: Dict[str, float] = {}
+_max_field_length: int = 500
+
+
+class _AsyncQueueHandler(QueueHandler):
+    """QueueHandler that leaves rendering to the listener thread"""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # In-process queue: no need to pre-format/pickle the record
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never block the request path on logging
+            self.dropped += 1
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """
+    Parse LOG_SAMPLE_RATES ("message_received=0.1,webhook_processed=0.05")
+
+    Returns:
+        {event: rate} with rate clamped to [0, 1]
+    """
+    rates = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        event, rate = part.split("=", 1)
+        try:
+            rates[event.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+def sample_events(logger, method_name: str, event_dict: dict) -> dict:
+    """Drop a share of high-volume info/debug events (errors are always kept)"""
+    if method_name in ("debug", "info"):
+        rate = _sample_rates.get(event_dict.get("event"))
+        if rate is not None and random.random() >= rate:
+            raise structlog.DropEvent
+    return event_dict
+
+
+# Champs structurels jamais tronqués
+_UNCAPPED_FIELDS = {"event", "timestamp", "level", "logger", "trace_id", "exception", "stack"}
+
+
+def cap_field_sizes(logger, method_name: str, event_dict: dict) -> dict:
+    """Truncate long string fields (LLM responses, API error bodies, ...)"""
+    for key, value in event_dict.items():
+        if isinstance(value, str) and len(value) > _max_field_length and key not in _UNCAPPED_FIELDS:
+            event_dict[key] = f"{value[:_max_field_length]}...(+{len(value) - _max_field_length})"
+    return event_dict
+
+
+def set_log_level(level: str) -> str:
+    """
+    Change the log level at runtime
+
+    Returns:
+        The level now in effect (e.g. "DEBUG")
+    """
+    numeric = logging.getLevelName(level.upper())
+    if not isinstance(numeric, int):
+        raise ValueError(f"Unknown log level: {level}")
+    logging.getLogger().setLevel(numeric)
+    return logging.getLevelName(numeric)
+
+
+def get_logging_stats() -> dict:
+    """Queue depth and dropped records of the async log handler"""
+    if _queue_handler is None:
+        return {}
+    return {
+        "level": logging.getLevelName(logging.getLogger().getEffectiveLevel()),
+        "queue_depth": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "sample_rates": _sample_rates,
+    }
+
 
 def setup_logging():
-    """Configure structured logging"""
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=logging.INFO,
-    )
-    
+    """Configure structured logging (idempotent)"""
+    global _listener, _queue_handler, _sample_rates, _max_field_length
+
+    if _listener is not None:
+        return
+
+    settings = get_settings()
+    _sample_rates = parse_sample_rates(settings.log_sample_rates)
+    _max_field_length = settings.log_max_field_length
+
+    # Rendu JSON dans le thread du listener, aussi pour les logs stdlib (uvicorn, httpx)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processor=structlog.processors.JSONRenderer(),
+        foreign_pre_chain=[
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
+    ))
+
+    _queue_handler = _AsyncQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    _listener = QueueListener(_queue_handler.queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+    atexit.register(_listener.stop)  # Flush remaining records on exit
+
+    root = logging.getLogger()
+    root.handlers = [_queue_handler]
+    set_log_level(settings.log_level)
+
     structlog.configure(
         processors=[
+            structlog.stdlib.filter_by_level,
+            sample_events,
+            structlog.contextvars.merge_contextvars,  # trace_id of the current update
             structlog.stdlib.add_log_level,
             structlog.stdlib.add_logger_name,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer()
+            cap_field_sizes,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         wrapper_class=structlog.stdlib.BoundLogger,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
-    )
\ No newline at end of file
+    )
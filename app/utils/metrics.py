@@ -0,0 +1,37 @@
+"""Minimal in-process metrics registry (counters + gauges)
+
+Counters are plain increments; gauges are callables evaluated when the
+metrics are read, so they cost nothing on the request path. Exposed as
+JSON by GET /admin/metrics.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict
+
+
+class MetricsRegistry:
+    """Process-wide counters and gauges"""
+    
+    def __init__(self):
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+    
+    def inc(self, name: str, value: float = 1):
+        self._counters[name] += value
+    
+    def gauge(self, name: str, read: Callable[[], Any]):
+        """Register a gauge read lazily at snapshot time"""
+        self._gauges[name] = read
+    
+    def snapshot(self) -> Dict[str, Any]:
+        gauges = {}
+        for name, read in self._gauges.items():
+            try:
+                gauges[name] = read()
+            except Exception as e:
+                gauges[name] = f"error: {e}"
+        return {"counters": dict(self._counters), "gauges": gauges}
+
+
+# Singleton instance
+metrics = MetricsRegistry()
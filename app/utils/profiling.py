@@ -0,0 +1,237 @@
+"""On-demand profiling for production (stdlib only)
+
+Nothing runs until an admin endpoint asks for it, and everything stops
+when the requested window ends:
+
+- SamplingProfiler: a thread samples the event-loop thread's stack every
+  few milliseconds (sys._current_frames) and returns collapsed stacks
+  ("frame;frame;frame count"), the input format of flamegraph.pl,
+  speedscope and inferno.
+- track_slow_callbacks: times every event-loop callback for a window and
+  keeps the slowest ones (the loop is only instrumented during the window).
+- memory_report: tracemalloc top allocations (tracing started for the
+  window if it is not already on) and deep sizes of registered objects
+  (user_data, menu cache, ...).
+"""
+
+import asyncio
+import gc
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+MAX_STACK_DEPTH = 64
+MAX_SIZEOF_OBJECTS = 200_000
+
+# Jamais parcourus par deep_sizeof (partagés par tout le processus)
+_SIZEOF_SKIP = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+# Objets dont memory_report mesure la taille (enregistrés par main)
+_memory_sources: Dict[str, Callable[[], Any]] = {}
+
+
+def register_memory_source(name: str, get: Callable[[], Any]):
+    """Report the deep size of get() in memory_report"""
+    _memory_sources[name] = get
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    # Chemin court: à partir du package (app/..., telegram/..., asyncio/...)
+    for marker in ("site-packages" + os.sep, os.sep + "lib" + os.sep + "python"):
+        if marker in filename:
+            filename = filename.split(marker, 1)[1].split(os.sep, 1)[-1]
+            break
+    else:
+        filename = os.path.relpath(filename) if os.path.isabs(filename) else filename
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame) -> str:
+    """Root-first "a;b;c" stack of a frame"""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Wall-clock stack sampler of one thread (or all threads)"""
+
+    def __init__(self, thread_id: int, interval: float = 0.01, all_threads: bool = False):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.all_threads = all_threads
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+
+    def run(self, seconds: float):
+        """Sample for `seconds` (blocking: call from a thread)"""
+        me = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me or (not self.all_threads and thread_id != self.thread_id):
+                    continue
+                stack = collapse_stack(frame)
+                if self.all_threads:
+                    stack = f"thread {names.get(thread_id, thread_id)};{stack}"
+                self.samples[stack] += 1
+            self.sample_count += 1
+            time.sleep(self.interval)
+
+    def collapsed(self) -> str:
+        """Folded stacks, most sampled first"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+
+def _describe_callback(handle: asyncio.Handle) -> str:
+    callback = handle._callback
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        return f"Task {owner.get_name()} {getattr(coro, '__qualname__', coro)}"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+async def track_slow_callbacks(seconds: float, threshold_ms: float = 5.0, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Slowest event-loop callbacks over the next `seconds`
+
+    asyncio.Handle._run is wrapped for the window only, then restored.
+    Only callbacks above threshold_ms are described (cheap otherwise).
+    """
+    slowest: Dict[str, Dict[str, Any]] = {}
+    original = asyncio.Handle._run
+
+    def timed_run(handle):
+        started = time.perf_counter()
+        try:
+            return original(handle)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms >= threshold_ms:
+                name = _describe_callback(handle)
+                entry = slowest.setdefault(name, {"callback": name, "count": 0, "max_ms": 0.0, "total_ms": 0.0})
+                entry["count"] += 1
+                entry["total_ms"] += elapsed_ms
+                entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    asyncio.Handle._run = timed_run
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        asyncio.Handle._run = original
+
+    ranked = sorted(slowest.values(), key=lambda e: e["max_ms"], reverse=True)[:limit]
+    for entry in ranked:
+        entry["max_ms"] = round(entry["max_ms"], 1)
+        entry["total_ms"] = round(entry["total_ms"], 1)
+    return ranked
+
+
+def deep_sizeof(obj: Any, max_objects: int = MAX_SIZEOF_OBJECTS) -> int:
+    """Approximate deep size in bytes (containers, __dict__, __slots__; shared objects counted once)"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < max_objects:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, _SIZEOF_SKIP):
+            continue
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+        if isinstance(current, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "items") and callable(current.items):
+            # Mappings non-dict (ex: user_data de python-telegram-bot)
+            try:
+                for key, value in current.items():
+                    stack.extend((key, value))
+            except Exception:
+                pass
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for slot in getattr(type(current), "__slots__", ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+async def memory_report(seconds: float = 0.0, top: int = 25) -> Dict[str, Any]:
+    """
+    Process memory, tracemalloc top allocations and registered object sizes
+
+    If tracemalloc is not already tracing, it is started for `seconds`
+    (allocations made and still alive during the window) and stopped.
+    """
+    started_here = not tracemalloc.is_tracing()
+    allocations: List[Dict[str, Any]] = []
+    if started_here and seconds > 0:
+        tracemalloc.start()
+    try:
+        if tracemalloc.is_tracing():
+            if started_here:
+                await asyncio.sleep(seconds)
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+            for stat in snapshot.statistics("lineno")[:top]:
+                frame = stat.traceback[0]
+                allocations.append({
+                    "location": f"{frame.filename}:{frame.lineno}",
+                    "size_kib": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                })
+    finally:
+        if started_here and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    sizes = {}
+    for name, get in _memory_sources.items():
+        try:
+            value = get()
+            # Sur la boucle: pas de modification concurrente (borné par MAX_SIZEOF_OBJECTS)
+            entry = {"size_kib": round(deep_sizeof(value) / 1024, 1)}
+            if hasattr(value, "__len__"):
+                entry["entries"] = len(value)
+            sizes[name] = entry
+        except Exception as e:
+            sizes[name] = {"error": str(e)}
+
+    rss = _rss_bytes()
+    return {
+        "rss_mib": round(rss / 2**20, 1) if rss is not None else None,
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "gc_counts": gc.get_count(),
+        "tracemalloc": {"window_seconds": seconds if started_here else None, "top": allocations},
+        "objects": sizes,
+    }
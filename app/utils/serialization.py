@@ -0,0 +1,42 @@
+"""JSON encoding/decoding, with orjson when it is installed
+
+orjson is optional (pip install orjson): it parses and serializes several
+times faster than the stdlib json module and works on bytes directly.
+Without it, the stdlib is used with the same behaviour:
+
+- loads() accepts bytes or str
+- dumps() returns compact UTF-8 bytes; pydantic models are encoded with
+  model_dump(mode="json", exclude_none=True) (None fields fall back to
+  their default when validated again), anything else unknown with str()
+"""
+
+import json
+from typing import Any
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Dépendance optionnelle
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", exclude_none=True)
+    return str(obj)
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
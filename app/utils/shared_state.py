@@ -0,0 +1,202 @@
+"""Host-local shared state for multi-worker deployments
+
+With several uvicorn workers, each process has its own telegram_app,
+menu cache and user_data. This SQLite store (WAL mode) is shared by all
+workers of a host: it holds the per-user session state, the menu cached
+once per host, and short leases used as cross-process locks.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import get_settings
+from app.utils.serialization import dumps, loads
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    user_id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS menu (
+    place_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class SharedLockTimeout(Exception):
+    """A cross-process lock could not be taken in time"""
+
+
+class SharedStateStore:
+    """SQLite store shared by all worker processes of a host"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=5.0,
+                isolation_level=None,  # autocommit
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+    
+    def _execute(self, sql: str, params: tuple = ()) -> Tuple[List[tuple], int]:
+        """Run one statement (blocking) and return (rows, rowcount)"""
+        with self._lock:
+            cursor = self._connect().execute(sql, params)
+            return cursor.fetchall(), cursor.rowcount
+    
+    async def _run(self, sql: str, params: tuple = ()) -> Tuple[List[tuple], int]:
+        return await asyncio.to_thread(self._execute, sql, params)
+    
+    async def initialize(self):
+        """Open the database and create tables"""
+        await asyncio.to_thread(self._connect)
+        logger.info("shared_state_ready", path=self.path, owner=self.owner)
+    
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    # ===== SESSIONS =====
+    
+    async def load_session(self, user_id: int) -> Optional[Dict[str, Any]]:
+        rows, _ = await self._run(
+            "SELECT data FROM sessions WHERE user_id = ?", (user_id,)
+        )
+        return loads(rows[0][0]) if rows else None
+    
+    async def save_session(self, user_id: int, data: Dict[str, Any]):
+        await self._run(
+            "INSERT INTO sessions (user_id, data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+            # Modèles pydantic de la session (ExtractedOrder) encodés en JSON
+            (user_id, dumps(data).decode(), time.time())
+        )
+    
+    async def delete_session(self, user_id: int):
+        await self._run("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+    
+    async def purge_sessions(self, older_than: float) -> int:
+        """Delete sessions not saved since older_than (unix time); returns the count"""
+        _, count = await self._run("DELETE FROM sessions WHERE updated_at < ?", (older_than,))
+        return count
+    
+    # ===== MENU =====
+    
+    async def load_menu(self, place_id: str) -> Optional[Dict[str, Any]]:
+        """Menu snapshot (MenuSnapshot.to_dict() form) cached for the host, if any"""
+        rows, _ = await self._run(
+            "SELECT data FROM menu WHERE place_id = ?", (place_id,)
+        )
+        return loads(rows[0][0]) if rows else None
+    
+    async def save_menu(self, place_id: str, snapshot: Dict[str, Any]):
+        await self._run(
+            "INSERT INTO menu (place_id, data, fetched_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(place_id) DO UPDATE SET data = excluded.data, fetched_at = excluded.fetched_at",
+            (place_id, dumps(snapshot).decode(), snapshot["fetched_at"])
+        )
+    
+    # ===== LEASES (verrous inter-processus) =====
+    
+    async def try_acquire(self, name: str, ttl: float) -> bool:
+        """Take the lease if free or expired; True if this process now holds it"""
+        now = time.time()
+        _, changed = await self._run(
+            "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE leases.expires_at < ?",
+            (name, self.owner, now + ttl, now)
+        )
+        return changed > 0
+    
+    async def renew(self, name: str, ttl: float) -> bool:
+        """Extend a lease held by this process; False if it was lost"""
+        _, changed = await self._run(
+            "UPDATE leases SET expires_at = ? WHERE name = ? AND owner = ?",
+            (time.time() + ttl, name, self.owner)
+        )
+        return changed > 0
+    
+    async def release(self, name: str):
+        await self._run(
+            "DELETE FROM leases WHERE name = ? AND owner = ?", (name, self.owner)
+        )
+    
+    async def keep_alive(self, name: str, ttl: float):
+        """Renew a held lease every ttl/3 until cancelled"""
+        while True:
+            await asyncio.sleep(ttl / 3)
+            if not await self.renew(name, ttl):
+                logger.warning("shared_lock_lost", name=name)
+                return
+    
+    @asynccontextmanager
+    async def lock(self, name: str, ttl: float = 30.0, timeout: float = 120.0):
+        """
+        Cross-process lock built on a lease
+        
+        The lease is renewed while the body runs and expires after ttl if
+        the holder dies.
+        
+        Raises:
+            SharedLockTimeout: lease not obtained within timeout (the body
+                never runs unlocked)
+        """
+        deadline = time.monotonic() + timeout
+        while not await self.try_acquire(name, ttl):
+            if time.monotonic() >= deadline:
+                logger.warning("shared_lock_timeout", name=name)
+                raise SharedLockTimeout(name)
+            await asyncio.sleep(0.05)
+        
+        keep_alive = asyncio.create_task(self.keep_alive(name, ttl))
+        try:
+            yield
+        finally:
+            keep_alive.cancel()
+            await self.release(name)
+
+
+def create_shared_state() -> Optional[SharedStateStore]:
+    """Shared store when running several workers, None in single-process mode"""
+    if settings.workers <= 1:
+        return None
+    return SharedStateStore(settings.shared_state_path)
+
+
+# Singleton instance (None with a single worker)
+shared_state = create_shared_state()
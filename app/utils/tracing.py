@@ -0,0 +1,246 @@
+"""Lightweight per-update tracing
+
+Each update gets a trace ID bound through structlog contextvars, so every
+log line of that update carries it. Stages (handler, LLM calls, menu
+fetch, create_order) are recorded as timed spans. Finished traces are
+kept in a ring buffer (slowest-of-the-last-hour queries) and optionally
+exported to a JSONL file or an OTLP/HTTP JSON collector.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+import httpx
+import structlog
+from app.config import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span_id: ContextVar[Optional[str]] = ContextVar("current_span_id", default=None)
+
+
+class Span:
+    """One timed stage of a trace"""
+
+    __slots__ = ("span_id", "parent_id", "name", "start", "end", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return round(((self.end or time.time()) - self.start) * 1000, 1)
+
+    def to_dict(self, trace_start: float) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "offset_ms": round((self.start - trace_start) * 1000, 1),
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """All spans of one update"""
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.trace_id = uuid.uuid4().hex
+        self.root = Span(name, None, attributes)
+        self.spans: List[Span] = [self.root]
+        self.finished = False
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "started_at": self.root.start,
+            "duration_ms": self.duration_ms,
+            "spans": [span.to_dict(self.root.start) for span in self.spans],
+        }
+
+
+# Traces terminées (pour /admin/traces/slowest)
+recent_traces: Deque[Trace] = deque(maxlen=settings.trace_buffer_size)
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace else None
+
+
+@contextmanager
+def start_trace(name: str, **attributes):
+    """
+    Start a trace for one update and bind its ID into every log line
+
+    Usage:
+        with start_trace("update", update_id=update.update_id):
+            await telegram_app.process_update(update)
+    """
+    trace = Trace(name, attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span_id.set(trace.root.span_id)
+    structlog.contextvars.bind_contextvars(trace_id=trace.trace_id)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.root.error = type(e).__name__
+        raise
+    finally:
+        trace.root.end = time.time()
+        trace.finished = True
+        structlog.contextvars.unbind_contextvars("trace_id")
+        _current_span_id.reset(span_token)
+        _current_trace.reset(trace_token)
+        recent_traces.append(trace)
+        trace_exporter.submit(trace)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a stage of the current trace (no-op outside a trace)"""
+    trace = _current_trace.get()
+    if trace is None or trace.finished:
+        # Hors trace, ou tâche lancée par une update déjà terminée
+        yield None
+        return
+
+    current = Span(name, _current_span_id.get(), attributes)
+    trace.spans.append(current)
+    token = _current_span_id.set(current.span_id)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.end = time.time()
+        _current_span_id.reset(token)
+
+
+def traced(name: str):
+    """Decorator: run an async function inside a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def slowest_traces(minutes: float = 60, limit: int = 10) -> List[Dict[str, Any]]:
+    """Slowest finished traces started in the last `minutes`"""
+    since = time.time() - minutes * 60
+    traces = [t for t in recent_traces if t.root.start >= since]
+    traces.sort(key=lambda t: t.duration_ms, reverse=True)
+    return [t.to_dict() for t in traces[:limit]]
+
+
+# ===== EXPORT =====
+
+def to_otlp(traces: List[Trace]) -> Dict[str, Any]:
+    """Encode traces as an OTLP/HTTP JSON ExportTraceServiceRequest"""
+    def attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [{"key": k, "value": {"stringValue": str(v)}} for k, v in values.items()]
+
+    spans = []
+    for trace in traces:
+        for s in trace.spans:
+            spans.append({
+                "traceId": trace.trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id or "",
+                "name": s.name,
+                "startTimeUnixNano": str(int(s.start * 1e9)),
+                "endTimeUnixNano": str(int((s.end or s.start) * 1e9)),
+                "attributes": attributes(s.attributes),
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+            })
+
+    return {"resourceSpans": [{
+        "resource": {"attributes": attributes({"service.name": "food-ordering-bot"})},
+        "scopeSpans": [{"scope": {"name": "app.utils.tracing"}, "spans": spans}],
+    }]}
+
+
+class TraceExporter:
+    """
+    Batches finished traces and exports them off the request path
+
+    TRACE_EXPORT: "" (ring buffer only), "file" (JSONL at TRACE_EXPORT_PATH)
+    or "otlp" (POST to TRACE_OTLP_ENDPOINT).
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self._pending: List[Trace] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, trace: Trace):
+        if self.mode and len(self._pending) < 10000:
+            self._pending.append(trace)
+
+    def start(self):
+        if self.mode and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.trace_export_interval)
+            await self.flush()
+
+    async def flush(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            if self.mode == "file":
+                await asyncio.to_thread(self._write_file, batch)
+            elif self.mode == "otlp":
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    response = await client.post(settings.trace_otlp_endpoint, json=to_otlp(batch))
+                    response.raise_for_status()
+        except Exception as e:
+            logger.warning("trace_export_error", mode=self.mode, traces=len(batch), error=str(e))
+
+    @staticmethod
+    def _write_file(batch: List[Trace]):
+        directory = os.path.dirname(settings.trace_export_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(settings.trace_export_path, "a", encoding="utf-8") as f:
+            for trace in batch:
+                f.write(json.dumps(trace.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+# Singleton instance
+trace_exporter = TraceExporter(settings.trace_export)
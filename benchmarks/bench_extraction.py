@@ -0,0 +1,287 @@
+"""Benchmark: extraction accuracy, latency and token usage per path
+
+Runs the recorded corpus (benchmarks/data/extraction_corpus.jsonl: French,
+English and mixed messages with their expected ExtractedOrder) through
+every extraction path:
+
+- gemini / groq: the real extract_order_* functions, with the provider
+  SDK replaced by a stub returning the recorded response (offline).
+  Latency = recorded provider latency + measured local overhead (prompt
+  building, JSON parsing, validation). Tokens are estimated from the
+  actual prompt and response sizes (~4 characters per token), so prompt
+  changes show up as token regressions.
+- local: extract_contact_info (contact fields only, no tokens).
+
+Results are compared with benchmarks/data/extraction_baseline.json and
+regressions in accuracy, latency or tokens are flagged (exit code 1).
+
+Run:
+    python -m benchmarks.bench_extraction                  # offline, compare to baseline
+    python -m benchmarks.bench_extraction --update-baseline
+    python -m benchmarks.bench_extraction --live --paths gemini   # real API calls (needs keys)
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+for key in ("TELEGRAM_BOT_TOKEN", "GEMINI_API_KEY", "GROQ_API_KEY",
+            "SPREELOOP_API_URL", "SPREELOOP_API_TOKEN", "FIREBASE_CREDENTIALS_JSON"):
+    os.environ.setdefault(key, "bench")
+
+from app.api.spreeloop import MOCK_MENU_ITEMS, parse_menu_items
+from app.config import get_settings
+from app.llm.gazetteer import normalize_text
+from app.menu.encoding import encode_menu
+from app.models import ExtractedOrder, MenuSnapshot
+from app.utils.logger import set_log_level
+
+DATA_DIR = Path(__file__).parent / "data"
+CORPUS_PATH = DATA_DIR / "extraction_corpus.jsonl"
+BASELINE_PATH = DATA_DIR / "extraction_baseline.json"
+
+PATHS = ("gemini", "groq", "local")
+CONTACT_FIELDS = ("customer_name", "customer_phone", "delivery_address")
+
+# Tolérances avant de signaler une régression
+ACCURACY_TOLERANCE = 0.01
+LATENCY_TOLERANCE = 0.20  # +20% sur le p95
+OVERHEAD_TOLERANCE_MS = 2.0  # Bruit de mesure (ms) sur les temps mesurés localement
+TOKEN_TOLERANCE = 0.10
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def menu_prompt() -> str:
+    """Same encoding as handlers.get_menu_formatted (app.menu.encoding)"""
+    snapshot = MenuSnapshot(
+        place_id="bench", version=1, items=tuple(parse_menu_items(MOCK_MENU_ITEMS)),
+        content_hash="bench"
+    )
+    return encode_menu(snapshot).text
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / 4)
+
+
+# ===== STUBS / CAPTURE DES APPELS =====
+
+class _Calls:
+    """Prompt/response sizes of the provider calls of one extraction"""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def record(self, prompt: str, reply: str, usage: Optional[tuple] = None):
+        prompt_tokens, completion_tokens = usage or (estimate_tokens(prompt), estimate_tokens(reply))
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+
+def gemini_model(calls: _Calls, recorded: Optional[str], live_model=None):
+    """Object with generate_content(): recorded reply, or the live model"""
+    def generate_content(prompt, generation_config=None):
+        if live_model is None:
+            response = SimpleNamespace(text=recorded)
+            calls.record(prompt, recorded)
+            return response
+        response = live_model.generate_content(prompt, generation_config=generation_config)
+        usage = response.usage_metadata
+        calls.record(prompt, response.text, (usage.prompt_token_count, usage.candidates_token_count))
+        return response
+    return SimpleNamespace(generate_content=generate_content)
+
+
+def groq_client(calls: _Calls, recorded: Optional[str], live_client=None):
+    """Object with chat.completions.create(): recorded reply, or the live client"""
+    def create(**kwargs):
+        prompt = "\n".join(m["content"] for m in kwargs["messages"])
+        if live_client is None:
+            message = SimpleNamespace(content=recorded)
+            calls.record(prompt, recorded)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        response = live_client.chat.completions.create(**kwargs)
+        calls.record(
+            prompt,
+            response.choices[0].message.content,
+            (response.usage.prompt_tokens, response.usage.completion_tokens)
+        )
+        return response
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+# ===== SCORING =====
+
+def _norm(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return re.sub(r"[^\w+]+", " ", normalize_text(value)).strip()
+
+
+def _items(items: List[Any]) -> List[tuple]:
+    pairs = []
+    for item in items:
+        if isinstance(item, dict):
+            pairs.append((_norm(item["foodName"]), item["quantity"]))
+        else:
+            pairs.append((_norm(item.foodName), item.quantity))
+    return sorted(pairs)
+
+
+def score(expected: Dict[str, Any], result: ExtractedOrder, fields: tuple) -> Dict[str, bool]:
+    """Per-field correctness ("items" = exact multiset of name + quantity)"""
+    checks = {}
+    if "items" in fields:
+        checks["items"] = _items(result.items) == _items(expected["items"])
+    for field in CONTACT_FIELDS:
+        if field in fields:
+            checks[field] = _norm(getattr(result, field)) == _norm(expected.get(field))
+    return checks
+
+
+# ===== RUNNER =====
+
+async def _extract(path: str, entry: Dict[str, Any], menu: str, calls: _Calls, live: bool) -> ExtractedOrder:
+    if path == "local":
+        from app.llm.local_extractor import extract_contact_info
+        local = extract_contact_info(entry["message"])
+        return local.to_extracted_order(get_settings().local_extraction_min_confidence)
+
+    recorded = entry["responses"][path]["text"]
+    if path == "gemini":
+        from app.llm.gemini import extract_order_gemini, get_model
+        model = gemini_model(calls, recorded, get_model() if live else None)
+        with patch("app.llm.gemini.get_model", return_value=model):
+            return await extract_order_gemini(entry["message"], menu, entry["language"])
+
+    from app.llm.groq import extract_order_groq, get_client
+    client = groq_client(calls, recorded, get_client() if live else None)
+    with patch("app.llm.groq.get_client", return_value=client):
+        return await extract_order_groq(entry["message"], menu, entry["language"])
+
+
+def _p95(values: List[float]) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, math.ceil(0.95 * len(values)) - 1)]
+
+
+async def run_path(path: str, corpus: List[Dict[str, Any]], live: bool = False) -> Dict[str, Any]:
+    """Accuracy, latency and token stats of one extraction path over the corpus"""
+    menu = menu_prompt()
+    fields = CONTACT_FIELDS if path == "local" else ("items",) + CONTACT_FIELDS
+    checks, latencies, overheads, tokens, failures = [], [], [], [], []
+
+    for entry in corpus:
+        calls = _Calls()
+        started = time.perf_counter()
+        result = await _extract(path, entry, menu, calls, live)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        # Hors ligne: latence fournisseur enregistrée + surcoût local mesuré
+        provider_ms = 0.0 if live or path == "local" else entry["responses"][path]["latency_ms"]
+        overheads.append(elapsed_ms)
+        latencies.append(provider_ms + elapsed_ms)
+        tokens.append(calls.prompt_tokens + calls.completion_tokens)
+
+        entry_checks = score(entry["expected"], result, fields)
+        checks.extend(entry_checks.values())
+        wrong = [field for field, ok in entry_checks.items() if not ok]
+        if wrong:
+            failures.append({"id": entry["id"], "fields": wrong})
+
+    return {
+        "accuracy": round(sum(checks) / len(checks), 4),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(_p95(latencies), 1),
+        "overhead_p95_ms": round(_p95(overheads), 2),
+        "tokens_per_message": round(sum(tokens) / len(tokens), 1),
+        "failures": failures,
+    }
+
+
+def find_regressions(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Human-readable regressions of results against the baseline"""
+    regressions = []
+    for path, current in results.items():
+        base = baseline.get(path)
+        if base is None:
+            continue
+        if current["accuracy"] < base["accuracy"] - ACCURACY_TOLERANCE:
+            regressions.append(f"{path}: accuracy {base['accuracy']:.3f} -> {current['accuracy']:.3f}")
+        if current["p95_ms"] > base["p95_ms"] * (1 + LATENCY_TOLERANCE) + OVERHEAD_TOLERANCE_MS:
+            regressions.append(f"{path}: p95 {base['p95_ms']} ms -> {current['p95_ms']} ms")
+        if current["overhead_p95_ms"] > base["overhead_p95_ms"] * (1 + LATENCY_TOLERANCE) + OVERHEAD_TOLERANCE_MS:
+            regressions.append(
+                f"{path}: local overhead p95 {base['overhead_p95_ms']} ms -> {current['overhead_p95_ms']} ms"
+            )
+        if current["tokens_per_message"] > base["tokens_per_message"] * (1 + TOKEN_TOLERANCE):
+            regressions.append(
+                f"{path}: tokens/message {base['tokens_per_message']} -> {current['tokens_per_message']}"
+            )
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    parser.add_argument("--live", action="store_true", help="Call the real providers (no baseline check)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+    set_log_level("WARNING")  # Logs info des extractions: bruit ici
+
+    corpus = load_corpus()
+    results = {path: await run_path(path, corpus, live=args.live) for path in args.paths}
+
+    for path, stats in results.items():
+        print(
+            f"{path:<7} accuracy {stats['accuracy']:.3f}   p50 {stats['p50_ms']:7.1f} ms   "
+            f"p95 {stats['p95_ms']:7.1f} ms   overhead p95 {stats['overhead_p95_ms']:6.2f} ms   "
+            f"tokens/msg {stats['tokens_per_message']:7.1f}"
+        )
+        for failure in stats["failures"]:
+            print(f"          ✗ {failure['id']}: {', '.join(failure['fields'])}")
+
+    if args.live:
+        return 0
+
+    if args.update_baseline:
+        baseline = {
+            path: {k: v for k, v in stats.items() if k != "failures"}
+            for path, stats in results.items()
+        }
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    regressions = find_regressions(results, load_baseline())
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -0,0 +1,93 @@
+"""Benchmark: menu parsing time and resident cache memory per 1,000 items
+
+Compares the former path (BaseItem(**raw) per item + second filter pass,
+full BaseItem objects kept in cache) with parse_menu_items (raw filter,
+list-level validation, compact MenuItem records).
+
+Run:
+    python -m benchmarks.bench_menu_parse [n_items]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+for key in ("TELEGRAM_BOT_TOKEN", "GEMINI_API_KEY", "GROQ_API_KEY",
+            "SPREELOOP_API_URL", "SPREELOOP_API_TOKEN", "FIREBASE_CREDENTIALS_JSON"):
+    os.environ.setdefault(key, "bench")
+
+from app.api.spreeloop import parse_menu_items
+from app.models import BaseItem
+
+
+def make_raw_items(n: int) -> list:
+    """Synthetic payload: ~1 item in 5 is hidden or unavailable"""
+    return [
+        {
+            "path": f"places/p1/menuItems/item_{i:05d}",
+            "shortDescription": f"Plat {i}",
+            "foodName": f"Plat numéro {i}",
+            "longDescription": "Plat traditionnel camerounais, sauce maison et accompagnement au choix",
+            "imagePath": f"images/item_{i}.jpg",
+            "isAvailable": i % 10 != 0,
+            "isVisible": i % 10 != 5,
+            "categoriesPaths": [f"categories/cat_{i % 12}"],
+            "foodType": "MEAL",
+            "numberOfPerson": 1,
+            "priceInXAF": 1500.0 + (i % 20) * 250,
+            "nonDiscountedPriceInXAF": 2000.0,
+            "isVegetarian": i % 3 == 0,
+            "cookingTimeInMinutes": {"min": 10, "max": 25},
+            "packageFee": 100.0,
+            "baseItemType": "BASE_ITEM_TYPE_MENU_ITEM",
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_parse(raw_items: list) -> list:
+    """Former get_menu_items parsing"""
+    items = []
+    for raw in raw_items:
+        try:
+            items.append(BaseItem(**raw))
+        except Exception:
+            pass
+    return [
+        item for item in items
+        if item.isAvailable
+        and item.isVisible
+        and item.baseItemType == "BASE_ITEM_TYPE_MENU_ITEM"
+        and item.priceInXAF is not None
+    ]
+
+
+def bench(name: str, parse, raw_items: list, repeat: int = 20):
+    parse(raw_items)  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        parse(raw_items)
+    elapsed_ms = (time.perf_counter() - started) / repeat * 1000
+    
+    # Memory allocated for the cached result, beyond the raw payload itself
+    tracemalloc.start()
+    cached = parse(raw_items)
+    resident, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    per_1000 = 1000 / len(raw_items)
+    print(
+        f"{name:<10} parse {elapsed_ms * per_1000:8.2f} ms/1000 items   "
+        f"cache {resident * per_1000 / 1024:8.1f} KiB/1000 items   "
+        f"({len(cached)} kept)"
+    )
+    return cached
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    raw_items = make_raw_items(n)
+    legacy = bench("legacy", legacy_parse, raw_items)
+    compact = bench("bulk", parse_menu_items, raw_items)
+    assert [item.path for item in legacy] == [item.path for item in compact]
@@ -0,0 +1,58 @@
+"""Benchmark: menu prompt tokens, legacy format vs compact handles
+
+Legacy line: "Pizza Margherita (5000 XAF) - menuItems/pizza_margherita"
+Compact line: "1 Pizza Margherita 5000" (app.menu.encoding)
+
+Reports the estimated tokens (~4 characters per token) of both encodings
+for every persisted menu snapshot (real menus, MENU_SNAPSHOT_DIR), the
+mock menu and a synthetic menu of n items with Firestore-style paths.
+
+Run:
+    python -m benchmarks.bench_menu_prompt [n_items]
+"""
+
+import glob
+import os
+import sys
+
+for key in ("TELEGRAM_BOT_TOKEN", "GEMINI_API_KEY", "GROQ_API_KEY",
+            "SPREELOOP_API_URL", "SPREELOOP_API_TOKEN", "FIREBASE_CREDENTIALS_JSON"):
+    os.environ.setdefault(key, "bench")
+
+from app.api.spreeloop import MOCK_MENU_ITEMS, parse_menu_items
+from app.config import get_settings
+from app.menu.encoding import encode_menu, estimate_tokens, legacy_menu_text
+from app.menu.snapshot import read_snapshot
+from app.models import MenuSnapshot
+from benchmarks.bench_menu_parse import make_raw_items
+
+
+def make_snapshot(raw_items: list) -> MenuSnapshot:
+    return MenuSnapshot(
+        place_id="bench", version=1, items=tuple(parse_menu_items(raw_items)),
+        content_hash="bench"
+    )
+
+
+def report(name: str, snapshot: MenuSnapshot):
+    legacy = estimate_tokens(legacy_menu_text(snapshot))
+    compact = estimate_tokens(encode_menu(snapshot).text)
+    saved = 100 * (1 - compact / legacy) if legacy else 0.0
+    print(
+        f"{name:<24} {len(snapshot.items):5d} items   legacy {legacy:7d} tokens   "
+        f"compact {compact:7d} tokens   saved {saved:5.1f}%"
+    )
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    snapshot_dir = get_settings().menu_snapshot_dir
+    for path in sorted(glob.glob(os.path.join(snapshot_dir, "*.json.gz"))):
+        place_id = os.path.basename(path)[:-len(".json.gz")]
+        snapshot = read_snapshot(place_id)
+        if snapshot is not None:
+            report(f"snapshot {place_id}", snapshot)
+
+    report("mock menu", make_snapshot(MOCK_MENU_ITEMS))
+    report(f"synthetic ({n})", make_snapshot(make_raw_items(n)))
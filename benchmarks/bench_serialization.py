@@ -0,0 +1,154 @@
+"""Benchmark: serialization CPU per update (webhook → session → order payload)
+
+One order-confirmation update goes through:
+- webhook body parsing + Update.de_json
+- the session round trip (pending order read back, session saved/loaded by
+  the shared store in multi-worker mode)
+- the submission key and the CreateOrderRequest body sent to Spreeloop
+
+Compares the former path (request.json(), model_dump()/ExtractedOrder(**data)
+in user_data, model_dump + json encoding of the payload) with the current
+one (app.utils.serialization, typed session objects, model_dump_json).
+
+Run:
+    python -m benchmarks.bench_serialization [n_updates]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+
+for key in ("TELEGRAM_BOT_TOKEN", "GEMINI_API_KEY", "GROQ_API_KEY",
+            "SPREELOOP_API_URL", "SPREELOOP_API_TOKEN", "FIREBASE_CREDENTIALS_JSON"):
+    os.environ.setdefault(key, "bench")
+
+from telegram import Update
+from app.models import (
+    CreateOrderRequest, ExtractedOrder, ExtractedOrderItem, OrderItemRequest, PaymentGateway, RestaurantOrder
+)
+from app.utils.serialization import BACKEND, dumps, loads
+
+WEBHOOK_BODY = json.dumps({
+    "update_id": 123456789,
+    "callback_query": {
+        "id": "4382bfdwdsb323b2d9",
+        "chat_instance": "-1234567890",
+        "data": "confirm_987654321",
+        "from": {"id": 987654321, "is_bot": False, "first_name": "Jean", "language_code": "fr"},
+        "message": {
+            "message_id": 42,
+            "date": 1700000000,
+            "chat": {"id": 987654321, "type": "private", "first_name": "Jean"},
+            "from": {"id": 1, "is_bot": True, "first_name": "Bot", "username": "food_bot"},
+            "text": "📋 Récapitulatif de commande\n\n• 2x Ndolé\n• 1x Poulet DG\n\nTout est correct ?",
+        },
+    },
+}, ensure_ascii=False).encode()
+
+ORDER = ExtractedOrder(
+    items=[
+        ExtractedOrderItem(foodName="Ndolé", quantity=2, menuItemPath="places/p1/menuItems/ndole"),
+        ExtractedOrderItem(foodName="Poulet DG", quantity=1, menuItemPath="places/p1/menuItems/poulet_dg"),
+    ],
+    customer_name="Jean Dupont",
+    customer_phone="+237675123456",
+    delivery_address="Bastos, près de l'ambassade",
+    # Renseigné: l'ancien aller-retour ExtractedOrder(**model_dump()) refuse payment_method=None
+    payment_method=PaymentGateway.CASH_TO_COURIER,
+    confidence=0.95,
+)
+
+REQUEST = CreateOrderRequest(
+    isGuestCheckout=True,
+    guestUserNumber=ORDER.customer_phone,
+    guestUserName=ORDER.customer_name,
+    selectedGateWay=PaymentGateway.CASH_TO_COURIER,
+    creatorSource="CHAT_BOT_REGULAR",
+    currencyCodeAlpha3="XAF",
+    orders={"default_restaurant": RestaurantOrder(
+        selectedItems=[
+            OrderItemRequest(id="ndole", count=2, priceInXAF=3000, foodName="Ndolé",
+                             menuItemPath="places/p1/menuItems/ndole"),
+            OrderItemRequest(id="poulet_dg", count=1, priceInXAF=5000, foodName="Poulet DG",
+                             menuItemPath="places/p1/menuItems/poulet_dg"),
+        ],
+        placePath="places/p1",
+    )},
+)
+
+HISTORY = [{"role": "Client", "content": "je veux 2 ndolé et 1 poulet DG"}] * 10
+
+
+def legacy_update():
+    update = Update.de_json(json.loads(WEBHOOK_BODY), None)
+    session = {"language": "fr", "conversation_history": HISTORY, "pending_order": ORDER.model_dump()}
+    # Store partagé (multi-worker): chargement puis sauvegarde
+    session = json.loads(json.dumps(session, ensure_ascii=False, default=str))
+    order = ExtractedOrder(**session["pending_order"])
+    key_payload = json.dumps(order.model_dump(mode="json"), sort_keys=True, ensure_ascii=False)
+    hashlib.sha256(key_payload.encode()).hexdigest()
+    body = json.dumps(REQUEST.model_dump(exclude_none=True, by_alias=True)).encode()
+    json.dumps(session, ensure_ascii=False, default=str)
+    return update, body
+
+
+def legacy_update_single_worker():
+    """Single worker: no shared store, but the order still goes through a dict in user_data"""
+    update = Update.de_json(json.loads(WEBHOOK_BODY), None)
+    order = ExtractedOrder(**ORDER.model_dump())
+    key_payload = json.dumps(order.model_dump(mode="json"), sort_keys=True, ensure_ascii=False)
+    hashlib.sha256(key_payload.encode()).hexdigest()
+    body = json.dumps(REQUEST.model_dump(exclude_none=True, by_alias=True)).encode()
+    return update, body
+
+
+def current_update():
+    update = Update.de_json(loads(WEBHOOK_BODY), None)
+    session = {"language": "fr", "conversation_history": HISTORY, "pending_order": ORDER}
+    session = loads(dumps(session))
+    order = ExtractedOrder(**session["pending_order"])  # Validé une fois par rechargement
+    session["pending_order"] = order
+    hashlib.sha256(order.model_dump_json().encode()).hexdigest()
+    body = REQUEST.model_dump_json(exclude_none=True, by_alias=True)
+    dumps(session)
+    return update, body
+
+
+def current_update_single_worker():
+    """Single worker: no shared store, the session keeps the typed order"""
+    update = Update.de_json(loads(WEBHOOK_BODY), None)
+    order = ORDER
+    hashlib.sha256(order.model_dump_json().encode()).hexdigest()
+    body = REQUEST.model_dump_json(exclude_none=True, by_alias=True)
+    return update, body
+
+
+def bench(name: str, run, n: int, repeat: int = 5) -> float:
+    """Best of `repeat` runs (least disturbed by the rest of the machine)"""
+    for _ in range(200):
+        run()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(n):
+            run()
+        timings.append(time.process_time() - started)
+    per_update_us = min(timings) / n * 1e6
+    print(f"{name:<26} {per_update_us:8.1f} µs CPU/update")
+    return per_update_us
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    # Même contenu envoyé à Spreeloop
+    assert json.loads(legacy_update()[1]) == json.loads(current_update()[1])
+    print(f"JSON backend: {BACKEND}")
+    for mode, legacy_run, current_run in (
+        ("single worker", legacy_update_single_worker, current_update_single_worker),
+        ("multi-worker", legacy_update, current_update),
+    ):
+        legacy = bench(f"legacy ({mode})", legacy_run, n)
+        current = bench(f"current ({mode})", current_run, n)
+        print(f"saved: {100 * (1 - current / legacy):.0f}%")
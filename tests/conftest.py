@@ -0,0 +1,12 @@
+import os
+
+# Dummy settings: provider clients are built lazily, so tests never need real keys
+for key, value in {
+    "TELEGRAM_BOT_TOKEN": "123456:test-token",
+    "GEMINI_API_KEY": "test-gemini-key",
+    "GROQ_API_KEY": "test-groq-key",
+    "SPREELOOP_API_URL": "https://api.example.test",
+    "SPREELOOP_API_TOKEN": "test-token",
+    "FIREBASE_CREDENTIALS_JSON": "{}",
+}.items():
+    os.environ.setdefault(key, value)
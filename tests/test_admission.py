@@ -0,0 +1,51 @@
+import asyncio
+import time
+import pytest
+from app.utils.admission import AdmissionController, LoopLagMonitor
+
+
+def make_controller(in_flight=0, **kwargs):
+    monitor = LoopLagMonitor()
+    state = {"in_flight": in_flight}
+    options = dict(max_loop_lag_ms=500, max_llm_in_flight=10, recovery_seconds=0)
+    options.update(kwargs)
+    return monitor, state, AdmissionController(monitor, lambda: state["in_flight"], **options)
+
+
+def test_loop_lag_above_threshold_degrades():
+    monitor, _, controller = make_controller()
+    monitor.record(50)
+    assert not controller.degraded
+    monitor.record(800)
+    assert controller.degraded
+
+
+def test_llm_in_flight_above_threshold_degrades():
+    _, state, controller = make_controller(in_flight=10)
+    assert controller.degraded
+    state["in_flight"] = 2
+    assert not controller.degraded
+
+
+def test_recovery_waits_for_a_calm_period():
+    monitor, _, controller = make_controller(recovery_seconds=60)
+    monitor.record(800)
+    assert controller.degraded
+    for _ in range(3):
+        monitor.record(10)
+    assert controller.degraded  # Pas encore 60 s sous les seuils
+
+    controller._last_overload -= 61
+    assert not controller.degraded
+
+
+@pytest.mark.asyncio
+async def test_monitor_measures_a_blocked_loop():
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # Bloque la boucle
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+
+    assert monitor.lag_ms >= 50
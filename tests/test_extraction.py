@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.llm.gemini import extract_order_gemini
 from app.llm.groq import extract_order_groq
 from app.models import ExtractedOrder
@@ -12,6 +12,20 @@ Pasta Carbonara (6000 XAF) - menuItems/pasta-carbonara
 Salad César (4000 XAF) - menuItems/salad-cesar
 """
 
+
+def patch_gemini(response):
+    """Patch the lazily built Gemini model to return response"""
+    model = MagicMock()
+    model.generate_content.return_value = response
+    return patch('app.llm.gemini.get_model', return_value=model)
+
+
+def patch_groq(response):
+    """Patch the lazily built Groq client to return response"""
+    client = MagicMock()
+    client.chat.completions.create.return_value = response
+    return patch('app.llm.groq.get_client', return_value=client)
+
 @pytest.mark.asyncio
 async def test_extract_order_gemini_simple_order():
     """Test simple order extraction with Gemini"""
@@ -22,13 +36,13 @@ async def test_extract_order_gemini_simple_order():
     mock_response = AsyncMock()
     mock_response.text = '{"items":[{"foodName":"Pizza Margherita","quantity":2,"menuItemPath":"menuItems/pizza-margherita"}],"confidence":0.9,"missing_fields":[]}'
 
-    with patch('app.llm.gemini.model.generate_content', return_value=mock_response):
+    with patch_gemini(mock_response):
         result = await extract_order_gemini(user_message, MOCK_MENU, language)
 
     assert isinstance(result, ExtractedOrder)
     assert len(result.items) == 1
-    assert result.items[0]['foodName'] == "Pizza Margherita"
-    assert result.items[0]['quantity'] == 2
+    assert result.items[0].foodName == "Pizza Margherita"
+    assert result.items[0].quantity == 2
     assert result.confidence == 0.9
 
 @pytest.mark.asyncio
@@ -47,7 +61,7 @@ async def test_extract_order_gemini_multiple_items():
         "missing_fields":[]
     }'''
 
-    with patch('app.llm.gemini.model.generate_content', return_value=mock_response):
+    with patch_gemini(mock_response):
         result = await extract_order_gemini(user_message, MOCK_MENU, language)
 
     assert len(result.items) == 2
@@ -62,7 +76,7 @@ async def test_extract_order_gemini_missing_info():
     mock_response = AsyncMock()
     mock_response.text = '{"items":[{"foodName":"Pizza Margherita","quantity":2,"menuItemPath":"menuItems/pizza-margherita"}],"confidence":0.7,"missing_fields":["customer_phone","delivery_address"]}'
 
-    with patch('app.llm.gemini.model.generate_content', return_value=mock_response):
+    with patch_gemini(mock_response):
         result = await extract_order_gemini(user_message, MOCK_MENU, language)
 
     assert len(result.items) == 1
@@ -78,7 +92,7 @@ async def test_extract_order_gemini_no_order():
     mock_response = AsyncMock()
     mock_response.text = '{"items":[],"confidence":0.0,"missing_fields":[]}'
 
-    with patch('app.llm.gemini.model.generate_content', return_value=mock_response):
+    with patch_gemini(mock_response):
         result = await extract_order_gemini(user_message, MOCK_MENU, language)
 
     assert len(result.items) == 0
@@ -94,11 +108,11 @@ async def test_extract_order_groq_fallback():
     mock_response.choices = [AsyncMock()]
     mock_response.choices[0].message.content = '{"items":[{"foodName":"Pasta Carbonara","quantity":1,"menuItemPath":"menuItems/pasta-carbonara"}],"confidence":0.85,"missing_fields":[]}'
 
-    with patch('app.llm.groq.client.chat.completions.create', return_value=mock_response):
+    with patch_groq(mock_response):
         result = await extract_order_groq(user_message, MOCK_MENU, language)
 
     assert len(result.items) == 1
-    assert result.items[0]['foodName'] == "Pasta Carbonara"
+    assert result.items[0].foodName == "Pasta Carbonara"
     assert result.confidence == 0.85
 
 # Add more test cases as needed...
@@ -112,7 +126,7 @@ async def test_extract_order_gemini_json_parse_error():
     mock_response = AsyncMock()
     mock_response.text = 'Invalid JSON response'
 
-    with patch('app.llm.gemini.model.generate_content', return_value=mock_response):
+    with patch_gemini(mock_response):
         result = await extract_order_gemini(user_message, MOCK_MENU, language)
 
     # Should return empty extraction on parse error
@@ -0,0 +1,40 @@
+"""Offline extraction regression suite (recorded provider responses)"""
+
+import pytest
+from benchmarks.bench_extraction import (
+    PATHS, find_regressions, load_baseline, load_corpus, run_path
+)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return load_corpus()
+
+
+def test_corpus_covers_languages(corpus):
+    assert {entry["language"] for entry in corpus} == {"fr", "en"}
+    assert any(entry["id"].startswith("mix-") for entry in corpus)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", PATHS)
+async def test_accuracy_not_below_baseline(corpus, path):
+    """Accuracy and token usage of each path do not regress"""
+    baseline = load_baseline()[path]
+    stats = await run_path(path, corpus)
+
+    regressions = [
+        r for r in find_regressions({path: stats}, {path: baseline})
+        if "accuracy" in r or "tokens" in r  # Latence: bruit de CI, voir le benchmark
+    ]
+    assert regressions == [], stats["failures"]
+
+
+def test_regressions_are_flagged():
+    baseline = {"groq": {"accuracy": 0.95, "p95_ms": 650.0, "overhead_p95_ms": 0.6, "tokens_per_message": 500}}
+    current = {"groq": {"accuracy": 0.90, "p95_ms": 900.0, "overhead_p95_ms": 0.7, "tokens_per_message": 600}}
+
+    regressions = find_regressions(current, baseline)
+
+    assert len(regressions) == 3
+    assert find_regressions(baseline, baseline) == []
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.llm import conversational
+from app.llm.providers import CLOSED, HALF_OPEN, OPEN, ProviderHealth, ProviderPool
+
+
+def make_pool(**kwargs):
+    options = dict(min_samples=3, max_error_rate=0.5, p95_ms=1000, open_seconds=30)
+    options.update(kwargs)
+    return ProviderPool({
+        "gemini": ProviderHealth("gemini", **options),
+        "groq": ProviderHealth("groq", **options),
+    })
+
+
+def test_circuit_opens_on_error_rate():
+    health = ProviderHealth("gemini", min_samples=3, max_error_rate=0.5)
+    health.record(100, True, now=0)
+    health.record(100, False, now=1)
+    assert health.state == CLOSED
+    health.record(100, False, now=2)
+    assert health.state == OPEN
+
+
+def test_circuit_opens_on_p95_latency():
+    health = ProviderHealth("gemini", min_samples=3, p95_ms=1000)
+    for at in range(3):
+        health.record(5000, True, now=at)
+    assert health.state == OPEN
+
+
+def test_half_open_allows_a_single_probe():
+    health = ProviderHealth("gemini", min_samples=1, max_error_rate=0.0, open_seconds=30)
+    health.record(100, False, now=0)
+    assert not health.allow(now=10)
+
+    assert health.allow(now=31)
+    assert health.state == HALF_OPEN
+    assert not health.allow(now=31)  # Une seule sonde à la fois
+
+    health.record(100, True, probe=True, now=32)
+    assert health.state == CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    health = ProviderHealth("gemini", min_samples=1, max_error_rate=0.0, open_seconds=30)
+    health.record(100, False, now=0)
+    assert health.allow(now=31)
+    health.record(100, False, probe=True, now=32)
+    assert health.state == OPEN
+    assert not health.allow(now=40)
+
+
+def test_old_calls_leave_the_window():
+    health = ProviderHealth("gemini", window_seconds=60)
+    health.record(100, False, now=0)
+    assert health.error_rate(now=30) == 1.0
+    assert health.error_rate(now=61) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_skipped():
+    pool = make_pool()
+    for _ in range(3):
+        pool.providers["gemini"].record(100, False)
+    gemini = AsyncMock(return_value="gemini")
+    groq = AsyncMock(return_value="groq")
+
+    result, provider = await pool.run({"gemini": gemini, "groq": groq})
+
+    assert (result, provider) == ("groq", "groq")
+    gemini.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failure_falls_back_and_is_recorded():
+    pool = make_pool()
+    gemini = AsyncMock(side_effect=asyncio.TimeoutError())
+    groq = AsyncMock(return_value="groq")
+
+    assert await pool.run({"gemini": gemini, "groq": groq}) == ("groq", "groq")
+    assert pool.snapshot()["gemini"]["error_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_empty_result_counts_as_failure():
+    pool = make_pool()
+    gemini = AsyncMock(return_value="")
+    groq = AsyncMock(return_value="")
+
+    assert await pool.run({"gemini": gemini, "groq": groq}, is_failure=lambda r: not r) == ("", "groq")
+    groq.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_all_circuits_open_still_tries_providers():
+    pool = make_pool()
+    for name in ("gemini", "groq"):
+        for _ in range(3):
+            pool.providers[name].record(100, False)
+    gemini = AsyncMock(return_value="gemini")
+
+    assert await pool.run({"gemini": gemini, "groq": AsyncMock()}) == ("gemini", "gemini")
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_the_slot():
+    health = ProviderHealth("gemini", min_samples=1, max_error_rate=0.0, open_seconds=0)
+    pool = ProviderPool({"gemini": health, "groq": ProviderHealth("groq")})
+    health.record(100, False)
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(pool.run({"gemini": hang, "groq": AsyncMock()}))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert health.allow()
+
+
+@pytest.mark.asyncio
+async def test_conversation_falls_back_to_groq():
+    pool = make_pool()
+    with patch.object(conversational, "provider_pool", pool), \
+         patch.object(conversational, "_reply_gemini", AsyncMock(side_effect=RuntimeError("503"))), \
+         patch.object(conversational, "_reply_groq", AsyncMock(return_value="Bonjour ! 😊")):
+        reply = await conversational.generate_conversational_response("bonjour", "", "fr")
+
+    assert reply == "Bonjour ! 😊"
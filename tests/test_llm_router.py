@@ -0,0 +1,162 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.llm import router
+from app.llm.router import ACCURATE, FAST, choose_route, score_complexity
+from app.llm.providers import ProviderHealth, ProviderPool
+from app.models import ExtractedOrder, ExtractedOrderItem
+
+MENU = "Ndolé (2500 XAF) - menuItems/ndole"
+
+
+@pytest.fixture(autouse=True)
+def fresh_provider_pool():
+    """Circuit state must not leak between tests"""
+    pool = ProviderPool({"gemini": ProviderHealth("gemini"), "groq": ProviderHealth("groq")})
+    with patch.object(router, "provider_pool", pool):
+        yield pool
+
+
+def order(confidence, items=1):
+    return ExtractedOrder(
+        items=[ExtractedOrderItem(foodName="Ndolé", quantity=1)] * items,
+        confidence=confidence
+    )
+
+
+def test_simple_messages_take_the_fast_route():
+    assert choose_route("2 ndolé")[0] == FAST
+    assert choose_route("Paul, 677123456")[0] == FAST
+    assert choose_route("bonjour")[0] == FAST
+
+
+def test_complex_messages_take_the_accurate_route():
+    message = (
+        "Bonjour je voudrais 2 ndolé, 3 poulets DG sans piment, 1 coca et 2 jus. "
+        "Je m'appelle Paul, livraison à Bonamoussadi près de la pharmacie, 677123456"
+    )
+    assert score_complexity(message) > score_complexity("2 ndolé")
+    assert choose_route(message)[0] == ACCURATE
+
+
+def test_phone_number_is_not_counted_as_quantities():
+    assert score_complexity("677 12 34 56") == score_complexity("677123456") == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_route_uses_fast_model_and_budget():
+    gemini = AsyncMock(return_value=order(0.9))
+    with patch.object(router, "extract_order_gemini", gemini):
+        result = await router.extract_order("2 ndolé", MENU, "fr")
+
+    assert result.confidence == 0.9
+    kwargs = gemini.await_args.kwargs
+    assert kwargs["model_name"] == router.settings.llm_fast_gemini_model
+    assert kwargs["timeout"] == router.settings.llm_fast_timeout
+    assert kwargs["max_tokens"] == router.settings.llm_fast_max_tokens
+
+
+@pytest.mark.asyncio
+async def test_low_confidence_fast_result_is_escalated():
+    gemini = AsyncMock(side_effect=[order(0.3), order(0.95)])
+    with patch.object(router, "extract_order_gemini", gemini):
+        result = await router.extract_order("2 ndolé", MENU, "fr")
+
+    assert result.confidence == 0.95
+    models = [call.kwargs["model_name"] for call in gemini.await_args_list]
+    assert models == [router.settings.llm_fast_gemini_model, router.settings.llm_accurate_gemini_model]
+
+
+@pytest.mark.asyncio
+async def test_no_escalation_for_messages_without_items():
+    gemini = AsyncMock(return_value=order(0.3, items=0))
+    with patch.object(router, "extract_order_gemini", gemini):
+        await router.extract_order("bonjour", MENU, "fr")
+
+    assert gemini.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_gemini_timeout_falls_back_to_groq_on_same_route():
+    gemini = AsyncMock(side_effect=asyncio.TimeoutError())
+    groq = AsyncMock(return_value=order(0.8))
+    with patch.object(router, "extract_order_gemini", gemini), \
+         patch.object(router, "extract_order_groq", groq):
+        result = await router.extract_order("2 ndolé", MENU, "fr")
+
+    assert result.confidence == 0.8
+    assert groq.await_args.kwargs["model"] == router.settings.llm_fast_groq_model
+
+
+@pytest.mark.asyncio
+async def test_provider_timeout_is_enforced():
+    def slow(*args, **kwargs):
+        import time
+        time.sleep(0.2)
+
+    from app.llm.gemini import extract_order_gemini
+    with patch("app.llm.gemini.get_model") as get_model:
+        get_model.return_value.generate_content.side_effect = slow
+        with pytest.raises(asyncio.TimeoutError):
+            await extract_order_gemini("2 ndolé", MENU, "fr", timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_open_gemini_circuit_goes_straight_to_groq(fresh_provider_pool):
+    for _ in range(5):
+        fresh_provider_pool.providers["gemini"].record(100, False)
+    gemini = AsyncMock()
+    groq = AsyncMock(return_value=order(0.9))
+    with patch.object(router, "extract_order_gemini", gemini), \
+         patch.object(router, "extract_order_groq", groq):
+        result = await router.extract_order("2 ndolé", MENU, "fr")
+
+    assert result.confidence == 0.9
+    gemini.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_missing_fields_provider_errors_return_failed_extraction(fresh_provider_pool):
+    """Groq circuit open and Gemini raising: no exception reaches the handler"""
+    for _ in range(5):
+        fresh_provider_pool.providers["groq"].record(100, False)
+    gemini = AsyncMock(side_effect=RuntimeError("quota"))
+    with patch.object(router, "extract_missing_fields_gemini", gemini):
+        result = await router.extract_missing_fields("c'est Paul", ["customer_name"], "fr")
+
+    assert router.extraction_failed(result)
+
+
+@pytest.mark.asyncio
+async def test_empty_missing_fields_answer_counts_as_provider_failure(fresh_provider_pool):
+    gemini = AsyncMock(return_value=ExtractedOrder(items=[], confidence=0))
+    groq = AsyncMock(return_value=ExtractedOrder(items=[], customer_name="Paul", confidence=0.9))
+    with patch.object(router, "extract_missing_fields_gemini", gemini), \
+         patch.object(router, "extract_missing_fields_groq", groq):
+        result = await router.extract_missing_fields("c'est Paul", ["customer_name"], "fr")
+
+    assert result.customer_name == "Paul"
+    assert fresh_provider_pool.providers["gemini"].error_rate() > 0
+
+
+@pytest.mark.asyncio
+async def test_partial_order_asks_again_when_no_provider_answers(monkeypatch):
+    from types import SimpleNamespace
+    from app.telegram import handlers
+
+    monkeypatch.setattr(handlers, "extract_missing_fields", AsyncMock(return_value=router.failed_extraction()))
+    replies = []
+    message = SimpleNamespace(chat_id=1, reply_text=AsyncMock(side_effect=lambda text, **kwargs: replies.append(text)))
+    update = SimpleNamespace(message=message, effective_message=message, effective_user=SimpleNamespace(id=1))
+    context = SimpleNamespace(user_data={})
+    pending = ExtractedOrder(
+        items=[ExtractedOrderItem(foodName="Ndolé", quantity=1)], customer_name="Paul", confidence=0.9
+    )
+
+    consumed = await handlers.continue_partial_order(
+        update, context, pending, "euh attendez je regarde", "fr"
+    )
+
+    assert consumed
+    assert len(replies) == 1
+    assert "numéro de téléphone" in replies[0] and "l'adresse de livraison" in replies[0]
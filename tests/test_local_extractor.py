@@ -0,0 +1,92 @@
+import pytest
+from app.llm.local_extractor import extract_contact_info, get_phone_operator
+
+
+@pytest.mark.parametrize("message,expected", [
+    ("675123456", "+237675123456"),
+    ("6 99 12 34 56", "+237699123456"),
+    ("+237 655-12-34-56", "+237655123456"),
+    ("00237 680 123 456", "+237680123456"),
+    ("mon numéro est 237699887766 merci", "+237699887766"),
+])
+def test_phone_formats(message, expected):
+    """Cameroonian number formats are normalised to +237"""
+    assert extract_contact_info(message).customer_phone == expected
+
+
+def test_phone_operator():
+    assert get_phone_operator("+237675123456") == "MTN"
+    assert get_phone_operator("+237699123456") == "ORANGE"
+
+
+def test_full_contact_followup():
+    """README follow-up message is fully read without LLM"""
+    result = extract_contact_info("Jean Dupont, 675123456, Yaoundé")
+    order = result.to_extracted_order(min_confidence=0.7)
+
+    assert order.customer_name == "Jean Dupont"
+    assert order.customer_phone == "+237675123456"
+    assert order.delivery_address == "Yaoundé"
+    assert result.leftover_text == ""
+
+
+def test_address_from_gazetteer():
+    """Landmark + city segments are joined into one address"""
+    result = extract_contact_info("Carrefour Warda, Yaoundé")
+
+    assert result.delivery_address == "Carrefour Warda, Yaoundé"
+    assert result.field_confidence["delivery_address"] >= 0.9
+    assert result.customer_name is None
+
+
+def test_name_marker():
+    result = extract_contact_info("je m'appelle Marie Ngono et mon numéro c'est 6 99 12 34 56")
+
+    assert result.customer_name == "Marie Ngono"
+    assert result.customer_phone == "+237699123456"
+
+
+def test_non_contact_message_left_for_llm():
+    """Messages without contact details are left to the LLM"""
+    result = extract_contact_info("ajoute 1 coca")
+
+    assert result.field_confidence == {}
+    assert result.leftover_text == "ajoute 1 coca"
+
+
+def test_bare_single_word_left_for_llm():
+    """A lone capitalised word is below the default threshold and kept for the LLM"""
+    result = extract_contact_info("Marie", expected_fields=["customer_name"])
+
+    assert result.to_extracted_order(min_confidence=0.7).customer_name is None
+    assert result.leftover_text == "Marie"
+
+
+@pytest.mark.parametrize("message", ["Annuler", "Attendez", "Combien ça coûte"])
+def test_commands_are_not_names(message):
+    result = extract_contact_info(message, expected_fields=["customer_name"])
+
+    assert result.customer_name is None
+    assert result.leftover_text == message
+
+
+def test_menu_items_are_not_names():
+    from app.llm.local_extractor import menu_name_words
+
+    menu_words = menu_name_words(["Coca-Cola 33cl", "Poulet DG"])
+    result = extract_contact_info(
+        "Coca-Cola, 675123456",
+        expected_fields=["customer_name", "customer_phone"],
+        menu_words=menu_words
+    )
+
+    assert result.customer_name is None
+    assert result.customer_phone == "+237675123456"
+    assert result.leftover_text == "Coca-Cola"
+
+
+def test_address_marker_au():
+    """'livrez au' keeps the whole address (not 'u ...')"""
+    result = extract_contact_info("livrez au 6e étage immeuble rose")
+
+    assert result.delivery_address == "6e étage immeuble rose"
@@ -0,0 +1,48 @@
+import logging
+import pytest
+import structlog
+from app.utils import logger as log_module
+from app.utils.logger import cap_field_sizes, parse_sample_rates, sample_events, set_log_level
+
+
+def test_parse_sample_rates():
+    rates = parse_sample_rates("message_received=0.1, webhook_processed=2,bad,x=abc")
+
+    assert rates == {"message_received": 0.1, "webhook_processed": 1.0}
+
+
+def test_sampling_never_drops_errors(monkeypatch):
+    monkeypatch.setattr(log_module, "_sample_rates", {"noisy": 0.0})
+
+    with pytest.raises(structlog.DropEvent):
+        sample_events(None, "info", {"event": "noisy"})
+    assert sample_events(None, "error", {"event": "noisy"}) == {"event": "noisy"}
+    assert sample_events(None, "info", {"event": "other"}) == {"event": "other"}
+
+
+def test_cap_field_sizes_keeps_structural_fields(monkeypatch):
+    monkeypatch.setattr(log_module, "_max_field_length", 10)
+    event = {
+        "event": "gemini_extraction_success",
+        "timestamp": "2026-10-19T10:00:00.000000Z",
+        "trace_id": "0123456789abcdef",
+        "response": "x" * 25,
+    }
+
+    capped = cap_field_sizes(None, "info", dict(event))
+
+    assert capped["response"] == "xxxxxxxxxx...(+15)"
+    for key in ("event", "timestamp", "trace_id"):
+        assert capped[key] == event[key]
+
+
+def test_set_log_level():
+    root = logging.getLogger()
+    previous = root.level
+    try:
+        assert set_log_level("debug") == "DEBUG"
+        assert root.level == logging.DEBUG
+        with pytest.raises(ValueError):
+            set_log_level("verbose")
+    finally:
+        root.setLevel(previous)
@@ -0,0 +1,63 @@
+from app.api.spreeloop import MOCK_MENU_ITEMS, parse_menu_items
+from app.menu.encoding import encode_menu, estimate_tokens, legacy_menu_text, resolve_item_handles
+from app.models import ExtractedOrder, ExtractedOrderItem, MenuSnapshot
+
+
+def make_snapshot() -> MenuSnapshot:
+    return MenuSnapshot(
+        place_id="default", version=2, items=tuple(parse_menu_items(MOCK_MENU_ITEMS)),
+        content_hash="h"
+    )
+
+
+def test_compact_encoding_is_smaller_than_legacy():
+    snapshot = make_snapshot()
+    encoding = encode_menu(snapshot)
+
+    assert encoding.text.splitlines()[0] == "1 Pizza Margherita 5000"
+    assert encoding.handles[1] == "menuItems/pizza_margherita"
+    assert "menuItems/" not in encoding.text
+    assert estimate_tokens(encoding.text) < estimate_tokens(legacy_menu_text(snapshot))
+
+
+def test_handles_are_mapped_back_to_paths():
+    encoding = encode_menu(make_snapshot())
+    order = ExtractedOrder(
+        items=[ExtractedOrderItem(id=2, foodName="pizza fromage", quantity=1)],
+        confidence=0.9
+    )
+
+    resolved = resolve_item_handles(order, encoding)
+
+    assert resolved.items[0].menuItemPath == "menuItems/pizza_4fromages"
+    assert resolved.items[0].id is None
+    assert resolved.confidence == 0.9
+
+
+def test_unknown_handles_are_rejected():
+    encoding = encode_menu(make_snapshot())
+    order = ExtractedOrder(
+        items=[
+            ExtractedOrderItem(id=99, foodName="Eru", quantity=1),
+            ExtractedOrderItem(id=1, foodName="Pizza Margherita", quantity=2),
+        ],
+        confidence=0.9
+    )
+
+    resolved = resolve_item_handles(order, encoding)
+
+    assert [item.menuItemPath for item in resolved.items] == ["menuItems/pizza_margherita"]
+    assert resolved.confidence <= 0.5
+
+
+def test_items_without_handle_are_matched_by_exact_name():
+    encoding = encode_menu(make_snapshot())
+    order = ExtractedOrder(items=[
+        ExtractedOrderItem(foodName="poulet braisé", quantity=1),
+        ExtractedOrderItem(foodName="Eru", quantity=1),
+    ])
+
+    resolved = resolve_item_handles(order, encoding)
+
+    assert resolved.items[0].menuItemPath == "menuItems/poulet_braise"
+    assert resolved.items[1].menuItemPath is None
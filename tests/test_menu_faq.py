@@ -0,0 +1,47 @@
+from app.api.spreeloop import MOCK_MENU_ITEMS
+from app.menu.faq import FaqCache
+from app.models import BaseItem, MenuItem, MenuSnapshot
+
+
+def make_faq() -> FaqCache:
+    items = tuple(MenuItem.from_base_item(BaseItem(**item)) for item in MOCK_MENU_ITEMS)
+    faq = FaqCache()
+    faq.rebuild(MenuSnapshot(
+        place_id="default", version=1, items=items,
+        content_hash="h", etag=None, last_modified=None, fetched_at=0.0
+    ))
+    return faq
+
+
+def test_description_question_is_answered_from_the_menu():
+    answer = make_faq().answer("c'est quoi le ndolé ?", "fr")
+
+    assert answer is not None
+    assert answer.startswith("Ndolé: ")
+    assert "XAF" in answer
+
+
+def test_price_question_with_digits_in_the_item_name():
+    answer = make_faq().answer("how much is the pizza 4 fromages", "en")
+
+    assert answer.startswith("Pizza 4 Fromages: 6000 XAF.")
+    assert "To order" in answer
+
+
+def test_vegetarian_question():
+    faq = make_faq()
+    assert faq.answer("la pizza margherita est végétarienne ?", "fr").startswith("Oui, Pizza Margherita")
+    assert faq.answer("le poulet braisé est végétarien ?", "fr").startswith("Non, Poulet Braisé")
+
+
+def test_orders_and_ambiguous_questions_fall_through():
+    faq = make_faq()
+    assert faq.answer("2 ndolé c'est combien ?", "fr") is None  # Commande
+    assert faq.answer("je veux le ndolé, c'est combien", "fr") is None
+    assert faq.answer("combien coûte la pizza ?", "fr") is None  # Deux pizzas au menu
+    assert faq.answer("c'est quoi le eru ?", "fr") is None  # Pas au menu
+    assert faq.answer("ndolé", "fr") is None  # Pas une question
+
+
+def test_no_answer_before_the_menu_is_loaded():
+    assert FaqCache().answer("c'est quoi le ndolé ?", "fr") is None
@@ -0,0 +1,57 @@
+from app.models import MenuItem, MenuSnapshot
+from app.menu.pages import MenuPages, PAGE_SIZE, is_menu_request, parse_page_callback, render_pages
+
+
+def make_item(i: int, category: str) -> MenuItem:
+    return MenuItem(
+        path=f"menuItems/item_{i}",
+        shortDescription=f"Plat {i}",
+        foodName=f"Plat {i}",
+        priceInXAF=1000.0 + i,
+        categoriesPaths=(category,) if category else (),
+        longDescription=None,
+        isVegetarian=False,
+    )
+
+
+def make_snapshot(items, version: int = 3) -> MenuSnapshot:
+    return MenuSnapshot(
+        place_id="default", version=version, items=tuple(items),
+        content_hash="h", etag=None, last_modified=None, fetched_at=0.0
+    )
+
+
+def test_pages_grouped_by_category_and_paginated():
+    items = [make_item(i, "categories/plats") for i in range(PAGE_SIZE + 2)]
+    items += [make_item(100, "categories/boissons"), make_item(101, "")]
+
+    pages = render_pages(make_snapshot(items), "fr")
+
+    assert len(pages) == 4
+    assert pages[0].text.startswith("📋 Menu · Plats (1/2)")
+    assert pages[2].text.startswith("📋 Menu · Boissons")
+    assert pages[3].text.startswith("📋 Menu · Autres")
+    assert "Plat 0 — 1000 XAF" in pages[0].text
+
+    category_row = pages[2].markup.inline_keyboard[0]
+    assert [b.text for b in category_row] == ["Plats", "• Boissons", "Autres"]
+    navigation = pages[0].markup.inline_keyboard[-1]
+    assert [b.callback_data for b in navigation] == ["menu_3_3", "menu_3_0", "menu_3_1"]
+
+
+def test_pages_rebuilt_per_version_and_language():
+    menu_pages = MenuPages()
+    menu_pages.rebuild(make_snapshot([make_item(1, "categories/plats")], version=1))
+
+    assert menu_pages.version == 1
+    assert "Pour commander" in menu_pages.get(0, "fr").text
+    assert "To order" in menu_pages.get(0, "en").text
+    assert menu_pages.get(42, "fr") == menu_pages.get(0, "fr")  # Ancien numéro de page
+
+
+def test_menu_request_detection():
+    assert is_menu_request("Le menu svp")
+    assert is_menu_request("what's on the menu?")
+    assert not is_menu_request("2 pizzas du menu")
+    assert not is_menu_request("je veux un poulet")
+    assert parse_page_callback("menu_3_12") == (3, 12)
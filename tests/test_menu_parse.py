@@ -0,0 +1,62 @@
+from app.api.spreeloop import MOCK_MENU_ITEMS, parse_menu_items
+from app.models import MenuItem
+
+
+def test_parse_mock_menu():
+    """Mock menu parses into compact MenuItem records"""
+    items = parse_menu_items(MOCK_MENU_ITEMS)
+
+    assert len(items) == 5
+    assert all(isinstance(item, MenuItem) for item in items)
+    assert items[0].display_name() == "Pizza Margherita"
+    assert items[0].display_price() == "5000 XAF"
+    assert items[0].categoriesPaths == ("categories/pizza",)
+
+
+def test_filter_applied_at_parse_time():
+    """Hidden, unavailable, unpriced and non menu items are dropped"""
+    base = dict(MOCK_MENU_ITEMS[0])
+    raw_items = [
+        dict(base, path="menuItems/ok"),
+        dict(base, path="menuItems/hidden", isVisible=False),
+        dict(base, path="menuItems/unavailable", isAvailable=False),
+        dict(base, path="menuItems/no_price", priceInXAF=None),
+        dict(base, path="menuItems/reservation", baseItemType="BASE_ITEM_TYPE_RESERVATION_ITEM"),
+    ]
+
+    assert [item.path for item in parse_menu_items(raw_items)] == ["menuItems/ok"]
+
+
+def test_flags_follow_base_item_bool_rules():
+    """String/int flags accepted by BaseItem keep the item orderable"""
+    base = dict(MOCK_MENU_ITEMS[0])
+    raw_items = [
+        dict(base, path="menuItems/str_true", isAvailable="True", isVisible="true"),
+        dict(base, path="menuItems/int_true", isAvailable=1, isVisible="yes"),
+        dict(base, path="menuItems/str_false", isAvailable="false"),
+        dict(base, path="menuItems/garbage", isVisible="maybe"),
+        dict(base, path="menuItems/missing", isAvailable=None),
+    ]
+
+    assert [item.path for item in parse_menu_items(raw_items)] == [
+        "menuItems/str_true", "menuItems/int_true"
+    ]
+
+
+def test_invalid_item_skipped():
+    """One invalid item does not drop the whole menu"""
+    base = dict(MOCK_MENU_ITEMS[0])
+    raw_items = [
+        dict(base, path="menuItems/ok"),
+        dict(base, path="menuItems/bad_price", priceInXAF="free"),
+        dict(base, path="menuItems/ok2"),
+    ]
+
+    assert [item.path for item in parse_menu_items(raw_items)] == ["menuItems/ok", "menuItems/ok2"]
+
+
+def test_row_round_trip():
+    """Rows stored as JSON lists rebuild the same record"""
+    item = parse_menu_items(MOCK_MENU_ITEMS)[0]
+
+    assert MenuItem.from_row([list(x) if isinstance(x, tuple) else x for x in item]) == item
@@ -0,0 +1,64 @@
+import gzip
+import json
+import pytest
+from app.api.spreeloop import MOCK_MENU_ITEMS, parse_menu_items
+from app.menu import cache as cache_module
+from app.menu import snapshot as snapshot_module
+from app.menu.cache import MenuCache
+from app.models import MenuSnapshot
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_module.settings, "menu_snapshot_dir", str(tmp_path))
+    return tmp_path
+
+
+def make_snapshot(version=3, fetched_at=1000.0):
+    return MenuSnapshot(
+        place_id="place_1",
+        version=version,
+        items=tuple(parse_menu_items(MOCK_MENU_ITEMS)),
+        content_hash="abc",
+        etag='"v3"',
+        fetched_at=fetched_at
+    )
+
+
+def test_snapshot_round_trip(snapshot_dir):
+    snapshot = make_snapshot()
+
+    snapshot_module.write_snapshot(snapshot)
+
+    assert snapshot_module.read_snapshot("place_1") == snapshot
+    assert [p.name for p in snapshot_dir.iterdir()] == ["place_1.json.gz"]
+
+
+def test_incompatible_schema_is_ignored(snapshot_dir):
+    path = snapshot_dir / "place_1.json.gz"
+    with gzip.open(path, "wb") as f:
+        f.write(json.dumps({"schema": 0, "snapshot": {}}).encode())
+
+    assert snapshot_module.read_snapshot("place_1") is None
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_served_while_refreshing(snapshot_dir, monkeypatch):
+    """Warm start: the disk menu answers at once, even if the gateway is down"""
+    snapshot_module.write_snapshot(make_snapshot())
+    monkeypatch.setattr(cache_module.settings, "spreeloop_default_place_id", "place_1")
+
+    async def gateway_down(previous=None):
+        raise RuntimeError("gateway down")
+
+    monkeypatch.setattr(cache_module, "load_menu_snapshot", gateway_down)
+
+    cache = MenuCache()
+    assert await cache.load_persisted()
+
+    snapshot = await cache.get_snapshot()
+    await cache._refresh_task
+
+    assert snapshot.version == 3
+    assert cache.find("menuItems/ndole") is not None
+    assert not cache.is_stale()  # retry delayed after the failure
@@ -0,0 +1,75 @@
+import httpx
+import pytest
+from app.api import spreeloop
+from app.api.spreeloop import MOCK_MENU_ITEMS, SpreeloopAPI
+from app.menu.cache import MenuCache
+
+
+def make_api(monkeypatch, handler):
+    """Production-mode client backed by an in-memory transport"""
+    monkeypatch.setattr(spreeloop.settings, "environment", "production")
+    api = SpreeloopAPI()
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return api
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_not_modified(monkeypatch):
+    """304 keeps the previous snapshot and version"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"items": MOCK_MENU_ITEMS}, headers={"ETag": '"v1"'})
+
+    api = make_api(monkeypatch, handler)
+    first = await api.get_menu_snapshot("place_1")
+    second = await api.get_menu_snapshot("place_1")
+
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    assert second.version == first.version == 1
+    assert len(second.items) == 5
+
+
+@pytest.mark.asyncio
+async def test_same_content_hash_skips_reparse(monkeypatch):
+    """Without ETag support, an identical payload keeps the version"""
+    payload = {"items": MOCK_MENU_ITEMS}
+    api = make_api(monkeypatch, lambda request: httpx.Response(200, json=payload))
+
+    first = await api.get_menu_snapshot("place_1")
+    monkeypatch.setattr(spreeloop, "parse_menu_items", lambda raw: pytest.fail("re-parsed"))
+    second = await api.get_menu_snapshot("place_1")
+
+    assert second.version == first.version
+    assert second.content_hash == first.content_hash
+
+
+@pytest.mark.asyncio
+async def test_changed_content_bumps_version(monkeypatch):
+    payloads = [MOCK_MENU_ITEMS, MOCK_MENU_ITEMS[:2]]
+    api = make_api(monkeypatch, lambda request: httpx.Response(200, json={"items": payloads.pop(0)}))
+
+    first = await api.get_menu_snapshot("place_1")
+    second = await api.get_menu_snapshot("place_1")
+
+    assert (first.version, second.version) == (1, 2)
+    assert len(second.items) == 2
+
+
+@pytest.mark.asyncio
+async def test_menu_cache_listeners_run_once_per_version(monkeypatch):
+    """Downstream caches rebuild only when the version changes"""
+    api = make_api(monkeypatch, lambda request: httpx.Response(200, json={"items": MOCK_MENU_ITEMS}))
+    cache = MenuCache()
+    versions = []
+    cache.on_refresh(lambda snapshot: versions.append(snapshot.version))
+
+    cache.set_snapshot(await api.get_menu_snapshot("place_1"))
+    cache.set_snapshot(await api.get_menu_snapshot("place_1"))
+
+    assert versions == [1]
+    assert cache.find("menuItems/ndole").foodName == "Ndolé"
@@ -0,0 +1,68 @@
+import pytest
+from app.models import ExtractedOrder, ExtractedOrderItem
+from app.orders.assembly import get_missing_fields, merge_orders, fills_any_field
+
+
+def make_pending():
+    return ExtractedOrder(
+        items=[ExtractedOrderItem(foodName="Pizza Margherita", quantity=2)],
+        confidence=0.8,
+        missing_fields=["customer_name", "customer_phone", "delivery_address"]
+    )
+
+
+def test_missing_fields_pending_order():
+    """Pending order without contact info misses all customer fields"""
+    assert get_missing_fields(make_pending()) == [
+        "customer_name", "customer_phone", "delivery_address"
+    ]
+
+
+def test_merge_followup_keeps_items():
+    """Contact info from the follow-up message is merged without losing items"""
+    followup = ExtractedOrder(
+        items=[],
+        customer_name="Jean Dupont",
+        customer_phone="675123456",
+        delivery_address="Yaoundé"
+    )
+
+    merged = merge_orders(make_pending(), followup)
+
+    assert len(merged.items) == 1
+    assert merged.items[0].foodName == "Pizza Margherita"
+    assert merged.customer_phone == "+237675123456"
+    assert merged.missing_fields == []
+    assert merged.confidence == 0.8
+
+
+def test_merge_partial_followup():
+    """Only the provided fields are filled, the rest stays missing"""
+    followup = ExtractedOrder(items=[], customer_name="Jean Dupont")
+
+    merged = merge_orders(make_pending(), followup)
+
+    assert merged.customer_name == "Jean Dupont"
+    assert merged.missing_fields == ["customer_phone", "delivery_address"]
+
+
+def test_merge_items_updates_quantity_and_appends():
+    """Same item takes the new quantity, new items are appended"""
+    update = ExtractedOrder(items=[
+        ExtractedOrderItem(foodName="pizza margherita", quantity=3),
+        ExtractedOrderItem(foodName="Coca-Cola", quantity=1),
+    ])
+
+    merged = merge_orders(make_pending(), update)
+
+    assert [(i.foodName, i.quantity) for i in merged.items] == [
+        ("Pizza Margherita", 3), ("Coca-Cola", 1)
+    ]
+
+
+def test_fills_any_field():
+    """Extraction without any missing field is not consumed"""
+    missing = ["customer_phone", "delivery_address"]
+
+    assert not fills_any_field(ExtractedOrder(items=[], customer_name="Jean"), missing)
+    assert fills_any_field(ExtractedOrder(items=[], delivery_address="Bastos"), missing)
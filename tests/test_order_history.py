@@ -0,0 +1,110 @@
+import asyncio
+import time
+import pytest
+from app.models import CreateOrderRequest, PaymentGateway, OrderItemRequest, RestaurantOrder
+from app.orders.history import OrderHistory, OrderRecord
+
+
+def make_request(count: int = 2) -> CreateOrderRequest:
+    return CreateOrderRequest(
+        guestUserNumber="+237690000000",
+        guestUserName="Jean",
+        selectedGateWay=PaymentGateway.CASH_TO_COURIER,
+        currencyCodeAlpha3="XAF",
+        orders={
+            "default_restaurant": RestaurantOrder(
+                selectedItems=[OrderItemRequest(
+                    id="ndole",
+                    count=count,
+                    priceInXAF=3000,
+                    foodName="Ndolé",
+                    menuItemPath="menuItems/ndole"
+                )],
+                placePath="places/p1"
+            )
+        }
+    )
+
+
+def make_record(user_id: int, order_path: str, created_at: float = None) -> OrderRecord:
+    record = OrderRecord.from_request(user_id, order_path, make_request(), "Bastos", latency_ms=123.456)
+    return record._replace(created_at=created_at) if created_at is not None else record
+
+
+def test_record_from_request():
+    record = make_record(1, "orderGroups/a")
+    assert record.items == [{"menuItemPath": "menuItems/ndole", "foodName": "Ndolé", "count": 2, "priceInXAF": 3000}]
+    assert record.total_xaf == 6000
+    assert record.place_path == "places/p1"
+    assert record.customer_phone == "+237690000000"
+    assert record.latency_ms == 123.5
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_one_batch(tmp_path):
+    history = OrderHistory(str(tmp_path / "orders.sqlite3"))
+    for i in range(3):
+        history.record(make_record(1, f"orderGroups/{i}", created_at=1000.0 + i))
+
+    await history.flush()
+
+    assert history._pending == []
+    rows = history._query("SELECT order_path FROM orders ORDER BY created_at")
+    assert [row[0] for row in rows] == ["orderGroups/0", "orderGroups/1", "orderGroups/2"]
+    await history.stop()
+
+
+@pytest.mark.asyncio
+async def test_recent_orders_include_buffered(tmp_path):
+    """An order not yet written is already visible, newest first"""
+    history = OrderHistory(str(tmp_path / "orders.sqlite3"))
+    history.record(make_record(1, "orderGroups/old", created_at=1000.0))
+    history.record(make_record(2, "orderGroups/other", created_at=1001.0))
+    await history.flush()
+    history.record(make_record(1, "orderGroups/new", created_at=1002.0))
+
+    recent = await history.recent_orders(1, limit=5)
+
+    assert [order.order_path for order in recent] == ["orderGroups/new", "orderGroups/old"]
+    assert recent[1].request["guestUserName"] == "Jean"
+    assert [order.order_path for order in await history.recent_orders(1, limit=1)] == ["orderGroups/new"]
+    await history.stop()
+
+
+@pytest.mark.asyncio
+async def test_hourly_volumes(tmp_path):
+    history = OrderHistory(str(tmp_path / "orders.sqlite3"))
+    hour = (int(time.time()) // 3600 - 1) * 3600
+    history.record(make_record(1, "orderGroups/a", created_at=hour + 10))
+    history.record(make_record(2, "orderGroups/b", created_at=hour + 20))
+    history.record(make_record(3, "orderGroups/c", created_at=hour + 3600 + 5))
+    history.record(make_record(4, "orderGroups/too_old", created_at=hour - 48 * 3600))
+    await history.flush()
+
+    volumes = await history.hourly_volumes(hours=24)
+
+    assert [v["orders"] for v in volumes] == [2, 1]
+    assert volumes[0]["total_xaf"] == 12000
+    assert volumes[0]["hour"] == time.strftime("%Y-%m-%dT%H:00:00Z", time.gmtime(hour))
+    await history.stop()
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_full_batch_and_stop_flushes_rest(tmp_path):
+    history = OrderHistory(str(tmp_path / "orders.sqlite3"), batch_size=2, flush_interval=60)
+    history.start()
+
+    history.record(make_record(1, "orderGroups/a"))
+    history.record(make_record(1, "orderGroups/b"))
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if not history._pending:
+            break
+    assert history._pending == []
+
+    history.record(make_record(1, "orderGroups/c"))
+    await history.stop()
+
+    reopened = OrderHistory(str(tmp_path / "orders.sqlite3"))
+    assert len(await reopened.recent_orders(1, limit=10)) == 3
+    await reopened.stop()
@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from app.models import CreateOrderApiResponse, ExtractedOrder, ExtractedOrderItem, MenuItem, OrderResponse
+from app.orders.submission import OrderSubmitter, order_submission_key
+
+
+def make_order(quantity: int = 2) -> ExtractedOrder:
+    return ExtractedOrder(
+        items=[ExtractedOrderItem(menuItemPath="menuItems/coca_cola", foodName="Coca-Cola", quantity=quantity)],
+        customer_name="Jean Dupont",
+        customer_phone="+237675123456",
+        delivery_address="Bastos, Yaoundé",
+        confidence=0.9
+    )
+
+
+def test_key_depends_on_user_and_order():
+    assert order_submission_key(1, make_order()) == order_submission_key(1, make_order())
+    assert order_submission_key(1, make_order()) != order_submission_key(2, make_order())
+    assert order_submission_key(1, make_order()) != order_submission_key(1, make_order(3))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_taps_share_one_call():
+    submitter = OrderSubmitter()
+    calls = 0
+
+    async def create():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "orderGroups/1"
+
+    results = await asyncio.gather(*[submitter.submit("1:abc", create) for _ in range(3)])
+
+    assert calls == 1
+    assert [r for r, _ in results] == ["orderGroups/1"] * 3
+    assert sorted(d for _, d in results) == [False, True, True]
+
+
+@pytest.mark.asyncio
+async def test_completed_submission_is_not_remembered():
+    """The same order sent again later (a reorder) is a new order"""
+    submitter = OrderSubmitter()
+    calls = 0
+
+    async def create():
+        nonlocal calls
+        calls += 1
+        return f"orderGroups/{calls}"
+
+    assert await submitter.submit("1:abc", create) == ("orderGroups/1", False)
+    assert await submitter.submit("1:abc", create) == ("orderGroups/2", False)
+
+
+@pytest.mark.asyncio
+async def test_failure_is_not_remembered():
+    submitter = OrderSubmitter()
+    attempts = 0
+
+    async def create():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("gateway down")
+        return "orderGroups/2"
+
+    with pytest.raises(RuntimeError):
+        await submitter.submit("1:abc", create)
+    assert await submitter.submit("1:abc", create) == ("orderGroups/2", False)
+
+
+@pytest.mark.asyncio
+async def test_identical_reorders_in_a_row_each_create_an_order(monkeypatch):
+    """Confirming the same rebuilt order twice after a first order sends all three"""
+    from app.telegram import handlers
+
+    created = []
+
+    async def create_order(payload, idempotency_key=None):
+        created.append(payload)
+        return CreateOrderApiResponse(data=OrderResponse(
+            orderGroupPath=f"orderGroups/{len(created)}", paymentPath="payments/1", createdAt=datetime.now()
+        ))
+
+    monkeypatch.setattr(handlers.api_client, "create_order", create_order)
+    monkeypatch.setattr(handlers.order_history, "record", lambda record: None)
+    monkeypatch.setattr(handlers.menu_cache, "find", lambda path: MenuItem(
+        path=path, shortDescription="Coca-Cola", foodName="Coca-Cola", priceInXAF=500.0
+    ))
+
+    context = SimpleNamespace(user_data={"language": "fr"})
+    for attempt in range(1, 4):
+        context.user_data["pending_order"] = make_order()
+        edits = []
+        query = SimpleNamespace(
+            data="confirm_1",
+            message=SimpleNamespace(chat_id=1, date=datetime.now()),
+            answer=AsyncMock(),
+            edit_message_text=AsyncMock(side_effect=lambda text, **kwargs: edits.append(text))
+        )
+        update = SimpleNamespace(callback_query=query, effective_user=SimpleNamespace(id=1))
+
+        await handlers.handle_confirm_callback(update, context)
+
+        assert len(created) == attempt
+        assert f"orderGroups/{attempt}" in edits[-1]
+        assert "pending_order" not in context.user_data
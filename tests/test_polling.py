@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from telegram.error import NetworkError
+from app.telegram.polling import PollingRunner
+
+
+class FakeUpdate:
+    def __init__(self, update_id):
+        self.update_id = update_id
+
+
+class FakeBot:
+    """getUpdates returning scripted batches, then long-polling forever"""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.offsets = []
+        self.webhook_deleted = False
+
+    async def delete_webhook(self):
+        self.webhook_deleted = True
+
+    async def get_updates(self, offset=None, limit=100, timeout=0):
+        self.offsets.append(offset)
+        if self.batches:
+            batch = self.batches.pop(0)
+            if isinstance(batch, Exception):
+                raise batch
+            return batch
+        await asyncio.sleep(3600)
+
+
+@pytest.mark.asyncio
+async def test_updates_are_processed_and_acknowledged():
+    bot = FakeBot([[FakeUpdate(1), FakeUpdate(2)], [FakeUpdate(3)]])
+    processed = []
+
+    async def process(update):
+        processed.append(update.update_id)
+
+    runner = PollingRunner(bot, process, timeout=1)
+    runner.start()
+    await asyncio.sleep(0.05)
+    await runner.stop()
+
+    assert bot.webhook_deleted
+    assert sorted(processed) == [1, 2, 3]
+    assert bot.offsets == [None, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_updates_run_concurrently_up_to_max_in_flight():
+    bot = FakeBot([[FakeUpdate(i) for i in range(1, 5)]])
+    running = 0
+    peak = 0
+
+    async def process(update):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    runner = PollingRunner(bot, process, timeout=1, max_in_flight=2)
+    runner.start()
+    await asyncio.sleep(0.1)
+    await runner.stop()
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_network_errors_are_retried(monkeypatch):
+    import app.telegram.polling as polling
+
+    monkeypatch.setattr(polling, "INITIAL_BACKOFF_SECONDS", 0.01)
+    bot = FakeBot([NetworkError("boom"), [FakeUpdate(7)]])
+    processed = []
+
+    async def process(update):
+        processed.append(update.update_id)
+
+    runner = PollingRunner(bot, process, timeout=1)
+    runner.start()
+    await asyncio.sleep(0.1)
+    await runner.stop()
+
+    assert processed == [7]
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from telegram import Chat, Message, Update, User
+from app.telegram.processing import PerUserUpdateProcessor
+
+
+def make_update(update_id: int, user_id: int) -> Update:
+    user = User(id=user_id, first_name="Test", is_bot=False)
+    message = Message(
+        message_id=update_id,
+        date=None,
+        chat=Chat(id=user_id, type="private"),
+        from_user=user,
+        text="1 coca"
+    )
+    return Update(update_id=update_id, message=message)
+
+
+@pytest.mark.asyncio
+async def test_same_user_updates_are_serialized():
+    processor = PerUserUpdateProcessor(max_concurrent_updates=8)
+    events = []
+
+    async def handle(name):
+        events.append(f"start {name}")
+        await asyncio.sleep(0.01)
+        events.append(f"end {name}")
+
+    await asyncio.gather(
+        processor.process_update(make_update(1, 42), handle("a")),
+        processor.process_update(make_update(2, 42), handle("b")),
+    )
+
+    assert events == ["start a", "end a", "start b", "end b"]
+    assert processor._locks == {}
+
+
+@pytest.mark.asyncio
+async def test_different_users_run_concurrently():
+    processor = PerUserUpdateProcessor(max_concurrent_updates=8)
+    peak = 0
+
+    async def handle():
+        nonlocal peak
+        peak = max(peak, processor.active)
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[
+        processor.process_update(make_update(i, i), handle()) for i in range(1, 5)
+    ])
+
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    processor = PerUserUpdateProcessor(max_concurrent_updates=2)
+    peak = 0
+
+    async def handle():
+        nonlocal peak
+        peak = max(peak, processor.active)
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[
+        processor.process_update(make_update(i, i), handle()) for i in range(1, 6)
+    ])
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_queued_updates_of_one_user_do_not_delay_others():
+    """User A's backlog waits on A's lock without holding concurrency slots"""
+    processor = PerUserUpdateProcessor(max_concurrent_updates=2)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    finished = {}
+
+    async def handle(name, seconds):
+        await asyncio.sleep(seconds)
+        finished[name] = loop.time() - started
+
+    await asyncio.gather(
+        *[processor.process_update(make_update(i, 1), handle(f"a{i}", 0.1)) for i in range(1, 5)],
+        processor.process_update(make_update(10, 2), handle("b", 0.01)),
+    )
+
+    assert finished["b"] < 0.05
+    assert finished["a4"] >= 0.4
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.utils import profiling
+from app.utils.profiling import SamplingProfiler, deep_sizeof, memory_report, track_slow_callbacks
+
+
+def busy_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_returns_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,))
+    worker.start()
+    try:
+        profiler = SamplingProfiler(worker.ident, interval=0.001)
+        profiler.run(0.1)
+    finally:
+        stop.set()
+        worker.join()
+
+    output = profiler.collapsed()
+    assert profiler.sample_count > 0
+    line = output.splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert int(count) > 0
+    assert "busy_loop" in stack
+    assert stack.index("run") < stack.index("busy_loop")  # Racine d'abord
+
+
+@pytest.mark.asyncio
+async def test_slow_callbacks_are_reported_and_loop_restored():
+    original = asyncio.Handle._run
+
+    async def blocker():
+        await asyncio.sleep(0.01)
+        time.sleep(0.05)
+
+    task = asyncio.create_task(blocker())
+    slowest = await track_slow_callbacks(0.1, threshold_ms=20)
+    await task
+
+    assert asyncio.Handle._run is original
+    assert slowest and "blocker" in slowest[0]["callback"]
+    assert slowest[0]["max_ms"] >= 40
+
+
+def test_deep_sizeof_follows_containers():
+    small = deep_sizeof({"history": []})
+    large = deep_sizeof({"history": [{"role": "Client", "content": str(i) * 1000} for i in range(20)]})
+    assert large > small + 20 * 1000
+
+
+@pytest.mark.asyncio
+async def test_memory_report_includes_registered_sources():
+    profiling.register_memory_source("test_data", lambda: {1: {"a": "b" * 100}})
+    try:
+        report = await memory_report(seconds=0.01, top=5)
+    finally:
+        profiling._memory_sources.pop("test_data")
+
+    assert report["objects"]["test_data"]["entries"] == 1
+    assert report["objects"]["test_data"]["size_kib"] > 0
+    assert isinstance(report["tracemalloc"]["top"], list)
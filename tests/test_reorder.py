@@ -0,0 +1,72 @@
+import pytest
+from app.api.spreeloop import MOCK_MENU_ITEMS
+from app.menu.cache import MenuCache
+from app.models import BaseItem, MenuItem, MenuSnapshot
+from app.orders import reorder
+from app.orders.history import OrderRecord
+from app.orders.reorder import is_reorder_request, rebuild_order, reorder_notice
+
+
+@pytest.fixture
+def menu(monkeypatch):
+    cache = MenuCache()
+    cache.set_snapshot(MenuSnapshot(
+        place_id="default", version=1,
+        items=tuple(MenuItem.from_base_item(BaseItem(**item)) for item in MOCK_MENU_ITEMS),
+        content_hash="h", etag=None, last_modified=None, fetched_at=0.0
+    ))
+    monkeypatch.setattr(reorder, "menu_cache", cache)
+    return cache
+
+
+def make_record(items, delivery_address="Bastos") -> OrderRecord:
+    return OrderRecord(
+        user_id=1, order_path="orderGroups/a", place_path="places/p1", items=items,
+        total_xaf=0, customer_name="Jean", customer_phone="+237690000000",
+        delivery_address=delivery_address, latency_ms=None, request={}, created_at=0.0
+    )
+
+
+def test_reorder_requests_are_recognized():
+    assert is_reorder_request("Comme d'habitude svp")
+    assert is_reorder_request("la même chose que la dernière fois")
+    assert is_reorder_request("Same as last time!")
+    assert is_reorder_request("the usual please")
+
+
+def test_other_messages_are_not_reorders():
+    assert not is_reorder_request("je veux 2 ndolé")
+    assert not is_reorder_request("comme d'habitude mais 2 pizzas")  # Quantité: laissé au LLM
+    assert not is_reorder_request("bonjour")
+    assert not is_reorder_request(
+        "comme d'habitude mais sans piment et livrez plutôt au bureau à Bastos ce soir"
+    )
+
+
+def test_rebuild_order_uses_menu_paths_and_contact(menu):
+    ndole = menu.find("menuItems/ndole")
+    rebuilt = rebuild_order(make_record([
+        {"menuItemPath": ndole.path, "foodName": "Ndolé", "count": 2, "priceInXAF": ndole.priceInXAF},
+    ]))
+
+    assert [(i.menuItemPath, i.quantity) for i in rebuilt.order.items] == [(ndole.path, 2)]
+    assert rebuilt.order.customer_phone == "+237690000000"
+    assert rebuilt.order.missing_fields == []
+    assert rebuilt.unavailable == [] and rebuilt.price_changes == []
+    assert reorder_notice(rebuilt, "fr") is None
+
+
+def test_rebuild_order_drops_removed_items_and_reports_new_prices(menu):
+    ndole = menu.find("menuItems/ndole")
+    rebuilt = rebuild_order(make_record([
+        {"menuItemPath": ndole.path, "foodName": "Ndolé", "count": 1, "priceInXAF": ndole.priceInXAF - 500},
+        {"menuItemPath": "menuItems/retired", "foodName": "Plat retiré", "count": 1, "priceInXAF": 1000},
+    ], delivery_address=None))
+
+    assert [i.menuItemPath for i in rebuilt.order.items] == [ndole.path]
+    assert rebuilt.unavailable == ["Plat retiré"]
+    assert rebuilt.price_changes == [f"Ndolé: {int(ndole.priceInXAF) - 500} → {int(ndole.priceInXAF)} XAF"]
+    assert rebuilt.order.missing_fields == ["delivery_address"]
+    notice = reorder_notice(rebuilt, "en")
+    assert "No longer available: Plat retiré" in notice
+    assert "New prices" in notice
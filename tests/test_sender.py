@@ -0,0 +1,128 @@
+import asyncio
+import pytest
+from telegram.error import RetryAfter
+from app.telegram.sender import OutboundSender, TokenBucket, PRIORITY_CONFIRMATION, PRIORITY_NORMAL
+
+
+def make_sender(**overrides):
+    options = dict(global_rate=1000, chat_rate=1000, chat_burst=10, workers=1, max_retries=2)
+    options.update(overrides)
+    return OutboundSender(**options)
+
+
+def test_token_bucket_delay():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    assert bucket.delay() == 0
+    bucket.take()
+    bucket.take()
+    assert 0.9 < bucket.delay() <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_send_without_workers_calls_directly():
+    sender = make_sender()
+
+    async def call():
+        return "sent"
+
+    assert await sender.send(1, call) == "sent"
+
+
+@pytest.mark.asyncio
+async def test_confirmations_jump_the_queue():
+    sender = make_sender()
+    sender.start()
+    order = []
+    gate = asyncio.Event()
+
+    async def blocker():
+        await gate.wait()
+
+    def record(name):
+        async def call():
+            order.append(name)
+        return call
+
+    first = asyncio.create_task(sender.send(1, blocker))
+    await asyncio.sleep(0)
+    normal = asyncio.create_task(sender.send(2, record("reply"), PRIORITY_NORMAL))
+    confirm = asyncio.create_task(sender.send(3, record("confirm"), PRIORITY_CONFIRMATION))
+    await asyncio.sleep(0.01)
+    gate.set()
+    await asyncio.gather(first, normal, confirm)
+    await sender.stop()
+
+    assert order == ["confirm", "reply"]
+
+
+@pytest.mark.asyncio
+async def test_per_chat_limit_does_not_block_other_chats():
+    sender = make_sender(chat_rate=1.0, chat_burst=1)
+    sender.start()
+    order = []
+
+    def record(name):
+        async def call():
+            order.append(name)
+        return call
+
+    await sender.send(1, record("a1"))
+    delayed = asyncio.create_task(sender.send(1, record("a2")))
+    await sender.send(2, record("b1"))
+    assert order == ["a1", "b1"]
+    assert sender.queue_depth() == 1
+
+    await sender.stop()
+    await delayed
+    assert order == ["a1", "b1", "a2"]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_retried():
+    sender = make_sender()
+    sender.start()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RetryAfter(0)
+        return "ok"
+
+    assert await asyncio.wait_for(sender.send(1, flaky), 1) == "ok"
+    assert len(attempts) == 2
+    await sender.stop()
+
+
+@pytest.mark.asyncio
+async def test_retry_after_gives_up_after_max_retries():
+    sender = make_sender(max_retries=1)
+    sender.start()
+
+    async def flooded():
+        raise RetryAfter(0)
+
+    with pytest.raises(RetryAfter):
+        await asyncio.wait_for(sender.send(1, flooded), 1)
+    await sender.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_jobs_waiting_on_global_limit():
+    sender = make_sender(global_rate=1)
+    sender.start()
+    sent = []
+
+    def record(name):
+        async def call():
+            sent.append(name)
+            return name
+        return call
+
+    await sender.send(1, record("first"))
+    second = asyncio.create_task(sender.send(2, record("second")))
+    await asyncio.sleep(0.01)  # worker is now sleeping on the global bucket
+    await sender.stop()
+
+    assert await asyncio.wait_for(second, 1) == "second"
+    assert sent == ["first", "second"]
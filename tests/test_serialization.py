@@ -0,0 +1,45 @@
+import pytest
+from types import SimpleNamespace
+from app.models import ExtractedOrder, ExtractedOrderItem
+from app.telegram.handlers import get_session_order
+from app.utils import serialization
+from app.utils.serialization import dumps, loads
+from app.utils.shared_state import SharedStateStore
+
+
+def make_order() -> ExtractedOrder:
+    return ExtractedOrder(
+        items=[ExtractedOrderItem(foodName="Ndolé", quantity=2, menuItemPath="menuItems/ndole")],
+        customer_name="Jean",
+        confidence=0.9
+    )
+
+
+@pytest.mark.parametrize("backend", ["default", "stdlib"])
+def test_round_trip_with_pydantic_models(monkeypatch, backend):
+    if backend == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    data = {"language": "fr", "pending_order": make_order(), "n": 1}
+
+    encoded = dumps(data)
+
+    assert isinstance(encoded, bytes)
+    decoded = loads(encoded)
+    assert decoded["pending_order"]["items"][0]["foodName"] == "Ndolé"
+    assert loads(encoded.decode()) == decoded
+    assert ExtractedOrder(**decoded["pending_order"]) == make_order()
+
+
+@pytest.mark.asyncio
+async def test_typed_session_order_survives_the_shared_store(tmp_path):
+    """A session saved with typed orders is read back typed by the handlers"""
+    store = SharedStateStore(str(tmp_path / "state.sqlite3"))
+    await store.save_session(42, {"pending_order": make_order()})
+
+    context = SimpleNamespace(user_data=await store.load_session(42))
+    order = get_session_order(context, "pending_order")
+
+    assert order == make_order()
+    assert context.user_data["pending_order"] is order  # Validé une seule fois
+    assert get_session_order(context, "pending_partial_order") is None
+    store.close()
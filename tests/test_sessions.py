@@ -0,0 +1,106 @@
+import pytest
+from types import SimpleNamespace
+from telegram import Chat, Message, Update, User
+from app.telegram.sessions import SessionEvictor
+from app.utils.shared_state import SharedStateStore
+
+
+def make_update(user_id: int) -> Update:
+    user = User(id=user_id, first_name="Test", is_bot=False)
+    message = Message(
+        message_id=1, date=None, chat=Chat(id=user_id, type="private"), from_user=user, text="salut"
+    )
+    return Update(update_id=1, message=message)
+
+
+def make_evictor(sessions, **kwargs) -> SessionEvictor:
+    return SessionEvictor(lambda: sessions, lambda user_id: sessions.pop(user_id, None), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_evicted_after_ttl():
+    sessions = {1: {"language": "fr"}, 2: {"language": "en"}}
+    evictor = make_evictor(sessions, ttl=100)
+    evictor.touch(1, now=0)
+    evictor.touch(2, now=50)
+
+    assert await evictor.sweep(now=120) == 1
+
+    assert list(sessions) == [2]
+    assert evictor.total_bytes == evictor.sizes[2] > 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_sessions_are_evicted_above_the_cap():
+    sessions = {user_id: {"conversation_history": []} for user_id in range(5)}
+    evictor = make_evictor(sessions, ttl=10_000, max_sessions=3)
+    for user_id in (3, 0, 4, 1, 2):
+        evictor.touch(user_id, now=user_id)
+
+    assert await evictor.sweep(now=1000) == 2
+
+    assert sorted(sessions) == [1, 2, 4]  # 3 et 0: utilisées le moins récemment
+
+
+@pytest.mark.asyncio
+async def test_busy_and_recent_sessions_are_kept():
+    sessions = {1: {}, 2: {}}
+    evictor = make_evictor(sessions, ttl=100, max_sessions=0, is_busy=lambda user_id: user_id == 1)
+    evictor.touch(1, now=0)
+    evictor.touch(2, now=990)
+
+    assert await evictor.sweep(now=1000) == 0  # 1: update en cours, 2: active il y a 10 s
+    assert sorted(sessions) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_spilled_session_is_restored_on_next_update(tmp_path):
+    store = SharedStateStore(str(tmp_path / "sessions.sqlite3"))
+    sessions = {42: {"language": "en", "pending_partial_order": {"items": []}}}
+    evictor = make_evictor(sessions, ttl=100, spill=store)
+    evictor.touch(42, now=0)
+
+    assert await evictor.sweep(now=500) == 1
+    assert sessions == {}
+
+    context = SimpleNamespace(user_data={})
+    await evictor.on_update(make_update(42), context)
+
+    assert context.user_data == {"language": "en", "pending_partial_order": {"items": []}}
+    assert await store.load_session(42) is None
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_spilled_session_is_restored_after_a_restart(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    store = SharedStateStore(path)
+    sessions = {42: {"language": "fr", "pending_order": {"items": []}}}
+    evictor = make_evictor(sessions, ttl=100, spill=store)
+    evictor.touch(42, now=0)
+    await evictor.sweep(now=500)
+    store.close()
+
+    # Nouveau processus: nouvel évincteur, aucune trace en mémoire
+    restarted_store = SharedStateStore(path)
+    restarted = make_evictor({}, ttl=100, spill=restarted_store)
+    context = SimpleNamespace(user_data={})
+    await restarted.on_update(make_update(42), context)
+
+    assert context.user_data == {"language": "fr", "pending_order": {"items": []}}
+    assert await restarted_store.load_session(42) is None
+    restarted_store.close()
+
+
+@pytest.mark.asyncio
+async def test_sweep_purges_spilled_sessions_older_than_ttl(tmp_path):
+    store = SharedStateStore(str(tmp_path / "sessions.sqlite3"))
+    await store.save_session(1, {"language": "fr"})
+    await store.save_session(2, {"language": "en"})
+    await store._run("UPDATE sessions SET updated_at = 0 WHERE user_id = 1")
+
+    await make_evictor({}, ttl=100, spill=store).sweep()
+
+    assert await store.load_session(1) is None
+    assert await store.load_session(2) == {"language": "en"}
+    store.close()
@@ -0,0 +1,67 @@
+import pytest
+from app.utils.shared_state import SharedStateStore
+
+
+@pytest.mark.asyncio
+async def test_session_round_trip(tmp_path):
+    """A session saved by one worker is read by another"""
+    writer = SharedStateStore(str(tmp_path / "state.sqlite3"))
+    reader = SharedStateStore(str(tmp_path / "state.sqlite3"))
+
+    await writer.save_session(42, {"language": "fr", "pending_order": {"items": []}})
+
+    assert await reader.load_session(42) == {"language": "fr", "pending_order": {"items": []}}
+    assert await reader.load_session(7) is None
+
+
+@pytest.mark.asyncio
+async def test_lease_is_exclusive_across_processes(tmp_path):
+    """Only one worker holds a lease until it is released"""
+    first = SharedStateStore(str(tmp_path / "state.sqlite3"))
+    second = SharedStateStore(str(tmp_path / "state.sqlite3"))
+
+    assert await first.try_acquire("menu_refresh:place", ttl=30)
+    assert not await second.try_acquire("menu_refresh:place", ttl=30)
+
+    await first.release("menu_refresh:place")
+    assert await second.try_acquire("menu_refresh:place", ttl=30)
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_can_be_taken(tmp_path):
+    """A lease left by a dead worker expires"""
+    first = SharedStateStore(str(tmp_path / "state.sqlite3"))
+    second = SharedStateStore(str(tmp_path / "state.sqlite3"))
+
+    assert await first.try_acquire("user:1", ttl=-1)
+    assert await second.try_acquire("user:1", ttl=30)
+
+
+@pytest.mark.asyncio
+async def test_lock_is_renewed_while_held(tmp_path):
+    """A long handler keeps its lease past the initial ttl"""
+    import asyncio
+
+    first = SharedStateStore(str(tmp_path / "state.sqlite3"))
+    second = SharedStateStore(str(tmp_path / "state.sqlite3"))
+
+    async with first.lock("user:1", ttl=0.3):
+        await asyncio.sleep(0.5)
+        assert not await second.try_acquire("user:1", ttl=30)
+
+    assert await second.try_acquire("user:1", ttl=30)
+
+
+@pytest.mark.asyncio
+async def test_lock_timeout_does_not_run_body(tmp_path):
+    from app.utils.shared_state import SharedLockTimeout
+
+    first = SharedStateStore(str(tmp_path / "state.sqlite3"))
+    second = SharedStateStore(str(tmp_path / "state.sqlite3"))
+    assert await first.try_acquire("user:1", ttl=30)
+
+    ran = False
+    with pytest.raises(SharedLockTimeout):
+        async with second.lock("user:1", timeout=0.1):
+            ran = True
+    assert not ran
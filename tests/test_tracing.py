@@ -0,0 +1,84 @@
+import asyncio
+import json
+import pytest
+from app.utils import tracing
+from app.utils.tracing import span, start_trace, slowest_traces, to_otlp, traced
+
+
+@traced("llm.fake")
+async def fake_llm_call():
+    await asyncio.sleep(0.01)
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_spans_are_nested_and_timed():
+    with start_trace("telegram.update", update_id=1) as trace:
+        with span("telegram.handle_message"):
+            assert await fake_llm_call() == "ok"
+
+    names = [s.name for s in trace.spans]
+    assert names == ["telegram.update", "telegram.handle_message", "llm.fake"]
+    assert trace.spans[2].parent_id == trace.spans[1].span_id
+    assert trace.spans[2].duration_ms >= 10
+    assert tracing.current_trace_id() is None
+
+
+def test_span_outside_trace_is_noop():
+    with span("menu.get") as current:
+        assert current is None
+
+
+def test_trace_id_bound_in_logs():
+    import structlog
+
+    with start_trace("telegram.update") as trace:
+        assert structlog.contextvars.get_contextvars()["trace_id"] == trace.trace_id
+    assert "trace_id" not in structlog.contextvars.get_contextvars()
+
+
+def test_error_recorded_on_span():
+    with pytest.raises(ValueError):
+        with start_trace("telegram.update") as trace:
+            with span("spreeloop.create_order"):
+                raise ValueError("boom")
+
+    assert trace.spans[1].error == "ValueError"
+    assert trace.root.error == "ValueError"
+
+
+def test_slowest_traces_and_otlp_encoding():
+    tracing.recent_traces.clear()
+    with start_trace("fast"):
+        pass
+    with start_trace("slow") as slow:
+        with span("llm.gemini.extract_order"):
+            pass
+    slow.root.end = slow.root.start + 2  # Pretend it took 2 s
+
+    result = slowest_traces(minutes=60, limit=1)
+    assert result[0]["name"] == "slow"
+
+    otlp = to_otlp([slow])
+    spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans] == ["slow", "llm.gemini.extract_order"]
+    assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+    json.dumps(otlp)
+
+
+@pytest.mark.asyncio
+async def test_task_outliving_trace_does_not_append_spans():
+    """Background work started by an update is not added to its finished trace"""
+    release = asyncio.Event()
+
+    async def background():
+        await release.wait()
+        with span("spreeloop.get_menu") as current:
+            return current
+
+    with start_trace("telegram.update") as trace:
+        task = asyncio.create_task(background())
+
+    release.set()
+    assert await task is None
+    assert [s.name for s in trace.spans] == ["telegram.update"]